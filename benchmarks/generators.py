@@ -0,0 +1,178 @@
+"""
+Seeded maze generators for benchmarks. Every generator takes the number of rows and columns and a seed, and returns
+the same maze for the same arguments.
+
+Cells are written straight into the byte buffer of a compact grid, using slice assignment and `bytes.translate` where
+possible, so that mazes of up to 10000 x 10000 cells can be generated in reasonable time.
+"""
+import random
+from collections.abc import Callable
+
+from pathfinding.data_structures import CompactGrid, Position
+from pathfinding.maze import CELL_STATES, CellState, Maze
+
+Generator = Callable[[int, int, int], Maze]
+
+EMPTY = CELL_STATES.index(CellState.EMPTY)
+WALL = CELL_STATES.index(CellState.WALL)
+
+
+def _make_maze(n_rows: int, n_cols: int, cells: bytearray, entry_point: Position, exit_point: Position) -> Maze:
+    for row, col in (entry_point, exit_point):
+        cells[row * n_cols + col] = EMPTY
+    return Maze(CompactGrid((n_rows, n_cols), cells, CELL_STATES), entry_point, exit_point)
+
+
+def _perfect_maze_dimensions(n_rows: int, n_cols: int) -> tuple[int, int]:
+    # Perfect mazes have a room at every odd row and column, and walls or passages between them, so their dimensions
+    # are rounded down to odd numbers of at least 3.
+    return max(3, n_rows - 1 + n_rows % 2), max(3, n_cols - 1 + n_cols % 2)
+
+
+def _perfect_maze(n_rows: int, n_cols: int, passages: list[tuple[int, int]]) -> Maze:
+    """Build a maze from passages between rooms, given as pairs of room ids in a grid of rooms."""
+    room_cols = (n_cols - 1) // 2
+    cells = bytearray([WALL]) * (n_rows * n_cols)
+    for room_row in range((n_rows - 1) // 2):
+        row_start = (2 * room_row + 1) * n_cols
+        first_room, row_end = row_start + 1, row_start + n_cols - 1
+        cells[first_room:row_end:2] = bytes([EMPTY]) * room_cols
+    for first, second in passages:
+        (first_row, first_col), (second_row, second_col) = divmod(first, room_cols), divmod(second, room_cols)
+        cells[(first_row + second_row + 1) * n_cols + first_col + second_col + 1] = EMPTY
+    return _make_maze(n_rows, n_cols, cells, Position(0, 1), Position(n_rows - 1, n_cols - 2))
+
+
+def recursive_backtracker(n_rows: int, n_cols: int, seed: int) -> Maze:
+    """A perfect maze carved by a randomised depth first search, with long winding corridors and few junctions."""
+    n_rows, n_cols = _perfect_maze_dimensions(n_rows, n_cols)
+    room_rows, room_cols = (n_rows - 1) // 2, (n_cols - 1) // 2
+    rng = random.Random(seed)
+    visited = bytearray(room_rows * room_cols)
+    visited[0] = 1
+    stack = [0]
+    passages = []
+    while stack:
+        room = stack[-1]
+        row, col = divmod(room, room_cols)
+        unvisited = [
+            other
+            for other, in_bounds in (
+                (room - room_cols, row > 0),
+                (room + room_cols, row < room_rows - 1),
+                (room - 1, col > 0),
+                (room + 1, col < room_cols - 1),
+            )
+            if in_bounds and not visited[other]
+        ]
+        if not unvisited:
+            stack.pop()
+            continue
+        other = rng.choice(unvisited)
+        visited[other] = 1
+        passages.append((room, other))
+        stack.append(other)
+    return _perfect_maze(n_rows, n_cols, passages)
+
+
+def kruskal(n_rows: int, n_cols: int, seed: int) -> Maze:
+    """A perfect maze from a random spanning tree built with Kruskal's algorithm, with many short dead ends."""
+    n_rows, n_cols = _perfect_maze_dimensions(n_rows, n_cols)
+    room_rows, room_cols = (n_rows - 1) // 2, (n_cols - 1) // 2
+    rng = random.Random(seed)
+    walls = [(room, room + 1) for room in range(room_rows * room_cols) if (room + 1) % room_cols]
+    walls.extend((room, room + room_cols) for room in range((room_rows - 1) * room_cols))
+    rng.shuffle(walls)
+
+    parents = list(range(room_rows * room_cols))
+
+    def find(room: int) -> int:
+        while parents[room] != room:
+            parents[room] = parents[parents[room]]
+            room = parents[room]
+        return room
+
+    passages = []
+    for first, second in walls:
+        first_root, second_root = find(first), find(second)
+        if first_root != second_root:
+            parents[first_root] = second_root
+            passages.append((first, second))
+    return _perfect_maze(n_rows, n_cols, passages)
+
+
+def random_walls(n_rows: int, n_cols: int, seed: int, density: float = 0.3) -> Maze:
+    """A maze in which every cell is independently a wall with the given probability."""
+    rng = random.Random(seed)
+    threshold = round(density * 256)
+    cell_codes = bytes(WALL if byte < threshold else EMPTY for byte in range(256))
+    cells = bytearray(rng.randbytes(n_rows * n_cols).translate(cell_codes))
+    return _make_maze(n_rows, n_cols, cells, Position(0, 0), Position(n_rows - 1, n_cols - 1))
+
+
+def open_rooms(n_rows: int, n_cols: int, seed: int, room_size: int = 16) -> Maze:
+    """
+    Square rooms of `room_size` cells separated by walls one cell thick, with one door at a random place in each wall
+    between two rooms.
+    """
+    rng = random.Random(seed)
+    stride = room_size + 1
+    open_row = bytes(WALL if col % stride == room_size else EMPTY for col in range(n_cols))
+    wall_row = bytes([WALL]) * n_cols
+    cells = bytearray(b"".join(wall_row if row % stride == room_size else open_row for row in range(n_rows)))
+
+    for row in range(room_size, n_rows, stride):
+        for first_col in range(0, n_cols, stride):
+            cells[row * n_cols + first_col + rng.randrange(min(room_size, n_cols - first_col))] = EMPTY
+    for col in range(room_size, n_cols, stride):
+        for first_row in range(0, n_rows, stride):
+            cells[(first_row + rng.randrange(min(room_size, n_rows - first_row))) * n_cols + col] = EMPTY
+    # The last row or column is a wall when the rooms fit exactly, so the exit is moved into the room before it.
+    exit_row = n_rows - 1 - ((n_rows - 1) % stride == room_size)
+    exit_col = n_cols - 1 - ((n_cols - 1) % stride == room_size)
+    return _make_maze(n_rows, n_cols, cells, Position(0, 0), Position(exit_row, exit_col))
+
+
+def spiral(n_rows: int, n_cols: int, seed: int) -> Maze:
+    """
+    A single corridor winding inwards from the top left corner, the worst case for searches which explore
+    everything: its shortest path covers about half of the cells. The seed is unused.
+    """
+    cells = bytearray([WALL]) * (n_rows * n_cols)
+
+    def carve(start: int, end: int, step: int = 1) -> None:
+        cells[start:end:step] = bytes([EMPTY]) * len(range(start, end, step))
+
+    top, left, bottom, right = 0, 0, n_rows - 1, n_cols - 1
+    row, col = 0, 0
+    # Each turn of the spiral carves its four sides, then moves two cells inwards, leaving a wall between the turns.
+    while top <= bottom and left <= right:
+        carve(top * n_cols + left, top * n_cols + right + 1)
+        row, col = top, right
+        if top + 2 > bottom:
+            break
+        carve((top + 1) * n_cols + right, (bottom + 1) * n_cols + right, n_cols)
+        row = bottom
+        if left + 2 > right:
+            break
+        carve(bottom * n_cols + left, bottom * n_cols + right)
+        col = left
+        if top + 4 > bottom:
+            break
+        carve((top + 2) * n_cols + left, bottom * n_cols + left, n_cols)
+        row = top + 2
+        if left + 4 > right:
+            break
+        cells[(top + 2) * n_cols + left + 1] = EMPTY
+        col = left + 1
+        top, left, bottom, right = top + 2, left + 2, bottom - 2, right - 2
+    return _make_maze(n_rows, n_cols, cells, Position(0, 0), Position(row, col))
+
+
+GENERATORS: dict[str, Generator] = {
+    "recursive_backtracker": recursive_backtracker,
+    "kruskal": kruskal,
+    "random_walls": random_walls,
+    "open_rooms": open_rooms,
+    "spiral": spiral,
+}
@@ -0,0 +1,87 @@
+"""
+Times getting a seeded generated maze ready to solve from a file, from the text format and from the binary format.
+
+From text, the maze is parsed and its corridor graph is built. From the binary format, which stores the corridor graph,
+the maze is loaded. Both are also timed through their first `DijkstraSolver` search, and the shortest paths they find
+must have the same length.
+
+Usage: python -m benchmarks.loading [--generators NAME ...] [--sizes SIZE ...] [--seed SEED] [--repeat REPEAT]
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Optional
+
+from pathfinding.loaders import BinaryLoader, parse_maze_buffer, write_binary_maze
+from pathfinding.maze import Maze
+from pathfinding.solvers import DijkstraSolver
+
+from .generators import GENERATORS
+from .suite import maze_text
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def solve(maze: Maze) -> Optional[int]:
+    """Return the length of the shortest path of a maze, or None if there is none."""
+    solver = DijkstraSolver(maze)
+    for _ in solver.solve():
+        pass
+    try:
+        return len(solver.get_shortest_path())
+    except ValueError:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=["random_walls"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 3000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Best of {args.repeat}:")
+    with tempfile.TemporaryDirectory() as directory:
+        for generator in args.generators:
+            for size in args.sizes:
+                maze = GENERATORS[generator](size, size, args.seed)
+                n_rows, n_cols = maze.grid.dimensions
+                if not all(
+                    row in (0, n_rows - 1) or col in (0, n_cols - 1) for row, col in (maze.entry_point, maze.exit_point)
+                ):
+                    print(f"{generator} {size}x{size}: skipped, the text format only allows endpoints on the boundary")
+                    continue
+
+                text = maze_text(maze)
+                binary_path = os.path.join(directory, f"{generator}-{size}.maze")
+                write_binary_maze(maze, binary_path)
+                if solve(parse_maze_buffer(text)) != solve(BinaryLoader(binary_path).load()):
+                    raise AssertionError(f"{generator} {size}x{size}: the loaded mazes have different shortest paths")
+
+                timings = {
+                    "text": best_time(lambda: parse_maze_buffer(text), args.repeat),
+                    "text+corridors": best_time(lambda: parse_maze_buffer(text).corridors, args.repeat),
+                    "text+solve": best_time(lambda: solve(parse_maze_buffer(text)), args.repeat),
+                    "binary": best_time(lambda: BinaryLoader(binary_path).load(), args.repeat),
+                    "binary+solve": best_time(lambda: solve(BinaryLoader(binary_path).load()), args.repeat),
+                }
+                print(
+                    f"{generator} {size}x{size}: text {len(text) / 1e6:.1f} MB, "
+                    f"binary {os.path.getsize(binary_path) / 1e6:.1f} MB"
+                )
+                for name, seconds in timings.items():
+                    print(f"{name:>20}: {seconds:8.3f}s  ({timings['text+corridors'] / seconds:.2f}x text+corridors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Times Dijkstra's algorithm on a seeded random grid graph with small integer edge weights, once per priority queue.
+
+Usage: python -m benchmarks.priority_queues [--size SIZE] [--max-weight MAX_WEIGHT] [--seed SEED] [--repeat REPEAT]
+"""
+import argparse
+import random
+import time
+from collections.abc import Callable
+
+from pathfinding.data_structures import BucketQueue, DaryHeap, Heap, PriorityQueue
+
+QueueFactory = Callable[[], PriorityQueue[int]]
+
+QUEUES: dict[str, QueueFactory] = {
+    "Heap": Heap,
+    "DaryHeap(arity=4)": lambda: DaryHeap(arity=4),
+    "DaryHeap(arity=8)": lambda: DaryHeap(arity=8),
+    "BucketQueue": BucketQueue,
+}
+
+
+def make_graph(size: int, max_weight: int, seed: int) -> list[list[tuple[int, int]]]:
+    """Return the adjacency lists of a 4-connected `size` x `size` grid with random weights in [1, max_weight]."""
+    rng = random.Random(seed)
+    adjacency: list[list[tuple[int, int]]] = [[] for _ in range(size * size)]
+    for row in range(size):
+        for col in range(size):
+            vertex = row * size + col
+            for other in (vertex + 1 if col + 1 < size else None, vertex + size if row + 1 < size else None):
+                if other is not None:
+                    weight = rng.randint(1, max_weight)
+                    adjacency[vertex].append((other, weight))
+                    adjacency[other].append((vertex, weight))
+    return adjacency
+
+
+def dijkstra(adjacency: list[list[tuple[int, int]]], queue: PriorityQueue[int]) -> list[float]:
+    distances = [float("inf")] * len(adjacency)
+    distances[0] = 0
+    queue.push(0, 0)
+    while queue:
+        vertex = queue.pop()
+        for other, weight in adjacency[vertex]:
+            current = distances[other]
+            new = distances[vertex] + weight
+            if new < current:
+                distances[other] = new
+                if current == float("inf"):
+                    queue.push(other, new)
+                else:
+                    queue.decrease_priority(other, new)
+    return distances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--max-weight", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    adjacency = make_graph(args.size, args.max_weight, args.seed)
+    reference = None
+    timings: dict[str, float] = {}
+    for name, factory in QUEUES.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            distances = dijkstra(adjacency, factory())
+            best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference = distances
+        elif distances != reference:
+            raise AssertionError(f"{name} computed different distances")
+        timings[name] = best
+
+    print(f"Dijkstra on a {args.size}x{args.size} grid graph, weights 1-{args.max_weight}, best of {args.repeat}:")
+    for name, seconds in timings.items():
+        print(f"{name:>20}: {seconds:8.3f}s  ({timings['Heap'] / seconds:.2f}x Heap)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Times loading, graph building and every solver on seeded generated mazes, and records the results as JSON.
+
+For each generator and size, the maze is written to text and to the binary format and loaded back from both, its
+neighbour table, corridor graph and `Maze.to_graph` are built from scratch, and each solver is run on it with the
+corridor graph already built. Every stage records its best time over the repeats, its peak traced memory and, for
+solvers, the number of positions expanded and the length of the path found.
+
+When a baseline is given, every stage is compared against the matching stage of the baseline, and the command exits
+with status 1 if any got slower or used more memory by more than the tolerance, or expanded a different number of
+positions.
+
+Usage: python -m benchmarks.suite [--generators NAME ...] [--sizes SIZE ...] [--solvers NAME ...] [--seed SEED]
+    [--repeat REPEAT] [--no-memory] [--output FILE] [--baseline FILE] [--tolerance TOLERANCE]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional, TypeVar
+
+from pathfinding.loaders import BinaryLoader, parse_maze_buffer, write_binary_maze
+from pathfinding.maze import CELL_STATES, CellState, Maze
+from pathfinding.solvers import AStarSolver, BFSSolver, DijkstraSolver, JPSSolver, MazeSolver
+
+from .generators import GENERATORS
+
+T = TypeVar("T")
+
+SOLVERS: dict[str, Callable[[Maze], MazeSolver]] = {
+    "BFSSolver": BFSSolver,
+    "BFSSolver(bidirectional)": lambda maze: BFSSolver(maze, bidirectional=True),
+    "DijkstraSolver": DijkstraSolver,
+    "DijkstraSolver(bidirectional)": lambda maze: DijkstraSolver(maze, bidirectional=True),
+    "AStarSolver": AStarSolver,
+    "JPSSolver": JPSSolver,
+}
+
+_TEXT_CHARS = bytes.maketrans(bytes([CELL_STATES.index(CellState.EMPTY), CELL_STATES.index(CellState.WALL)]), b".#")
+
+
+@dataclass
+class Result:
+    generator: str
+    size: int
+    stage: str
+    seconds: float
+    peak_bytes: Optional[int] = None
+    expanded: Optional[int] = None
+    path_length: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.generator}/{self.size}/{self.stage}"
+
+
+def measure(function: Callable[[], T], repeat: int, memory: bool) -> tuple[float, Optional[int], T]:
+    """
+    Return the best time of `repeat` calls of the function, its peak traced memory, measured in a separate call so
+    that tracing does not slow down the timed ones, and the return value of the last call.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak, value
+
+
+def maze_text(maze: Maze) -> bytes:
+    """Return a maze in the text format read by the maze loaders."""
+    n_rows, n_cols = maze.grid.dimensions
+    chars = bytes(maze.grid.cells).translate(_TEXT_CHARS)
+    rows = []
+    for row in range(n_rows):
+        start, end = row * n_cols, (row + 1) * n_cols
+        rows.append(chars[start:end])
+    text = bytearray(b"\n".join(rows))
+    for (row, col), char in ((maze.entry_point, b"X"), (maze.exit_point, b"Y")):
+        text[row * (n_cols + 1) + col] = char[0]
+    return bytes(text)
+
+
+def run_solver(maze: Maze, factory: Callable[[Maze], MazeSolver]) -> tuple[int, Optional[int]]:
+    """Solve a maze, returning the number of positions expanded and the length of the path, or None if there is none."""
+    solver = factory(maze)
+    expanded = sum(1 for _ in solver.solve())
+    try:
+        return expanded, len(solver.get_shortest_path())
+    except ValueError:
+        return expanded, None
+
+
+def benchmark_maze(
+    generator: str,
+    size: int,
+    maze: Maze,
+    solvers: dict[str, Callable[[Maze], MazeSolver]],
+    repeat: int,
+    memory: bool,
+    directory: str,
+) -> list[Result]:
+    """
+    Run every stage on a maze.
+    :param directory: A directory for the maze files written to time loading.
+    """
+
+    def fresh() -> Maze:
+        # A maze over the same grid with an empty cache, so nothing derived from the grid is reused between runs.
+        return Maze(maze.grid, maze.entry_point, maze.exit_point)
+
+    n_rows, n_cols = maze.grid.dimensions
+    binary_path = os.path.join(directory, f"{generator}-{size}.maze")
+    write_binary_maze(maze, binary_path)
+    stages: list[tuple[str, Callable[[], Any]]] = [
+        ("load:binary", lambda: BinaryLoader(binary_path).load()),
+        ("neighbours", lambda: fresh().neighbours),
+        ("corridors", lambda: fresh().corridors),
+        ("to_graph", lambda: fresh().to_graph()),
+    ]
+    # The text format only allows endpoints on the boundary of the maze.
+    if all(row in (0, n_rows - 1) or col in (0, n_cols - 1) for row, col in (maze.entry_point, maze.exit_point)):
+        text = maze_text(maze)
+        stages.insert(0, ("load:text", lambda: parse_maze_buffer(text)))
+
+    results = []
+    for stage, function in stages:
+        seconds, peak, _ = measure(function, repeat, memory)
+        results.append(Result(generator, size, stage, seconds, peak))
+
+    maze.corridors  # Built once up front, so that solvers are timed on the search alone.
+    for name, factory in solvers.items():
+        seconds, peak, (expanded, path_length) = measure(lambda: run_solver(maze, factory), repeat, memory)
+        results.append(Result(generator, size, f"solve:{name}", seconds, peak, expanded, path_length))
+    return results
+
+
+def compare(results: list[Result], baseline: list[Result], tolerance: float) -> list[str]:
+    """Return a description of every stage which regressed compared to the baseline."""
+    baseline_by_key = {result.key: result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(result.key)
+        if previous is None:
+            continue
+        if result.seconds > previous.seconds * (1 + tolerance):
+            regressions.append(f"{result.key}: {previous.seconds:.4f}s -> {result.seconds:.4f}s")
+        if result.peak_bytes is not None and previous.peak_bytes is not None:
+            if result.peak_bytes > previous.peak_bytes * (1 + tolerance):
+                regressions.append(f"{result.key}: peak {previous.peak_bytes} -> {result.peak_bytes} bytes")
+        if result.expanded != previous.expanded or result.path_length != previous.path_length:
+            regressions.append(
+                f"{result.key}: expanded {previous.expanded} -> {result.expanded}, "
+                f"path length {previous.path_length} -> {result.path_length}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000])
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="do not measure peak memory")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown (default: 0.2)")
+    args = parser.parse_args()
+
+    solvers = {name: SOLVERS[name] for name in args.solvers}
+    results: list[Result] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for generator in args.generators:
+            for size in args.sizes:
+                maze = GENERATORS[generator](size, size, args.seed)
+                for result in benchmark_maze(generator, size, maze, solvers, args.repeat, args.memory, directory):
+                    results.append(result)
+                    peak = "" if result.peak_bytes is None else f"  {result.peak_bytes / 2**20:9.2f} MiB"
+                    expanded = "" if result.expanded is None else f"  {result.expanded:>10} expanded"
+                    print(f"{result.key:>60}: {result.seconds:9.4f}s{peak}{expanded}")
+
+    if args.output:
+        metadata = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        }
+        with open(args.output, "w") as file:
+            json.dump({"metadata": metadata, "results": [asdict(result) for result in results]}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = [Result(**result) for result in json.load(file)["results"]]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
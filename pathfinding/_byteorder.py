@@ -0,0 +1,15 @@
+"""
+Byte order conversion for the binary file formats of the package, which store every number little-endian.
+"""
+import sys
+from array import array
+from typing import TypeVar
+
+T = TypeVar("T", int, float)
+
+
+def little_endian(values: "array[T]") -> "array[T]":
+    """Convert an array between the byte order of this machine and little-endian, in place, and return it."""
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
@@ -1,5 +1,27 @@
+from .corridor_graph import CorridorGraph
 from .graph import Edge, Graph, Vertex
-from .grid import Grid, Position, SolveStep
-from .priority_queue import Heap, PriorityQueue
+from .grid import CompactGrid, Grid, Position, SolveStep
+from .neighbour_table import DIRECTIONS, MASK_DIRECTIONS, NeighbourTable
+from .priority_queue import BucketQueue, DaryHeap, Heap, InstrumentedQueue, PriorityQueue, QueueCounters
+from .tiled_grid import TiledGrid
 
-__all__ = ["Grid", "Position", "SolveStep", "Graph", "Vertex", "Edge", "PriorityQueue", "Heap"]
+__all__ = [
+    "Grid",
+    "CompactGrid",
+    "TiledGrid",
+    "Position",
+    "SolveStep",
+    "NeighbourTable",
+    "DIRECTIONS",
+    "MASK_DIRECTIONS",
+    "Graph",
+    "Vertex",
+    "Edge",
+    "CorridorGraph",
+    "PriorityQueue",
+    "Heap",
+    "DaryHeap",
+    "BucketQueue",
+    "InstrumentedQueue",
+    "QueueCounters",
+]
@@ -0,0 +1,283 @@
+from array import array
+from collections.abc import Collection, Container, MutableSequence, Sequence
+from typing import Any, Optional, cast
+
+from .grid import SolveStep
+from .neighbour_table import DIRECTIONS, MASK_DIRECTIONS, NeighbourTable
+
+_VERTEX_MASKS = bytes(0 if len(directions) in (0, 2) else 1 for directions in MASK_DIRECTIONS).ljust(256, b"\x00")
+"""Maps a neighbour bitmask to 1 if a cell with that mask is a dead end or a junction."""
+
+_INDEX_TABLES = ("vertices", "vertex_slots", "slot_edges", "edge_tails", "edge_heads", "edge_lengths", "free_edges")
+
+_NEXT_DIRECTIONS = bytes(
+    next((direction for direction in MASK_DIRECTIONS[mask] if direction != back), 255)
+    for mask in range(len(MASK_DIRECTIONS))
+    for back in range(len(DIRECTIONS))
+)
+"""Maps `mask * 4 + back` to the direction which leaves a corridor cell with the given mask without turning back."""
+
+
+def index_typecode(n_cells: int) -> str:
+    """Return the array typecode used for the cell, vertex and edge ids of a graph over a grid of `n_cells` cells."""
+    return "i" if n_cells < 1 << 31 else "q"
+
+
+class CorridorGraph:
+    """
+    The contracted form of the open cells of a grid.
+
+    Every dead end and junction (an open cell with one, three or four open neighbours) is a vertex, identified by its
+    flat cell index. Every corridor of cells with exactly two open neighbours joining two vertices is an edge, weighted
+    by its length in steps. Corridors forming a closed loop without any vertex on it are not part of the graph.
+
+    Edge `e` leaves `edge_tails[e]` in direction `edge_tail_directions[e]` and enters `edge_heads[e]` from direction
+    `edge_head_directions[e]`, after `edge_lengths[e]` steps. Ids of removed edges have a tail of -1 and are reused by
+    later edges.
+
+    Vertices are kept in dense slots, like the ids of a `Graph`: `vertices[s]` is the cell of the vertex in slot `s`,
+    `vertex_slots[cell]` is the slot of the vertex at a cell, or -1 if the cell is not a vertex, and
+    `slot_edges[4 * s + d]` is the edge leaving the vertex in slot `s` in direction `d`, or -1 if there is none.
+    Removing a vertex gives its slot to the last vertex. Every table is a flat array, so a graph can be stored and
+    loaded as a handful of buffers, see `from_arrays`.
+
+    Building the graph is O(cells) in time and memory: the vertices are found by a single scan of the neighbour masks,
+    and every corridor cell is visited exactly once, by the walk along its corridor.
+    """
+
+    def __init__(self, neighbours: NeighbourTable[Any]):
+        self._initialise(neighbours)
+
+        masks = neighbours.masks
+        vertex_flags = bytes(masks).translate(_VERTEX_MASKS)
+        vertex = vertex_flags.find(1)
+        while vertex != -1:
+            self._add_vertex(vertex)
+            vertex = vertex_flags.find(1, vertex + 1)
+
+        vertex_slots, slot_edges = self.vertex_slots, self.slot_edges
+        for vertex in self.vertices:
+            base = 4 * vertex_slots[vertex]
+            for direction in MASK_DIRECTIONS[masks[vertex]]:
+                if slot_edges[base + direction] == -1:
+                    self._add_edge(vertex, direction)
+
+    def _initialise(self, neighbours: NeighbourTable[Any]) -> None:
+        self.neighbours = neighbours
+        typecode = index_typecode(len(neighbours.masks))
+        self.vertices = array(typecode)
+        self.vertex_slots = array(typecode, [-1]) * len(neighbours.masks)
+        self.slot_edges = array(typecode)
+        self.edge_tails = array(typecode)
+        self.edge_heads = array(typecode)
+        self.edge_tail_directions = bytearray()
+        self.edge_head_directions = bytearray()
+        self.edge_lengths = array(typecode)
+        self.free_edges = array(typecode)
+        self._growable = True
+
+    @classmethod
+    def from_arrays(
+        cls,
+        neighbours: NeighbourTable[Any],
+        vertices: MutableSequence[int],
+        vertex_slots: MutableSequence[int],
+        slot_edges: MutableSequence[int],
+        edge_tails: MutableSequence[int],
+        edge_heads: MutableSequence[int],
+        edge_tail_directions: MutableSequence[int],
+        edge_head_directions: MutableSequence[int],
+        edge_lengths: MutableSequence[int],
+        free_edges: MutableSequence[int],
+    ) -> "CorridorGraph":
+        """
+        Wrap previously computed tables, e.g. loaded from disk, without walking any corridors or copying them. They can
+        be writable memoryviews over a mapped file, which are only copied into arrays if the graph grows, when cells
+        change. The tables must describe the contracted form of the grid of `neighbours`.
+        """
+        graph = cls.__new__(cls)
+        graph.neighbours = neighbours
+        # Memoryviews stand in for the arrays until `_make_growable` is called, so they are typed as arrays.
+        graph.vertices, graph.vertex_slots, graph.slot_edges = cast(Any, (vertices, vertex_slots, slot_edges))
+        graph.edge_tails, graph.edge_heads, graph.edge_lengths = cast(Any, (edge_tails, edge_heads, edge_lengths))
+        graph.edge_tail_directions, graph.edge_head_directions = cast(Any, (edge_tail_directions, edge_head_directions))
+        graph.free_edges = cast(Any, free_edges)
+        graph._growable = False
+        return graph
+
+    def _make_growable(self) -> None:
+        """Copy any tables which are not arrays, e.g. memoryviews over a mapped file, into arrays which can grow."""
+        if self._growable:
+            return
+        typecode = index_typecode(len(self.neighbours.masks))
+        for name in _INDEX_TABLES:
+            setattr(self, name, array(typecode, getattr(self, name)))
+        self.edge_tail_directions = bytearray(self.edge_tail_directions)
+        self.edge_head_directions = bytearray(self.edge_head_directions)
+        self._growable = True
+
+    def __len__(self) -> int:
+        """Return the number of vertices."""
+        return len(self.vertices)
+
+    def is_vertex(self, cell: int) -> bool:
+        return self.vertex_slots[cell] != -1
+
+    def incident_edges(self, vertex: int) -> Sequence[int]:
+        """Return the edges leaving a vertex in each direction, with -1 for the directions without one."""
+        start = 4 * self.vertex_slots[vertex]
+        end = start + 4
+        return self.slot_edges[start:end]
+
+    def edges(self) -> list[int]:
+        """Return the ids of all edges."""
+        return [edge for edge, tail in enumerate(self.edge_tails) if tail != -1]
+
+    def other_end(self, edge: int, vertex: int) -> int:
+        """Return the end of the edge which is not the given vertex, or the vertex itself for loops."""
+        tail = self.edge_tails[edge]
+        return self.edge_heads[edge] if tail == vertex else tail
+
+    def walk(
+        self, cell: int, direction: int, steps: Optional[list[SolveStep]] = None, stop: Container[int] = ()
+    ) -> tuple[int, int, int]:
+        """
+        Walk from the given cell in the given direction along a corridor, until a vertex or a cell in `stop` is reached.
+        :param steps: If given, the steps taken are appended to it.
+        :return: The cell reached, the direction leading back into the corridor from it and the number of steps taken.
+        """
+        masks, offsets, vertex_slots = self.neighbours.masks, self.neighbours.offsets, self.vertex_slots
+        cell += offsets[direction]
+        length = 1
+        if steps is not None:
+            steps.append(DIRECTIONS[direction])
+
+        while vertex_slots[cell] == -1 and cell not in stop:
+            direction = _NEXT_DIRECTIONS[masks[cell] << 2 | direction ^ 1]
+            if direction == 255:
+                break
+            cell += offsets[direction]
+            length += 1
+            if steps is not None:
+                steps.append(DIRECTIONS[direction])
+
+        return cell, direction ^ 1, length
+
+    def edge_steps(self, edge: int) -> list[SolveStep]:
+        """Return the steps along the corridor of the given edge, from its tail to its head."""
+        steps: list[SolveStep] = []
+        self.walk(self.edge_tails[edge], self.edge_tail_directions[edge], steps)
+        return steps
+
+    def locate(self, cell: int) -> Optional[int]:
+        """
+        Return the edge whose corridor contains the given open cell, which must not be a vertex.
+        Returns None if the cell is not part of the graph, i.e. it has no open neighbours or lies on a closed loop.
+        """
+        directions = MASK_DIRECTIONS[self.neighbours.masks[cell]]
+        if not directions:
+            return None
+        end, end_direction, _ = self.walk(cell, directions[0], stop=(cell,))
+        slot = self.vertex_slots[end]
+        if slot == -1:
+            return None
+        return self.slot_edges[4 * slot + end_direction]
+
+    def attach(self, cell: int, stop: Collection[int] = ()) -> list[tuple[int, int, int, int]]:
+        """
+        Return how the given open cell joins the graph, which lets searches start or end at cells inside corridors.
+
+        For every direction leading out of the cell, its corridor is walked until a vertex or a cell in `stop` is
+        reached. Walks which lead back to the cell itself, around a closed loop, are left out.
+        :return: Tuples of the direction out of the cell, the cell reached, the direction leading back into the corridor
+            from it and the number of steps taken.
+        """
+        moves = []
+        for direction in MASK_DIRECTIONS[self.neighbours.masks[cell]]:
+            end, end_direction, length = self.walk(cell, direction, stop={cell, *stop})
+            if end != cell:
+                moves.append((direction, end, end_direction, length))
+        return moves
+
+    def detach(self, cells: Collection[int]) -> set[int]:
+        """
+        Remove every edge incident on or passing through the given cells, before any of them change.
+
+        Together with `reconnect`, this updates the graph after a few cells change, touching only the corridors around
+        them: remaining edges are untouched by the change, so they stay valid.
+        :param cells: The cells whose neighbour masks are about to change.
+        :return: The vertices which lost edges, to be passed to `reconnect`.
+        """
+        detached_ends: set[int] = set()
+        for cell in cells:
+            if self.vertex_slots[cell] != -1:
+                edges = {edge for edge in self.incident_edges(cell) if edge != -1}
+            else:
+                located = self.locate(cell)
+                edges = set() if located is None or located == -1 else {located}
+            for edge in edges:
+                detached_ends.update((self.edge_tails[edge], self.edge_heads[edge]))
+                self._remove_edge(edge)
+        return detached_ends
+
+    def reconnect(self, cells: Collection[int], detached_ends: Collection[int]) -> None:
+        """
+        Rebuild the edges removed by `detach`, once the given cells' neighbour masks have been updated.
+        :param cells: The cells passed to `detach`.
+        :param detached_ends: The vertices returned by `detach`.
+        """
+        self._make_growable()
+        masks = self.neighbours.masks
+        for cell in cells:
+            if _VERTEX_MASKS[masks[cell]] and self.vertex_slots[cell] == -1:
+                self._add_vertex(cell)
+            elif not _VERTEX_MASKS[masks[cell]] and self.vertex_slots[cell] != -1:
+                self._remove_vertex(cell)
+
+        for vertex in {*cells, *detached_ends}:
+            if self.vertex_slots[vertex] == -1:
+                continue
+            for direction in MASK_DIRECTIONS[masks[vertex]]:
+                if self.slot_edges[4 * self.vertex_slots[vertex] + direction] == -1:
+                    self._add_edge(vertex, direction)
+
+    def _add_vertex(self, cell: int) -> None:
+        self.vertex_slots[cell] = len(self.vertices)
+        self.vertices.append(cell)
+        self.slot_edges.extend((-1, -1, -1, -1))
+
+    def _remove_vertex(self, cell: int) -> None:
+        """Remove a vertex without edges, moving the last vertex into its slot."""
+        slot, last = self.vertex_slots[cell], self.vertices.pop()
+        if last != cell:
+            self.vertices[slot] = last
+            self.vertex_slots[last] = slot
+            start, end = 4 * slot, 4 * slot + 4
+            self.slot_edges[start:end] = self.slot_edges[-4:]
+        del self.slot_edges[-4:]
+        self.vertex_slots[cell] = -1
+
+    def _add_edge(self, tail: int, tail_direction: int) -> int:
+        head, head_direction, length = self.walk(tail, tail_direction)
+        if self.free_edges:
+            edge = self.free_edges.pop()
+            self.edge_tails[edge], self.edge_heads[edge] = tail, head
+            self.edge_tail_directions[edge], self.edge_head_directions[edge] = tail_direction, head_direction
+            self.edge_lengths[edge] = length
+        else:
+            edge = len(self.edge_tails)
+            self.edge_tails.append(tail)
+            self.edge_heads.append(head)
+            self.edge_tail_directions.append(tail_direction)
+            self.edge_head_directions.append(head_direction)
+            self.edge_lengths.append(length)
+        self.slot_edges[4 * self.vertex_slots[tail] + tail_direction] = edge
+        self.slot_edges[4 * self.vertex_slots[head] + head_direction] = edge
+        return edge
+
+    def _remove_edge(self, edge: int) -> None:
+        self.slot_edges[4 * self.vertex_slots[self.edge_tails[edge]] + self.edge_tail_directions[edge]] = -1
+        self.slot_edges[4 * self.vertex_slots[self.edge_heads[edge]] + self.edge_head_directions[edge]] = -1
+        self.edge_tails[edge] = self.edge_heads[edge] = -1
+        self._make_growable()
+        self.free_edges.append(edge)
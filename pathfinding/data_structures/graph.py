@@ -1,57 +1,124 @@
-from dataclasses import dataclass, field
-from typing import ClassVar, Generic, TypeVar
+from collections.abc import Iterable
+from typing import Generic, Optional, TypeVar
 
 V = TypeVar("V")
 E = TypeVar("E")
 
 
-@dataclass
 class Vertex(Generic[V, E]):
-    data: V
-    edges: set["Edge[V, E]"] = field(default_factory=set)
-    _counter: ClassVar[int] = 0
+    """
+    A vertex holding some data, and the edges incident to it.
 
-    def __post_init__(self) -> None:
-        self._id = Vertex._counter
-        Vertex._counter += 1
+    Vertices are compared and hashed by identity. Their `id` is -1 until they are added to a graph, and then their
+    index in the graph's `vertices`.
+    """
 
-    def __hash__(self) -> int:
-        return hash(self._id)
+    __slots__ = ("data", "edges", "id")
+
+    def __init__(self, data: V, edges: Optional[Iterable["Edge[V, E]"]] = None):
+        self.data = data
+        self.edges: list[Edge[V, E]] = [] if edges is None else list(edges)
+        self.id = -1
+
+    def __repr__(self) -> str:
+        return f"Vertex(id={self.id}, data={self.data!r})"
 
 
-@dataclass
 class Edge(Generic[V, E]):
-    data: E
-    tail: Vertex[V, E]
-    head: Vertex[V, E]
-    _counter: ClassVar[int] = 0
+    """
+    An edge holding some data, from its tail to its head.
+
+    Edges are compared and hashed by identity. Their `id` is -1 until they are added to a graph, and then their index
+    in the graph's `edges`.
+    """
+
+    __slots__ = ("data", "tail", "head", "id")
+
+    def __init__(self, data: E, tail: Vertex[V, E], head: Vertex[V, E]):
+        self.data = data
+        self.tail = tail
+        self.head = head
+        self.id = -1
 
     def get_other_end(self, vertex: Vertex[V, E]) -> Vertex[V, E]:
-        return self.head if vertex == self.tail else self.tail
+        return self.head if vertex is self.tail else self.tail
+
+    def __repr__(self) -> str:
+        return f"Edge(id={self.id}, data={self.data!r}, tail={self.tail.id}, head={self.head.id})"
 
-    def __post_init__(self) -> None:
-        self._id = Edge._counter
-        Edge._counter += 1
 
-    def __hash__(self) -> int:
-        return hash(self._id)
+def _ends(edge: Edge[V, E]) -> tuple[Vertex[V, E], ...]:
+    return (edge.tail,) if edge.tail is edge.head else (edge.tail, edge.head)
 
 
-@dataclass
 class Graph(Generic[V, E]):
-    vertices: set[Vertex[V, E]] = field(default_factory=set)
-    edges: set[Edge[V, E]] = field(default_factory=set)
+    """
+    A graph whose vertices and edges are kept in lists indexed by their ids, so per-vertex and per-edge values can be
+    stored in arrays indexed by id instead of dicts.
 
-    def add_edge(self, edge: Edge[V, E]) -> None:
-        self.edges.add(edge)
-        self.vertices.update({edge.head, edge.tail})
+    Ids are dense: they always run from 0 to the number of vertices or edges. Removing a vertex or edge gives its id
+    to the last one added, the only one whose id changes. A vertex or edge can belong to only one graph at a time.
+    """
 
-    def remove_edge(self, edge: Edge[V, E]) -> None:
-        self.edges.remove(edge)
+    __slots__ = ("vertices", "edges")
+
+    def __init__(self) -> None:
+        self.vertices: list[Vertex[V, E]] = []
+        self.edges: list[Edge[V, E]] = []
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, Vertex):
+            return 0 <= item.id < len(self.vertices) and self.vertices[item.id] is item
+        if isinstance(item, Edge):
+            return 0 <= item.id < len(self.edges) and self.edges[item.id] is item
+        return False
 
     def add_vertex(self, vertex: Vertex[V, E]) -> None:
-        self.vertices.add(vertex)
-        self.edges.update(vertex.edges)
+        """Add a vertex, along with the edges already incident to it and their other ends."""
+        self._add_vertex(vertex)
+        for edge in vertex.edges:
+            self.add_edge(edge)
+
+    def add_edge(self, edge: Edge[V, E]) -> None:
+        """Add an edge and its ends, making it incident to both, unless it is already in the graph."""
+        if edge in self:
+            return
+        edge.id = len(self.edges)
+        self.edges.append(edge)
+        for end in _ends(edge):
+            if edge not in end.edges:
+                end.edges.append(edge)
+            self._add_vertex(end)
+
+    def remove_edge(self, edge: Edge[V, E]) -> None:
+        """Remove an edge, detaching it from its ends."""
+        if edge not in self:
+            raise ValueError("edge is not in the graph")
+        for end in _ends(edge):
+            end.edges.remove(edge)
+        last = self.edges.pop()
+        if last is not edge:
+            last.id = edge.id
+            self.edges[edge.id] = last
+        edge.id = -1
 
     def remove_vertex(self, vertex: Vertex[V, E]) -> None:
-        self.vertices.remove(vertex)
+        """Remove a vertex and the edges incident to it."""
+        if vertex not in self:
+            raise ValueError("vertex is not in the graph")
+        for edge in list(vertex.edges):
+            if edge in self:
+                self.remove_edge(edge)
+        last = self.vertices.pop()
+        if last is not vertex:
+            last.id = vertex.id
+            self.vertices[vertex.id] = last
+        vertex.id = -1
+
+    def _add_vertex(self, vertex: Vertex[V, E]) -> None:
+        if vertex not in self:
+            vertex.id = len(self.vertices)
+            self.vertices.append(vertex)
+
+    def __repr__(self) -> str:
+        return f"Graph(vertices={len(self.vertices)}, edges={len(self.edges)})"
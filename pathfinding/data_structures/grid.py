@@ -1,6 +1,7 @@
-from collections.abc import Callable, Iterator
+from array import array
+from collections.abc import Callable, Iterator, MutableSequence, Sequence
 from enum import Enum
-from typing import Generic, NamedTuple, TypeVar
+from typing import Any, Generic, NamedTuple, Optional, TypeVar, cast
 
 T = TypeVar("T")
 
@@ -96,3 +97,121 @@ class Grid(Generic[T]):
     @property
     def dimensions(self) -> tuple[int, int]:
         return len(self._elements), len(self._elements[0])
+
+
+class CompactGrid(Grid[T]):
+    """
+    A grid stored in a single flat buffer, indexed by `row * n_cols + col`.
+
+    If `values` is given, each cell holds the index of its element in `values`, so a `bytearray` can store up to 256
+    distinct elements (e.g. the states of a maze cell) at one byte per cell. Otherwise the cells hold the elements
+    themselves, which suits numeric buffers such as `array.array` or a NumPy array.
+    Does not allow negative indexing.
+    """
+
+    def __init__(self, dims: tuple[int, int], cells: MutableSequence[Any], values: Optional[Sequence[T]] = None):
+        n_rows, n_cols = dims
+        if len(cells) != n_rows * n_cols:
+            raise ValueError(f"expected {n_rows * n_cols} cells for dimensions {dims}, got {len(cells)}")
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.cells = cells
+        self.values = values
+        self._codes = None if values is None else {value: code for code, value in enumerate(values)}
+        self.version = 0
+        """Incremented by every assignment through `__setitem__`, so caches derived from the grid can be validated."""
+
+    def index(self, row: int, col: int) -> int:
+        """Return the flat index of the cell at the given row and column."""
+        if not (0 <= row < self.n_rows and 0 <= col < self.n_cols):
+            raise IndexError("grid index out of range")
+        return row * self.n_cols + col
+
+    def position_of(self, index: int) -> Position:
+        """Return the position of the cell with the given flat index."""
+        return Position(*divmod(index, self.n_cols))
+
+    def encode(self, value: T) -> Any:
+        """Return the representation of the given element as stored in `cells`."""
+        return value if self._codes is None else self._codes[value]
+
+    def decode(self, cell: Any) -> T:
+        """Return the element represented by the given value from `cells`."""
+        return cast(T, cell) if self.values is None else self.values[cell]
+
+    def __getitem__(self, item: tuple[int, int]) -> T:
+        row, col = item
+        return self.decode(self.cells[self.index(row, col)])
+
+    def __setitem__(self, key: tuple[int, int], value: T) -> None:
+        row, col = key
+        self.cells[self.index(row, col)] = self.encode(value)
+        self.version += 1
+
+    def __iter__(self) -> Iterator[tuple[Position, T]]:
+        for index, cell in enumerate(self.cells):
+            yield self.position_of(index), self.decode(cell)
+
+    def rows(self) -> list[list[T]]:
+        """Return the elements of the grid as a list of rows."""
+        rows = []
+        for row in range(self.n_rows):
+            start, end = row * self.n_cols, (row + 1) * self.n_cols
+            rows.append([self.decode(cell) for cell in self.cells[start:end]])
+        return rows
+
+    def __repr__(self) -> str:
+        return repr(self.rows())
+
+    def to_numpy(self) -> Any:
+        """
+        Return a 2D NumPy view of the cells, sharing memory with the grid where possible.
+        Requires NumPy to be installed.
+        """
+        import numpy as np
+
+        if isinstance(self.cells, np.ndarray):
+            flat = self.cells
+        elif isinstance(self.cells, array):
+            flat = np.frombuffer(self.cells, dtype=self.cells.typecode)
+        else:
+            flat = np.frombuffer(self.cells, dtype=np.uint8)
+        return flat.reshape(self.n_rows, self.n_cols)
+
+    @classmethod
+    def from_dimensions(cls, dims: tuple[int, int], default: T) -> "CompactGrid[T]":
+        """Initialise a list-backed grid with the given dimensions and default value."""
+        rows, cols = dims
+        return cls(dims, [default] * (rows * cols))
+
+    @classmethod
+    def from_dimensions_with_factory(
+        cls, dims: tuple[int, int], default_factory: Callable[[tuple[int, int]], T]
+    ) -> "CompactGrid[T]":
+        """Initialise a list-backed grid with the given dimensions, calling the factory for each position."""
+        rows, cols = dims
+        return cls(dims, [default_factory((row, col)) for row in range(rows) for col in range(cols)])
+
+    @classmethod
+    def filled(cls, dims: tuple[int, int], default: T, values: Sequence[T]) -> "CompactGrid[T]":
+        """Initialise a byte-per-cell grid with the given dimensions and default value, drawn from `values`."""
+        rows, cols = dims
+        return cls(dims, bytearray([list(values).index(default)]) * (rows * cols), values)
+
+    @classmethod
+    def from_typecode(cls, dims: tuple[int, int], typecode: str, default: T) -> "CompactGrid[T]":
+        """Initialise a grid backed by an `array.array` of the given typecode, filled with the default value."""
+        rows, cols = dims
+        initial: list[Any] = [default]
+        return cls(dims, array(typecode, initial) * (rows * cols))
+
+    @classmethod
+    def from_grid(cls, grid: Grid[T], values: Sequence[T]) -> "CompactGrid[T]":
+        """Convert a grid to a byte-per-cell grid whose elements are drawn from `values`."""
+        compact = cls.filled(grid.dimensions, values[0], values)
+        compact.cells = bytearray(compact.encode(element) for _, element in grid)
+        return compact
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        return self.n_rows, self.n_cols
@@ -0,0 +1,84 @@
+from collections.abc import Callable, Iterable
+from typing import Generic, TypeVar
+
+from .grid import CompactGrid, SolveStep
+
+T = TypeVar("T")
+
+DIRECTIONS: tuple[SolveStep, ...] = tuple(SolveStep)
+"""Maps a direction id to its step. The direction opposite to `d` is `d ^ 1`."""
+
+MASK_DIRECTIONS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(direction for direction in range(len(DIRECTIONS)) if mask >> direction & 1) for mask in range(16)
+)
+"""Maps a neighbour bitmask to the ids of the directions set in it."""
+
+
+class NeighbourTable(Generic[T]):
+    """
+    Precomputed open neighbours of every cell of a compact grid.
+
+    `masks[index]` has bit `d` set when the cell at flat index `index` is open and so is its neighbour in direction
+    `DIRECTIONS[d]`, which lies at flat index `index + offsets[d]`. Cells on the boundary never have bits set for
+    directions leading off the grid, so hot loops need neither bounds checks nor `IndexError` handling:
+
+        for direction in MASK_DIRECTIONS[table.masks[index]]:
+            neighbour = index + table.offsets[direction]
+    """
+
+    def __init__(self, grid: CompactGrid[T], is_open: Callable[[T], bool]):
+        if grid.values is None:
+            raise ValueError("neighbour tables require a grid with encoded values")
+        self.grid = grid
+        self.offsets: tuple[int, ...] = (-grid.n_cols, grid.n_cols, -1, 1)
+        self._open_table = bytes(1 if is_open(value) else 0 for value in grid.values).ljust(256, b"\x00")
+        self.masks = self._build_masks()
+
+    def _build_masks(self) -> bytearray:
+        # Each byte of the cells becomes one lane of a big integer, so shifting by 8 bits moves to the next column and
+        # by 8 * n_cols bits to the next row. All lanes are then combined at C speed without a per-cell Python loop.
+        n_rows, n_cols = self.grid.dimensions
+        cells = self.grid.cells
+        data = cells if isinstance(cells, (bytes, bytearray)) else bytes(cells)
+
+        is_open = int.from_bytes(data.translate(self._open_table), "little")
+        not_first_col = int.from_bytes((b"\x00" + b"\x01" * (n_cols - 1)) * n_rows, "little")
+        not_last_col = int.from_bytes((b"\x01" * (n_cols - 1) + b"\x00") * n_rows, "little")
+
+        up = is_open & (is_open << 8 * n_cols)
+        down = is_open & (is_open >> 8 * n_cols)
+        left = is_open & (is_open << 8) & not_first_col
+        right = is_open & (is_open >> 8) & not_last_col
+        masks = up | down << 1 | left << 2 | right << 3
+        return bytearray(masks.to_bytes(n_rows * n_cols, "little"))
+
+    def is_open(self, index: int) -> bool:
+        """Return whether the cell at the given flat index is open."""
+        return bool(self._open_table[self.grid.cells[index]])
+
+    def neighbours(self, index: int) -> list[tuple[int, int]]:
+        """Return the direction ids and flat indices of the open neighbours of the given open cell."""
+        return [(direction, index + self.offsets[direction]) for direction in MASK_DIRECTIONS[self.masks[index]]]
+
+    def degree(self, index: int) -> int:
+        """Return the number of open neighbours of the given open cell."""
+        return len(MASK_DIRECTIONS[self.masks[index]])
+
+    def _in_bounds_directions(self, index: int) -> list[int]:
+        row, col = divmod(index, self.grid.n_cols)
+        in_bounds = (row > 0, row < self.grid.n_rows - 1, col > 0, col < self.grid.n_cols - 1)
+        return [direction for direction in range(len(DIRECTIONS)) if in_bounds[direction]]
+
+    def neighbourhood(self, index: int) -> list[int]:
+        """Return the given cell and the cells next to it, whether open or not."""
+        return [index] + [index + self.offsets[direction] for direction in self._in_bounds_directions(index)]
+
+    def update(self, indices: Iterable[int]) -> None:
+        """Recompute the masks of the given cells and the cells next to them, after the given cells have changed."""
+        for cell in {cell for index in indices for cell in self.neighbourhood(index)}:
+            mask = 0
+            if self.is_open(cell):
+                for direction in self._in_bounds_directions(cell):
+                    if self.is_open(cell + self.offsets[direction]):
+                        mask |= 1 << direction
+            self.masks[cell] = mask
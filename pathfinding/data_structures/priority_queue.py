@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from math import ceil
-from typing import Generic, TypeVar
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -32,72 +32,243 @@ class PriorityQueue(Generic[T], ABC):
         """Return the number of elements currently in the priority queue."""
 
 
-@dataclass(order=True)
-class _HeapEntry(Generic[T]):
-    priority: float
-    index: int
-    element: T = field(compare=False)
+class DaryHeap(PriorityQueue[T]):
+    """
+    An indexed min-heap in which every node has up to `arity` children.
 
+    Priorities and elements are kept in two parallel lists and each element's position in a dict, so no object is
+    allocated per entry. Sifting moves a hole through the heap instead of swapping, writing each moved entry once.
+    Wider heaps are shallower, which makes `push` and `decrease_priority` cheaper at the cost of `pop`.
+    """
 
-class Heap(PriorityQueue[T]):
-    def __init__(self, *elements_with_priorities: tuple[T, float]):
-        self._heap: list[_HeapEntry[T]] = []
+    def __init__(self, *elements_with_priorities: tuple[T, float], arity: int = 4):
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+        self.arity = arity
+        self._priorities: list[float] = []
+        self._elements: list[T] = []
         self._element_index_map: dict[T, int] = {}
 
         for element, priority in elements_with_priorities:
             self.push(element, priority)
 
     def push(self, element: T, priority: float) -> None:
-        self._heap.append(_HeapEntry(priority, len(self._heap), element))
-        self._element_index_map[element] = len(self._heap) - 1
-        self.sift_up(len(self._heap) - 1)
+        if element in self._element_index_map:
+            raise ValueError("element is already in the heap")
+        self._priorities.append(priority)
+        self._elements.append(element)
+        self.sift_up(len(self._elements) - 1)
 
     def pop(self) -> T:
-        popped = self.peek()
-        self._element_index_map.pop(popped)
-        last_element = self._heap.pop()
-        if self._heap:
-            self._heap[0] = last_element
-            self._element_index_map[self._heap[0].element] = 0
+        popped = self._elements[0]
+        del self._element_index_map[popped]
+        last_priority, last_element = self._priorities.pop(), self._elements.pop()
+        if self._elements:
+            self._priorities[0], self._elements[0] = last_priority, last_element
             self.sift_down()
         return popped
 
     def peek(self) -> T:
-        return self._heap[0].element
+        return self._elements[0]
 
     def decrease_priority(self, element: T, new_priority: float) -> None:
         index = self._element_index_map[element]
-        if self._heap[index].priority < new_priority:
+        if self._priorities[index] < new_priority:
             raise ValueError("New priority is greater than current priority.")
-        self._heap[index].priority = new_priority
+        self._priorities[index] = new_priority
         self.sift_up(index)
 
     def __len__(self) -> int:
-        return len(self._heap)
+        return len(self._elements)
 
     def sift_up(self, index: int) -> None:
-        parent_index = ceil(index / 2) - 1
-        while index > 0 and self._heap[index] < self._heap[parent_index]:
-            self._swap_indices(index, parent_index)
+        priorities, elements, index_map, arity = self._priorities, self._elements, self._element_index_map, self.arity
+        priority, element = priorities[index], elements[index]
+
+        while index > 0:
+            parent_index = (index - 1) // arity
+            if priorities[parent_index] <= priority:
+                break
+            priorities[index], elements[index] = priorities[parent_index], elements[parent_index]
+            index_map[elements[index]] = index
             index = parent_index
-            parent_index = ceil(parent_index / 2) - 1
-
-    def sift_down(self) -> None:
-        index = 0
-        if 2 * index + 2 >= len(self._heap):
-            return
-        min_child_index = min((2 * index + 1, 2 * index + 2), key=lambda i: self._heap[i])
-        while index < len(self._heap) and self._heap[index] > self._heap[min_child_index]:
-            self._swap_indices(index, min_child_index)
+
+        priorities[index], elements[index] = priority, element
+        index_map[element] = index
+
+    def sift_down(self, index: int = 0) -> None:
+        priorities, elements, index_map, arity = self._priorities, self._elements, self._element_index_map, self.arity
+        priority, element = priorities[index], elements[index]
+        size = len(elements)
+
+        while True:
+            first_child_index = arity * index + 1
+            if first_child_index >= size:
+                break
+            min_child_index, min_child_priority = first_child_index, priorities[first_child_index]
+            for child_index in range(first_child_index + 1, min(first_child_index + arity, size)):
+                if priorities[child_index] < min_child_priority:
+                    min_child_index, min_child_priority = child_index, priorities[child_index]
+            if min_child_priority >= priority:
+                break
+            priorities[index], elements[index] = priorities[min_child_index], elements[min_child_index]
+            index_map[elements[index]] = index
             index = min_child_index
-            if 2 * index + 2 >= len(self._heap):
-                return
-            min_child_index = min((2 * index + 1, 2 * index + 2), key=lambda i: self._heap[i])
 
-    def _swap_indices(self, i1: int, i2: int) -> None:
-        self._heap[i1], self._heap[i2] = self._heap[i2], self._heap[i1]
-        self._element_index_map.update({self._heap[i1].element: i1, self._heap[i2].element: i2})
+        priorities[index], elements[index] = priority, element
+        index_map[element] = index
+
+    def __repr__(self) -> str:
+        entries = ", ".join(
+            f"(element={element}, priority={priority})" for element, priority in zip(self._elements, self._priorities)
+        )
+        return f"{type(self).__name__}({entries})"
+
+
+class Heap(DaryHeap[T]):
+    """An indexed binary min-heap."""
+
+    def __init__(self, *elements_with_priorities: tuple[T, float]):
+        super().__init__(*elements_with_priorities, arity=2)
+
+    def sift_down(self, index: int = 0) -> None:
+        # Specialised for two children, which avoids the inner loop over the children of each node.
+        priorities, elements, index_map = self._priorities, self._elements, self._element_index_map
+        priority, element = priorities[index], elements[index]
+        size = len(elements)
+
+        while (child_index := 2 * index + 1) < size:
+            if child_index + 1 < size and priorities[child_index + 1] < priorities[child_index]:
+                child_index += 1
+            if priorities[child_index] >= priority:
+                break
+            priorities[index], elements[index] = priorities[child_index], elements[child_index]
+            index_map[elements[index]] = index
+            index = child_index
+
+        priorities[index], elements[index] = priority, element
+        index_map[element] = index
+
+
+class BucketQueue(PriorityQueue[T]):
+    """
+    Dial's bucket queue for non-negative integer priorities, such as path lengths over corridor edges.
+
+    Elements are appended to one bucket per priority and the queue scans forward from the lowest non-empty bucket, so
+    every operation is O(1) amortised when priorities are popped in non-decreasing order, as in Dijkstra's algorithm.
+    Decreasing a priority leaves a stale entry behind in the old bucket, which is skipped when it is reached.
+    """
+
+    def __init__(self, *elements_with_priorities: tuple[T, float]):
+        self._buckets: dict[int, list[T]] = {}
+        self._priorities: dict[T, int] = {}
+        self._current = 0
+
+        for element, priority in elements_with_priorities:
+            self.push(element, priority)
+
+    def push(self, element: T, priority: float) -> None:
+        if element in self._priorities:
+            raise ValueError("element is already in the queue")
+        self._insert(element, priority)
+
+    def pop(self) -> T:
+        popped = self.peek()
+        self._buckets[self._current].pop()
+        del self._priorities[popped]
+        return popped
+
+    def peek(self) -> T:
+        if not self._priorities:
+            raise IndexError("peek from an empty priority queue")
+        while True:
+            bucket = self._buckets.get(self._current)
+            while bucket:
+                if self._priorities.get(bucket[-1]) == self._current:
+                    return bucket[-1]
+                bucket.pop()
+            self._buckets.pop(self._current, None)
+            self._current += 1
+
+    def decrease_priority(self, element: T, new_priority: float) -> None:
+        if self._priorities[element] < new_priority:
+            raise ValueError("New priority is greater than current priority.")
+        self._insert(element, new_priority)
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+    def _insert(self, element: T, priority: float) -> None:
+        bucket_priority = int(priority)
+        if bucket_priority != priority or bucket_priority < 0:
+            raise ValueError("bucket queues only support non-negative integer priorities")
+        self._priorities[element] = bucket_priority
+        self._buckets.setdefault(bucket_priority, []).append(element)
+        self._current = min(self._current, bucket_priority)
+
+    def __repr__(self) -> str:
+        entries = ", ".join(
+            f"(element={element}, priority={priority})" for element, priority in self._priorities.items()
+        )
+        return f"BucketQueue({entries})"
+
+
+@dataclass
+class QueueCounters:
+    """Operation counts of one or more `InstrumentedQueue`s, and the largest number of elements they held at once."""
+
+    pushes: int = 0
+    pops: int = 0
+    decrease_keys: int = 0
+    size: int = 0
+    max_size: int = 0
+
+
+class InstrumentedQueue(PriorityQueue[T]):
+    """
+    A priority queue which counts the operations on another one, for profiling searches.
+
+    Queues sharing one `QueueCounters` add up their counts, and `max_size` is then the largest number of elements held
+    by all of them at once, e.g. both frontiers of a bidirectional search.
+    :param queue_factory: Creates the queue the operations are passed on to.
+    :param counters: The counters to update, shared with other queues or created for this one.
+    """
+
+    def __init__(
+        self,
+        *elements_with_priorities: tuple[T, float],
+        queue_factory: Callable[[], PriorityQueue[T]] = Heap,
+        counters: Optional[QueueCounters] = None,
+    ):
+        self._queue = queue_factory()
+        self.counters = QueueCounters() if counters is None else counters
+
+        for element, priority in elements_with_priorities:
+            self.push(element, priority)
+
+    def push(self, element: T, priority: float) -> None:
+        self._queue.push(element, priority)
+        counters = self.counters
+        counters.pushes += 1
+        counters.size += 1
+        if counters.size > counters.max_size:
+            counters.max_size = counters.size
+
+    def pop(self) -> T:
+        popped = self._queue.pop()
+        self.counters.pops += 1
+        self.counters.size -= 1
+        return popped
+
+    def peek(self) -> T:
+        return self._queue.peek()
+
+    def decrease_priority(self, element: T, new_priority: float) -> None:
+        self._queue.decrease_priority(element, new_priority)
+        self.counters.decrease_keys += 1
+
+    def __len__(self) -> int:
+        return len(self._queue)
 
     def __repr__(self) -> str:
-        entries = ", ".join(f"(element={entry.element}, priority={entry.priority})" for entry in self._heap)
-        return f"Heap({entries})"
+        return f"InstrumentedQueue({self._queue!r})"
@@ -0,0 +1,196 @@
+import struct
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from io import BufferedIOBase
+from os import PathLike
+from typing import Any, Optional, TypeVar, Union, cast
+
+from .grid import Grid, Position
+
+T = TypeVar("T")
+
+MAGIC = b"PFTG"
+VERSION = 1
+HEADER = struct.Struct("<4sHQQI")
+"""Magic bytes, format version, number of rows, number of columns, tile size."""
+
+
+class TiledGrid(Grid[T]):
+    """
+    A grid stored on disk in square tiles of `tile_size` x `tile_size` cells, one byte per cell, of which at most
+    `max_tiles` are held in memory at once, for grids too large to fit in memory.
+
+    Tiles are stored one after the other in row-major order of tiles, each as its cells in row-major order, with the
+    tiles on the bottom and right edges padded to full size. They are read when first accessed and kept in an LRU
+    cache; changes are written back when a changed tile is evicted, on `flush` and on `close`. The `hits`, `misses`
+    and `evictions` counters count tile lookups, for tuning `max_tiles`.
+
+    Like `CompactGrid`, if `values` is given, each cell holds the index of its element in `values`.
+    Does not allow negative indexing.
+    :param writable: Whether cells can be set.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, PathLike[str]],
+        values: Optional[Sequence[T]] = None,
+        max_tiles: int = 64,
+        writable: bool = False,
+    ):
+        if max_tiles < 1:
+            raise ValueError("max_tiles must be at least 1")
+        self.path = path
+        self.values = values
+        self._codes = None if values is None else {value: code for code, value in enumerate(values)}
+        self.max_tiles = max_tiles
+        self.writable = writable
+        self._file: BufferedIOBase = open(path, "r+b") if writable else open(path, "rb")
+
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            self._file.close()
+            raise ValueError("not a tiled grid file")
+        magic, version, self.n_rows, self.n_cols, self.tile_size = HEADER.unpack(header)
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError("not a tiled grid file")
+        if version != VERSION:
+            self._file.close()
+            raise ValueError(f"unsupported tiled grid version {version}")
+        self.n_tile_cols = -(-self.n_cols // self.tile_size)
+
+        self._tiles: OrderedDict[int, bytearray] = OrderedDict()
+        self._dirty: set[int] = set()
+        self._last_tile_id = -1
+        self._last_tile = bytearray()
+        self.hits = self.misses = self.evictions = 0
+
+    @classmethod
+    def create(
+        cls,
+        path: Union[str, PathLike[str]],
+        dims: tuple[int, int],
+        tile_size: int = 256,
+        fill: int = 0,
+        values: Optional[Sequence[T]] = None,
+        max_tiles: int = 64,
+    ) -> "TiledGrid[T]":
+        """Create a grid file with every cell set to the code `fill`, and open it for writing."""
+        n_rows, n_cols = dims
+        n_tiles = -(-n_rows // tile_size) * -(-n_cols // tile_size)
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, n_rows, n_cols, tile_size))
+            if fill == 0:
+                file.truncate(HEADER.size + n_tiles * tile_size * tile_size)
+            else:
+                tile = bytes([fill]) * (tile_size * tile_size)
+                for _ in range(n_tiles):
+                    file.write(tile)
+        return cls(path, values, max_tiles, writable=True)
+
+    @property
+    def dimensions(self) -> tuple[int, int]:
+        return self.n_rows, self.n_cols
+
+    def _tile(self, tile_id: int) -> bytearray:
+        tile = self._tiles.get(tile_id)
+        if tile is not None:
+            self.hits += 1
+            self._tiles.move_to_end(tile_id)
+        else:
+            self.misses += 1
+            if len(self._tiles) >= self.max_tiles:
+                self._evict()
+            tile = bytearray(self.tile_size * self.tile_size)
+            self._file.seek(HEADER.size + tile_id * len(tile))
+            self._file.readinto(tile)
+            self._tiles[tile_id] = tile
+        self._last_tile_id, self._last_tile = tile_id, tile
+        return tile
+
+    def _evict(self) -> None:
+        tile_id, tile = self._tiles.popitem(last=False)
+        self.evictions += 1
+        if tile_id in self._dirty:
+            self._write_tile(tile_id, tile)
+            self._dirty.discard(tile_id)
+        if tile_id == self._last_tile_id:
+            self._last_tile_id = -1
+
+    def _write_tile(self, tile_id: int, tile: bytearray) -> None:
+        self._file.seek(HEADER.size + tile_id * len(tile))
+        self._file.write(tile)
+
+    def _locate(self, row: int, col: int) -> tuple[int, int]:
+        if not (0 <= row < self.n_rows and 0 <= col < self.n_cols):
+            raise IndexError("grid index out of range")
+        tile_row, row_offset = divmod(row, self.tile_size)
+        tile_col, col_offset = divmod(col, self.tile_size)
+        return tile_row * self.n_tile_cols + tile_col, row_offset * self.tile_size + col_offset
+
+    def code_at(self, row: int, col: int) -> int:
+        """Return the code stored for the cell at the given row and column, see `CompactGrid.encode`."""
+        tile_id, offset = self._locate(row, col)
+        if tile_id == self._last_tile_id:
+            # Consecutive lookups mostly fall in the same tile, which is then the most recently used already.
+            self.hits += 1
+            return self._last_tile[offset]
+        return self._tile(tile_id)[offset]
+
+    def __getitem__(self, item: tuple[int, int]) -> T:
+        code = self.code_at(*item)
+        return cast(T, code) if self.values is None else self.values[code]
+
+    def __setitem__(self, key: tuple[int, int], value: T) -> None:
+        if not self.writable:
+            raise ValueError("tiled grid was not opened for writing")
+        tile_id, offset = self._locate(*key)
+        self._tile(tile_id)[offset] = cast(int, value) if self._codes is None else self._codes[value]
+        self._dirty.add(tile_id)
+
+    def set_row(self, row: int, codes: bytes) -> None:
+        """Set the codes of a whole row of cells, e.g. when converting a grid stored row by row."""
+        if not self.writable:
+            raise ValueError("tiled grid was not opened for writing")
+        if len(codes) != self.n_cols:
+            raise ValueError(f"expected {self.n_cols} cells, got {len(codes)}")
+        for col in range(0, self.n_cols, self.tile_size):
+            tile_id, offset = self._locate(row, col)
+            end_col = min(col + self.tile_size, self.n_cols)
+            end_offset = offset + end_col - col
+            self._tile(tile_id)[offset:end_offset] = codes[col:end_col]
+            self._dirty.add(tile_id)
+
+    def __iter__(self) -> Iterator[tuple[Position, T]]:
+        for row in range(self.n_rows):
+            for col in range(self.n_cols):
+                yield Position(row, col), self[row, col]
+
+    def flush(self) -> None:
+        """Write every changed tile back to the file."""
+        for tile_id in sorted(self._dirty):
+            self._write_tile(tile_id, self._tiles[tile_id])
+        self._dirty.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if self.writable:
+            self.flush()
+        self._file.close()
+        self._tiles.clear()
+        self._last_tile_id = -1
+
+    def __enter__(self) -> "TiledGrid[T]":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"TiledGrid(dims={self.dimensions}, tile_size={self.tile_size}, "
+            f"cached={len(self._tiles)}/{self.max_tiles}, hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions})"
+        )
@@ -1,4 +1,16 @@
+from .binary_loader import BinaryLoader, write_binary_maze
+from .file_loader import FileLoader, parse_maze_buffer
 from .maze_loader_abc import MazeLoader
-from .stdin_loader import StandardInputLoader
+from .stdin_loader import StandardInputLoader, parse_maze
+from .tiled_loader import write_tiled_maze
 
-__all__ = ["MazeLoader", "StandardInputLoader"]
+__all__ = [
+    "MazeLoader",
+    "StandardInputLoader",
+    "FileLoader",
+    "BinaryLoader",
+    "parse_maze",
+    "parse_maze_buffer",
+    "write_binary_maze",
+    "write_tiled_maze",
+]
@@ -0,0 +1,203 @@
+"""
+A compact binary maze format, for mazes which are loaded many times.
+
+All integers are little-endian. The file starts with a header (see `HEADER`) holding the magic bytes, format version,
+flags, dimensions, entry and exit points, section sizes and a CRC-32 of the rest of the file, including the header
+fields before it. It is followed by:
+
+- the cells, one bit per cell in row-major order, most significant bit first, set for walls and padded with zeros to a
+  whole byte;
+- if `FLAG_GRAPH` is set, zero padding up to a multiple of 8 bytes, then the corridor graph of the maze (see
+  `CorridorGraph`): a header (see `_GRAPH_HEADER`) holding the size of its ids in bytes, the number of vertices, edge
+  ids and free edge ids, then its tables in the order of `_GRAPH_TABLES`, each padded with zeros to a multiple of 8
+  bytes. The directions are one byte each, and every other value is a signed integer of the id size.
+
+The tables of the graph are laid out exactly as `CorridorGraph` holds them in memory, so on little-endian machines
+`BinaryLoader` uses them in place, as memoryviews over a copy-on-write mapping of the file, instead of reading them.
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from os import PathLike
+from typing import Any, Union
+
+from .._byteorder import little_endian
+from ..data_structures import CompactGrid, CorridorGraph, Position
+from ..data_structures.corridor_graph import index_typecode
+from ..maze import CELL_STATES, CellState, Maze
+from .maze_loader_abc import MazeLoader
+
+MAGIC = b"PFMZ"
+VERSION = 3
+FLAG_GRAPH = 1
+HEADER = struct.Struct("<4sHHIIIIIIQQI")
+_CHECKSUM_OFFSET = HEADER.size - 4
+_GRAPH_HEADER = struct.Struct("<QQQQ")
+"""Id size in bytes, number of vertices, number of edge ids, number of free edge ids."""
+_GRAPH_TABLES = (
+    "vertices",
+    "vertex_slots",
+    "slot_edges",
+    "edge_tails",
+    "edge_heads",
+    "edge_lengths",
+    "free_edges",
+    "edge_tail_directions",
+    "edge_head_directions",
+)
+
+_EMPTY, _WALL = CELL_STATES.index(CellState.EMPTY), CELL_STATES.index(CellState.WALL)
+_CELL_BITS = bytes.maketrans(bytes([_EMPTY, _WALL]), b"01")
+_BYTE_CELLS = tuple(bytes(_WALL if byte >> bit & 1 else _EMPTY for bit in range(7, -1, -1)) for byte in range(256))
+"""Maps a byte of packed cells to the codes of its 8 cells."""
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % 8)
+
+
+def _pack_cells(cells: bytes) -> bytes:
+    # Converting through a string of binary digits keeps the packing in C; both conversions are linear for base 2.
+    bits = cells.translate(_CELL_BITS)
+    n_bytes = (len(bits) + 7) // 8
+    return int(bits.ljust(8 * n_bytes, b"0"), 2).to_bytes(n_bytes, "big")
+
+
+def _unpack_cells(packed: memoryview, n_cells: int) -> bytearray:
+    cells = bytearray().join(map(_BYTE_CELLS.__getitem__, packed))
+    del cells[n_cells:]
+    return cells
+
+
+def _table_bytes(table: Any, typecode: str) -> bytes:
+    # On little-endian machines the tables are written straight from memory, without converting them to arrays.
+    data = bytes(memoryview(table)) if sys.byteorder == "little" else little_endian(array(typecode, table)).tobytes()
+    return data + _padding(len(data))
+
+
+def _pack_graph(corridors: CorridorGraph) -> bytes:
+    typecode = index_typecode(len(corridors.neighbours.masks))
+    sections = [
+        _GRAPH_HEADER.pack(
+            array(typecode).itemsize, len(corridors.vertices), len(corridors.edge_tails), len(corridors.free_edges)
+        )
+    ]
+    for name in _GRAPH_TABLES:
+        sections.append(_table_bytes(getattr(corridors, name), "B" if name.endswith("directions") else typecode))
+    return b"".join(sections)
+
+
+def write_binary_maze(maze: Maze, path: Union[str, PathLike[str]], include_graph: bool = True) -> None:
+    """
+    Write a maze to a file in the binary format read by `BinaryLoader`.
+    :param include_graph: Whether to also store the corridor graph of the maze, building it if needed.
+    """
+    n_rows, n_cols = maze.grid.dimensions
+    cells = _pack_cells(bytes(maze.grid.cells))
+    graph = _padding(HEADER.size + len(cells)) + _pack_graph(maze.corridors) if include_graph else b""
+    fields = (
+        MAGIC,
+        VERSION,
+        FLAG_GRAPH if include_graph else 0,
+        n_rows,
+        n_cols,
+        *maze.entry_point,
+        *maze.exit_point,
+        len(cells),
+        len(graph),
+    )
+    checksum = zlib.crc32(HEADER.pack(*fields, 0)[:_CHECKSUM_OFFSET])
+    header = HEADER.pack(*fields, zlib.crc32(graph, zlib.crc32(cells, checksum)))
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(cells)
+        file.write(graph)
+
+
+def _load_graph(maze: Maze, data: memoryview) -> CorridorGraph:
+    n_cells = len(maze.grid.cells)
+    typecode = index_typecode(n_cells)
+    id_size, n_vertices, n_edges, n_free_edges = _GRAPH_HEADER.unpack_from(data)
+    if id_size != array(typecode).itemsize:
+        raise ValueError("corrupt maze file: graph ids have the wrong size")
+    lengths = {
+        "vertices": n_vertices,
+        "vertex_slots": n_cells,
+        "slot_edges": 4 * n_vertices,
+        "free_edges": n_free_edges,
+    }
+
+    tables: dict[str, Any] = {}
+    offset = _GRAPH_HEADER.size
+    for name in _GRAPH_TABLES:
+        table_typecode: Any = "B" if name.endswith("directions") else typecode
+        size = lengths.get(name, n_edges) * (1 if table_typecode == "B" else id_size)
+        end = offset + size
+        if end > len(data):
+            raise ValueError("corrupt maze file: graph section has the wrong size")
+        table: Any = data[offset:end].cast(table_typecode)
+        if sys.byteorder == "big":
+            # The tables can only be used in place if they are in the byte order of this machine.
+            table = little_endian(array(table_typecode, table))
+        tables[name] = table
+        offset = end + len(_padding(size))
+    if offset != len(data):
+        raise ValueError("corrupt maze file: graph section has the wrong size")
+    return CorridorGraph.from_arrays(maze.neighbours, **tables)
+
+
+class BinaryLoader(MazeLoader):
+    """
+    Loads a maze written by `write_binary_maze`.
+    The file is memory-mapped, and its corridor graph, if stored, is used instead of being rebuilt.
+    :raises:
+        ValueError: If the file is not a maze file of a supported version, or its contents are corrupt
+    """
+
+    def __init__(self, path: Union[str, PathLike[str]]):
+        self.path = path
+
+    def load(self) -> Maze:
+        with open(self.path, "rb") as file:
+            # The mapping is not closed here: the tables of the loaded graph are views into it, and keep it open for as
+            # long as they are used. It is copy-on-write, so changes to the graph never reach the file.
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        return self._load(memoryview(mapped))
+
+    def _load(self, data: memoryview) -> Maze:
+        if len(data) < HEADER.size:
+            raise ValueError("not a maze file")
+        (
+            magic,
+            version,
+            flags,
+            n_rows,
+            n_cols,
+            entry_row,
+            entry_col,
+            exit_row,
+            exit_col,
+            cells_size,
+            graph_size,
+            checksum,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a maze file")
+        if version != VERSION:
+            raise ValueError(f"unsupported maze file version {version}")
+        if len(data) != HEADER.size + cells_size + graph_size or cells_size != (n_rows * n_cols + 7) // 8:
+            raise ValueError("corrupt maze file: sections have the wrong size")
+        cells_offset, graph_offset = HEADER.size, HEADER.size + cells_size
+        if zlib.crc32(data[cells_offset:], zlib.crc32(data[:_CHECKSUM_OFFSET])) != checksum:
+            raise ValueError("corrupt maze file: checksum mismatch")
+
+        cells = _unpack_cells(data[cells_offset:graph_offset], n_rows * n_cols)
+        grid = CompactGrid((n_rows, n_cols), cells, CELL_STATES)
+        maze = Maze(grid, Position(entry_row, entry_col), Position(exit_row, exit_col))
+
+        if flags & FLAG_GRAPH:
+            graph_offset += len(_padding(graph_offset))
+            maze.use_corridors(_load_graph(maze, data[graph_offset:]))
+        return maze
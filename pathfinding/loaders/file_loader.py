@@ -0,0 +1,152 @@
+import mmap
+from collections.abc import Iterator
+from os import PathLike
+from typing import NamedTuple, Optional, Union
+
+from ..data_structures import CompactGrid, Position
+from ..maze import CELL_STATES, CellState, Maze
+from .maze_loader_abc import MazeLoader
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+_INVALID = 255
+_CHAR_STATES = {b"#"[0]: CellState.WALL, b"."[0]: CellState.EMPTY, b"X"[0]: CellState.EMPTY, b"Y"[0]: CellState.EMPTY}
+_CELL_CODES = bytes(CELL_STATES.index(_CHAR_STATES[byte]) if byte in _CHAR_STATES else _INVALID for byte in range(256))
+"""Translates the characters of a maze file to the cell codes of a compact maze grid, and any other byte to 255."""
+
+
+def _find_endpoint(block: bytes, char: bytes, name: str, first_row: int, stride: int) -> Optional[Position]:
+    offset = block.find(char)
+    if offset == -1:
+        return None
+    position = Position(first_row + offset // stride, offset % stride)
+    second = block.find(char, offset + 1)
+    if second != -1:
+        raise ValueError(
+            f"{name} point already set at row: {position.row}, col: {position.col}, "
+            f"attempted to set again at row: {first_row + second // stride}, col: {second % stride}"
+        )
+    return position
+
+
+class _TextLayout(NamedTuple):
+    end: int
+    terminator: bytes
+    n_rows: int
+    n_cols: int
+    stride: int
+
+
+def _text_layout(view: memoryview, block_rows: int) -> _TextLayout:
+    """Measure the rows of the text of a maze, ignoring trailing line breaks."""
+    end = len(view)
+    while end > 0 and view[end - 1] in b"\r\n":
+        end -= 1
+    if end == 0:
+        raise IndexError("empty maze")
+
+    first_newline = -1
+    for start in range(0, end, block_rows):
+        chunk_end = min(start + block_rows, end)
+        found = bytes(view[start:chunk_end]).find(b"\n")
+        if found != -1:
+            first_newline = start + found
+            break
+    terminator = b"\r\n" if first_newline > 0 and view[first_newline - 1] == ord("\r") else b"\n"
+    n_cols = (end if first_newline == -1 else first_newline) - (len(terminator) - 1)
+    stride = n_cols + len(terminator)
+    if n_cols == 0 or (end + len(terminator)) % stride:
+        raise ValueError("all rows are not of the same size")
+    return _TextLayout(end, terminator, (end + len(terminator)) // stride, n_cols, stride)
+
+
+def _translate_blocks(
+    view: memoryview, layout: _TextLayout, block_rows: int, endpoints: dict[str, Position]
+) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield the first row and cell codes of each block of `block_rows` rows of the text of a maze, validating them
+    along the way. The entry and exit points are stored in `endpoints` under "entry" and "exit" as they are found.
+    """
+    end, terminator, n_rows, n_cols, stride = layout
+    for first_row in range(0, n_rows, block_rows):
+        block_start, block_end = first_row * stride, min((first_row + block_rows) * stride, end)
+        block = bytes(view[block_start:block_end])
+        if block_end == end:
+            block += terminator
+        rows_in_block = len(block) // stride
+
+        for column, code in enumerate(terminator, n_cols):
+            if block.count(code) != rows_in_block or block[column::stride] != bytes([code]) * rows_in_block:
+                raise ValueError("all rows are not of the same size")
+
+        block_cells = block.translate(_CELL_CODES, terminator)
+        invalid = block_cells.find(_INVALID)
+        if invalid != -1:
+            row, col = divmod(invalid, n_cols)
+            char = chr(block[row * stride + col])
+            raise ValueError(f"unrecognized character {char} at row: {first_row + row}, col: {col}")
+
+        for marker, name in ((b"X", "entry"), (b"Y", "exit")):
+            position = _find_endpoint(block, marker, name, first_row, stride)
+            if position is None:
+                continue
+            previous = endpoints.get(name)
+            if previous is not None:
+                raise ValueError(
+                    f"{name} point already set at row: {previous.row}, col: {previous.col}, "
+                    f"attempted to set again at row: {position.row}, col: {position.col}"
+                )
+            if not (position.row in (0, n_rows - 1) or position.col in (0, n_cols - 1)):
+                raise ValueError(f"{name} point at row: {position.row}, col: {position.col} is not on boundary of maze")
+            endpoints[name] = position
+        yield first_row, block_cells
+
+    if "entry" not in endpoints:
+        raise ValueError("entry position not set")
+
+    if "exit" not in endpoints:
+        raise ValueError("exit position not set")
+
+
+def parse_maze_buffer(data: Buffer, block_rows: int = 4096) -> Maze:
+    """
+    Parse a maze from the bytes of a text file, using the same characters and rules as `parse_maze`.
+    Rows end with either "\\n" or "\\r\\n"; trailing line breaks are ignored.
+
+    The data is translated into a compact grid in blocks of `block_rows` rows using `bytes.translate`, and all
+    validation is done with bulk byte operations, so no Python code runs per cell.
+    :raises:
+        IndexError: If the maze is empty
+        ValueError: If all rows are not of the same length
+        ValueError: If the entry point or exit point are not on the boundary
+        ValueError: If an attempt is made to set the entry point or exit point more than once
+        ValueError: If the entry point or exit point are not set
+        ValueError: If an unrecognized character is present
+    """
+    # The views are released even when validation fails, so that a memory-mapped file can still be closed.
+    with memoryview(data) as raw, raw.cast("B") as view:
+        layout = _text_layout(view, block_rows)
+        cells = bytearray()
+        endpoints: dict[str, Position] = {}
+        for _, block_cells in _translate_blocks(view, layout, block_rows, endpoints):
+            cells += block_cells
+    grid = CompactGrid((layout.n_rows, layout.n_cols), cells, CELL_STATES)
+    return Maze(grid, endpoints["entry"], endpoints["exit"])
+
+
+class FileLoader(MazeLoader):
+    """
+    Loads a maze from a text file in the format read by `StandardInputLoader`.
+    The file is memory-mapped and parsed in blocks, so only the compact grid and one block are held in memory.
+    """
+
+    def __init__(self, path: Union[str, PathLike[str]], block_rows: int = 4096):
+        self.path = path
+        self.block_rows = block_rows
+
+    def load(self) -> Maze:
+        with open(self.path, "rb") as file:
+            if not file.seek(0, 2):
+                raise IndexError("empty maze")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return parse_maze_buffer(data, self.block_rows)
@@ -1,8 +1,8 @@
 from textwrap import dedent
 from typing import Optional
 
-from ..data_structures import Grid, Position
-from ..maze import CellState, Maze
+from ..data_structures import CompactGrid, Position
+from ..maze import CELL_STATES, CellState, Maze
 from .maze_loader_abc import MazeLoader
 
 
@@ -31,7 +31,7 @@ def parse_maze(maze_str: list[str]) -> Maze:
     if not all(len(line) == n_cols for line in maze_str):
         raise ValueError("all rows are not of the same size")
 
-    maze_grid: Grid[CellState] = Grid.from_dimensions((n_rows, n_cols), default=CellState.EMPTY)
+    maze_grid = CompactGrid.filled((n_rows, n_cols), CellState.EMPTY, CELL_STATES)
     entry_position: Optional[Position] = None
     exit_position: Optional[Position] = None
 
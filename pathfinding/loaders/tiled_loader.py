@@ -0,0 +1,38 @@
+import mmap
+from os import PathLike
+from typing import Union
+
+from ..data_structures import Position, TiledGrid
+from ..maze import CELL_STATES, CellState
+from .file_loader import _text_layout, _translate_blocks
+
+
+def write_tiled_maze(
+    text_path: Union[str, PathLike[str]], path: Union[str, PathLike[str]], tile_size: int = 256
+) -> tuple[Position, Position]:
+    """
+    Convert a maze text file, in the format read by `FileLoader`, into a tiled grid file for `TiledGrid`, and return
+    its entry and exit points, which are not stored in the grid file.
+
+    The text is converted one band of `tile_size` rows at a time, so only one band of tiles is held in memory and
+    mazes larger than memory can be converted.
+    :raises:
+        IndexError: If the maze is empty
+        ValueError: If the maze is invalid, see `parse_maze_buffer`
+    """
+    with open(text_path, "rb") as file:
+        if not file.seek(0, 2):
+            raise IndexError("empty maze")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            layout = _text_layout(view, tile_size)
+            endpoints: dict[str, Position] = {}
+            dims = layout.n_rows, layout.n_cols
+            n_tile_cols = -(-layout.n_cols // tile_size)
+            with TiledGrid[CellState].create(
+                path, dims, tile_size, CELL_STATES.index(CellState.EMPTY), CELL_STATES, max_tiles=n_tile_cols
+            ) as grid:
+                for first_row, cells in _translate_blocks(view, layout, tile_size, endpoints):
+                    for row, start in enumerate(range(0, len(cells), layout.n_cols), first_row):
+                        end = start + layout.n_cols
+                        grid.set_row(row, cells[start:end])
+    return endpoints["entry"], endpoints["exit"]
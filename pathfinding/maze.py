@@ -1,8 +1,12 @@
+import hashlib
 from collections import deque
 from enum import Enum, auto
+from typing import Optional
 
+from .data_structures.corridor_graph import CorridorGraph
 from .data_structures.graph import Edge, Graph, Vertex
-from .data_structures.grid import Grid, Position, SolveStep
+from .data_structures.grid import CompactGrid, Grid, Position, SolveStep
+from .data_structures.neighbour_table import MASK_DIRECTIONS, NeighbourTable
 
 
 class CellState(Enum):
@@ -10,89 +14,213 @@ class CellState(Enum):
     WALL = auto()
 
 
+CELL_STATES = tuple(CellState)
+"""The values of a compact maze grid; each cell stores the index of its state in this tuple."""
+
+
 MazeVertex = Vertex[Position, list[SolveStep]]
 MazeEdge = Edge[Position, list[SolveStep]]
 MazeGraph = Graph[Position, list[SolveStep]]
 
 
+def corridor_steps(edge: MazeEdge, start: MazeVertex) -> list[SolveStep]:
+    """Return the steps which walk along the corridor represented by the edge, starting from the given end."""
+    if start is edge.tail:
+        return list(edge.data)
+    return [~step for step in reversed(edge.data)]
+
+
+def trace_corridors(parent_edges: dict[MazeVertex, MazeEdge], target: MazeVertex) -> deque[SolveStep]:
+    """
+    Return the steps from the root of a shortest path tree to the given vertex.
+    :param parent_edges: Maps every vertex of the tree except the root to the edge leading to it from its parent.
+    :param target: The vertex to trace back from.
+    """
+    steps: deque[SolveStep] = deque([])
+    vertex = target
+    while vertex in parent_edges:
+        edge = parent_edges[vertex]
+        parent = edge.get_other_end(vertex)
+        steps.extendleft(reversed(corridor_steps(edge, parent)))
+        vertex = parent
+    return steps
+
+
+class _GridCache:
+    """
+    The neighbour table and corridor graph of a maze grid, shared by every `Maze` over that grid.
+
+    They are valid for the contents of the grid with the content hash `_key`. Changes made through `Maze.set_cells`
+    update them in place, while any other write to the grid is detected through its version and makes them be rebuilt,
+    unless the contents hash the same as before.
+    """
+
+    def __init__(self, grid: CompactGrid[CellState]):
+        self.grid = grid
+        self._version = grid.version
+        self._key: Optional[str] = None
+        self._neighbours: Optional[NeighbourTable[CellState]] = None
+        self._corridors: Optional[CorridorGraph] = None
+
+    def content_hash(self) -> str:
+        self._validate()
+        if self._key is None:
+            cells = self.grid.cells
+            data = cells if isinstance(cells, (bytes, bytearray, memoryview)) else bytes(cells)
+            self._key = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return self._key
+
+    def neighbours(self) -> NeighbourTable[CellState]:
+        self._validate()
+        if self._neighbours is None:
+            self._neighbours = NeighbourTable(self.grid, lambda state: state == CellState.EMPTY)
+        return self._neighbours
+
+    def corridors(self) -> CorridorGraph:
+        self._validate()
+        if self._corridors is None:
+            self._corridors = CorridorGraph(self.neighbours())
+        return self._corridors
+
+    def set_corridors(self, corridors: CorridorGraph) -> None:
+        self._validate()
+        self._neighbours = corridors.neighbours
+        self._corridors = corridors
+
+    def set_cells(self, changes: dict[int, CellState]) -> None:
+        self._validate()
+        affected: set[int] = set()
+        detached_ends: set[int] = set()
+        if self._corridors is not None:
+            affected = {cell for index in changes for cell in self.neighbours().neighbourhood(index)}
+            detached_ends = self._corridors.detach(affected)
+
+        for index, state in changes.items():
+            self.grid[self.grid.position_of(index)] = state
+        self._version = self.grid.version
+        self._key = None
+
+        if self._neighbours is not None:
+            self._neighbours.update(changes)
+        if self._corridors is not None:
+            self._corridors.reconnect(affected, detached_ends)
+
+    def _validate(self) -> None:
+        if self._version == self.grid.version:
+            return
+        previous_key, self._key = self._key, None
+        self._version = self.grid.version
+        if previous_key is None or previous_key != self.content_hash():
+            self._neighbours = self._corridors = None
+
+
 class Maze:
     def __init__(self, grid: Grid[CellState], entry_point: Position, exit_point: Position):
-        self.grid = grid
+        if not isinstance(grid, CompactGrid):
+            grid = CompactGrid.from_grid(grid, CELL_STATES)
+        self.grid: CompactGrid[CellState] = grid
         self.entry_point = entry_point
         self.exit_point = exit_point
+        self._cache = _GridCache(grid)
+        self._graph: Optional[tuple[str, MazeGraph]] = None
 
         if not self.grid[entry_point] == self.grid[exit_point] == CellState.EMPTY:
             raise ValueError("entry point and exit point are not empty")
 
+    def __reduce__(self) -> tuple[type["Maze"], tuple[CompactGrid[CellState], Position, Position]]:
+        # Only the grid and endpoints are pickled; the cached neighbour table and graphs are rebuilt when needed.
+        return Maze, (self.grid, self.entry_point, self.exit_point)
+
+    def with_endpoints(self, entry_point: Position, exit_point: Position) -> "Maze":
+        """
+        Return a maze over the same grid with different entry and exit points.
+        The mazes share the grid, along with its neighbour table and corridor graph, so neither is rebuilt.
+        """
+        maze = Maze(self.grid, entry_point, exit_point)
+        maze._cache = self._cache
+        return maze
+
+    def content_hash(self) -> str:
+        """Return a hash of the cells of the maze, which does not depend on its entry and exit points."""
+        return self._cache.content_hash()
+
+    @property
+    def neighbours(self) -> NeighbourTable[CellState]:
+        """The open neighbours of every cell of the maze, indexed by flat cell index."""
+        return self._cache.neighbours()
+
+    @property
+    def corridors(self) -> CorridorGraph:
+        """The junctions and dead ends of the maze, joined by the corridors between them."""
+        return self._cache.corridors()
+
+    def use_corridors(self, corridors: CorridorGraph) -> None:
+        """
+        Use a precomputed corridor graph, e.g. loaded from disk, instead of building one.
+        It must have been built from the current contents of the maze, over the table in `neighbours`.
+        """
+        if corridors.neighbours is not self.neighbours:
+            raise ValueError("corridor graph was not built over the neighbour table of this maze")
+        self._cache.set_corridors(corridors)
+
+    def set_cell(self, position: tuple[int, int], state: CellState) -> None:
+        """Set the state of a single cell, see `set_cells`."""
+        self.set_cells({position: state})
+
+    def set_cells(self, changes: dict[tuple[int, int], CellState]) -> None:
+        """
+        Set the states of the given cells.
+
+        The neighbour table and corridor graph of the maze are updated in place, rebuilding only the corridors passing
+        through or next to the changed cells.
+        :raises:
+            ValueError: If the entry point or exit point would stop being empty
+        """
+        if CellState.WALL in (changes.get(self.entry_point), changes.get(self.exit_point)):
+            raise ValueError("entry point and exit point must stay empty")
+        self._cache.set_cells({self.grid.index(*position): state for position, state in changes.items()})
+
     def to_graph(self) -> MazeGraph:
-        """Convert the maze to a graph."""
+        """
+        Convert the maze to a graph whose vertices are the junctions, dead ends, entry point and exit point of the maze,
+        and whose edges are the corridors between them, holding the steps along the corridor from tail to head.
+        Takes O(cells) time and memory; the graph is cached until the contents of the maze change.
+        """
+        key = self.content_hash()
+        if self._graph is None or self._graph[0] != key:
+            self._graph = key, self._build_graph()
+        return self._graph[1]
+
+    def _build_graph(self) -> MazeGraph:
+        corridors = self.corridors
+        masks = self.neighbours.masks
         graph = MazeGraph()
-        visited_positions = set[Position]()
-        visited_position_pairs = set[tuple[Position, Position]]()
-
-        vertex_grid: Grid[MazeVertex] = Grid.from_dimensions_with_factory(
-            self.grid.dimensions, lambda pos: MazeVertex(Position(*pos))
-        )
-
-        for root_position, root_vertex in vertex_grid:
-            if root_position in visited_positions or self.grid[root_position] != CellState.EMPTY:
-                continue
-
-            exploration_queue: deque[tuple[MazeVertex, MazeEdge]] = deque()
-
-            visited_positions.add(root_position)
-            for other_neighbour_direction, other_neighbour_vertex in vertex_grid.get_neighbours_where_predicate(
-                root_position, lambda tup: self.grid[tup[0]] == CellState.EMPTY
-            ):
-                new_edge = MazeEdge([other_neighbour_direction], tail=root_vertex, head=other_neighbour_vertex)
-                root_vertex.edges.add(new_edge)
-                other_neighbour_vertex.edges.add(new_edge)
-                graph.add_edge(new_edge)
-                visited_position_pairs.add((root_position, other_neighbour_vertex.data))
-                exploration_queue.append((other_neighbour_vertex, new_edge))
-
-            while exploration_queue:
-                vertex, edge = exploration_queue.popleft()
-                parent_neighbour_position = vertex.data.apply_step(~edge.data[-1])
-
-                if (vertex.data, parent_neighbour_position) in visited_position_pairs:
-                    graph.remove_edge(edge)
-                    edge.tail.edges.remove(edge)
-                    edge.head.edges.remove(edge)
-                    if not edge.tail.edges:
-                        graph.remove_vertex(edge.tail)
-                    if not edge.head.edges:
-                        graph.remove_vertex(edge.head)
-                    continue
-                visited_position_pairs.add((parent_neighbour_position, vertex.data))
 
-                if vertex.data in visited_positions:
-                    continue
-                visited_positions.add(vertex.data)
+        vertices = {cell: MazeVertex(self.grid.position_of(cell)) for cell in corridors.vertices}
+        endpoints = {self.grid.index(*self.entry_point), self.grid.index(*self.exit_point)} - vertices.keys()
+        split_edges = {corridors.locate(cell) for cell in endpoints}
+        for cell in endpoints:
+            vertices[cell] = MazeVertex(self.grid.position_of(cell))
 
-                other_neighbours: list[tuple[SolveStep, MazeVertex]] = vertex_grid.get_neighbours_where_predicate(
-                    vertex.data,
-                    lambda tup: self.grid[tup[0]] == CellState.EMPTY and tup[1].data != parent_neighbour_position,
-                )
+        def add_edge(steps: list[SolveStep], tail: int, head: int) -> None:
+            graph.add_edge(MazeEdge(steps, tail=vertices[tail], head=vertices[head]))
 
-                if len(other_neighbours) == 0:
-                    continue
+        for edge in corridors.edges():
+            if edge not in split_edges:
+                add_edge(corridors.edge_steps(edge), corridors.edge_tails[edge], corridors.edge_heads[edge])
 
-                if len(other_neighbours) == 1:
-                    other_neighbour_direction, other_neighbour_vertex = other_neighbours[0]
-                    graph.remove_vertex(vertex)
-                    vertex.edges.remove(edge)
-                    other_neighbour_vertex.edges.add(edge)
-                    edge.head = other_neighbour_vertex
-                    edge.data.append(other_neighbour_direction)
-                    exploration_queue.append((other_neighbour_vertex, edge))
+        # Corridors passing through the entry or exit point are split there, walking out from those points.
+        walked: set[tuple[int, int]] = set()
+        for cell in endpoints:
+            for direction in MASK_DIRECTIONS[masks[cell]]:
+                if (cell, direction) in walked:
                     continue
+                steps: list[SolveStep] = []
+                end, end_direction, _ = corridors.walk(cell, direction, steps, stop=endpoints)
+                walked.update({(cell, direction), (end, end_direction)})
+                add_edge(steps, cell, end)
 
-                for other_neighbour_direction, other_neighbour_vertex in other_neighbours:
-                    new_edge = MazeEdge([other_neighbour_direction], tail=vertex, head=other_neighbour_vertex)
-                    other_neighbour_vertex.edges.add(new_edge)
-                    vertex.edges.add(new_edge)
-                    graph.add_edge(new_edge)
-                    exploration_queue.append((other_neighbour_vertex, new_edge))
+        for vertex in vertices.values():
+            graph.add_vertex(vertex)
 
         return graph
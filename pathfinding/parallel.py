@@ -0,0 +1,158 @@
+"""
+Solve large batches of mazes, or of queries on one large maze, across a pool of worker processes.
+
+Results are yielded in completion order, so callers can start consuming them while later chunks are still running.
+Only a bounded number of chunks is submitted to the pool at a time, and more are read from the input as they complete,
+so the memory used does not grow with the size of the job.
+"""
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, as_completed, wait
+from functools import partial
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional, TypeVar
+
+from .data_structures import CompactGrid, Position, SolveStep
+from .maze import CELL_STATES, CellState, Maze
+from .solvers import BatchSolver, DijkstraSolver, MazeSolver, QueryResult
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_worker_maze: Optional[Maze] = None
+_worker_memory: Optional[SharedMemory] = None
+
+
+def _shared_cells(memory: SharedMemory, n_cells: int) -> Any:
+    """Return a writable view of the first `n_cells` bytes of a shared memory block, as the cells of a grid."""
+    if memory.buf is None:
+        raise RuntimeError(f"shared memory {memory.name} is closed")
+    return memory.buf[:n_cells]
+
+
+def _chunked(items: Iterable[T], chunksize: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def _max_pending(max_workers: Optional[int], max_pending: Optional[int]) -> int:
+    if max_pending is not None:
+        return max(max_pending, 1)
+    return 2 * (max_workers if max_workers is not None else os.cpu_count() or 1)
+
+
+def _map_bounded(
+    executor: Executor, task: Callable[[list[T]], list[R]], chunks: Iterable[list[T]], max_pending: int
+) -> Iterator[R]:
+    """
+    Run a task on each chunk, with at most `max_pending` chunks submitted at once, and yield the results of each chunk
+    as it completes. The next chunk is only taken from `chunks` once there is room for it.
+    """
+    pending: set[Future[list[R]]] = set()
+    for chunk in chunks:
+        pending.add(executor.submit(task, chunk))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    for future in as_completed(pending):
+        yield from future.result()
+
+
+def _solve_maze_chunk(
+    solver_factory: Callable[[Maze], MazeSolver], mazes: list[tuple[int, Maze]]
+) -> list[tuple[int, Optional[list[SolveStep]]]]:
+    results: list[tuple[int, Optional[list[SolveStep]]]] = []
+    for index, maze in mazes:
+        solver = solver_factory(maze)
+        for _ in solver.solve():
+            pass
+        try:
+            results.append((index, list(solver.get_shortest_path())))
+        except ValueError:
+            results.append((index, None))
+    return results
+
+
+def solve_mazes(
+    mazes: Iterable[Maze],
+    solver_factory: Callable[[Maze], MazeSolver] = DijkstraSolver,
+    max_workers: Optional[int] = None,
+    chunksize: int = 16,
+    max_pending: Optional[int] = None,
+) -> Iterator[tuple[int, Optional[list[SolveStep]]]]:
+    """
+    Solve many mazes in parallel.
+
+    Mazes are pickled in their compact form, without any cached neighbour tables or graphs, and each is sent to a
+    worker exactly once, as part of a chunk of `chunksize` mazes.
+    :param solver_factory: Creates the solver for each maze. Must be picklable, e.g. a solver class.
+    :param max_workers: The number of worker processes, defaulting to the number of CPUs.
+    :param max_pending: The number of chunks submitted to the workers at once, defaulting to twice the number of
+        workers. Mazes are only read from `mazes` as chunks complete.
+    :return: An iterator of (position of the maze in `mazes`, shortest path or None if there is none), in the order in
+        which they complete.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from _map_bounded(
+            executor,
+            partial(_solve_maze_chunk, solver_factory),
+            _chunked(enumerate(mazes), chunksize),
+            _max_pending(max_workers, max_pending),
+        )
+
+
+def _attach_shared_maze(
+    memory_name: str, dimensions: tuple[int, int], entry_point: Position, exit_point: Position
+) -> None:
+    global _worker_maze, _worker_memory
+    _worker_memory = SharedMemory(name=memory_name)
+    n_rows, n_cols = dimensions
+    grid = CompactGrid[CellState](dimensions, _shared_cells(_worker_memory, n_rows * n_cols), CELL_STATES)
+    _worker_maze = Maze(grid, entry_point, exit_point)
+
+
+def _solve_query_chunk(queries: list[tuple[Position, Position]], with_paths: bool) -> list[QueryResult]:
+    if _worker_maze is None:
+        raise RuntimeError("worker was not initialised with a maze")
+    return list(BatchSolver(_worker_maze).solve(queries, with_paths))
+
+
+def solve_queries(
+    maze: Maze,
+    queries: Iterable[tuple[Position, Position]],
+    max_workers: Optional[int] = None,
+    chunksize: int = 256,
+    with_paths: bool = True,
+    max_pending: Optional[int] = None,
+) -> Iterator[QueryResult]:
+    """
+    Answer many (source, target) queries on one maze in parallel, see `BatchSolver`.
+
+    The cells of the maze are copied once into shared memory, which every worker maps when it starts, so the maze is
+    never pickled per task. Queries are read `max_pending` chunks at a time, and each batch is sorted by source before
+    being split into chunks of `chunksize`, so queries sharing a source mostly land in the same chunk and share a
+    search tree.
+    :param max_workers: The number of worker processes, defaulting to the number of CPUs.
+    :param max_pending: The number of chunks submitted to the workers at once, defaulting to twice the number of
+        workers.
+    :return: An iterator of query results, in the order in which their chunks complete.
+    """
+    n_rows, n_cols = maze.grid.dimensions
+    max_pending = _max_pending(max_workers, max_pending)
+    batches = _chunked(queries, chunksize * max_pending)
+    memory = SharedMemory(create=True, size=max(n_rows * n_cols, 1))
+    try:
+        _shared_cells(memory, n_rows * n_cols)[:] = bytes(maze.grid.cells)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_shared_maze,
+            initargs=(memory.name, maze.grid.dimensions, maze.entry_point, maze.exit_point),
+        ) as executor:
+            chunks = (chunk for batch in batches for chunk in _chunked(sorted(batch), chunksize))
+            yield from _map_bounded(executor, partial(_solve_query_chunk, with_paths=with_paths), chunks, max_pending)
+    finally:
+        memory.close()
+        memory.unlink()
@@ -1,4 +1,14 @@
 from .maze_renderer_abc import MazeRenderer
 from .stdout_renderer import StandardOutputRenderer
+from .terminal_renderer import TerminalRenderer
+from .trace import TraceReader, TraceWriter, format_path, record_frames
 
-__all__ = ["MazeRenderer", "StandardOutputRenderer"]
+__all__ = [
+    "MazeRenderer",
+    "StandardOutputRenderer",
+    "TerminalRenderer",
+    "TraceWriter",
+    "TraceReader",
+    "record_frames",
+    "format_path",
+]
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Optional
 
+from ..data_structures import SolveStep
 from ..maze import Maze
 from ..solvers import MazeSolver
 
@@ -12,3 +15,10 @@ class MazeRenderer(ABC):
     @abstractmethod
     def render(self) -> None:
         """Render the application of the steps on the maze"""
+
+    def shortest_path(self) -> Optional[Sequence[SolveStep]]:
+        """Return the shortest path found by the solver, or None if the exit point is not reachable."""
+        try:
+            return self.solver.get_shortest_path()
+        except ValueError:
+            return None
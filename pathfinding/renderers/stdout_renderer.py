@@ -1,10 +1,30 @@
+from typing import BinaryIO, Optional
+
+from ..maze import Maze
+from ..solvers import MazeSolver
 from .maze_renderer_abc import MazeRenderer
+from .trace import TraceWriter, format_path, record_frames
 
 
 class StandardOutputRenderer(MazeRenderer):
-    """Renders the maze and the steps to solve it to stdout."""
+    """
+    Renders the maze and the steps to solve it to stdout, run-length encoded, see `format_path`.
+    :param trace: A binary stream to write the order in which the solver explores the maze to, see `TraceWriter`.
+    :param frame_size: The number of explored cells in each frame of the trace.
+    """
+
+    def __init__(self, maze: Maze, solver: MazeSolver, trace: Optional[BinaryIO] = None, frame_size: int = 1024):
+        super().__init__(maze, solver)
+        self.trace = trace
+        self.frame_size = frame_size
 
     def render(self) -> None:
-        for _ in self.solver.solve():
-            ...
-        print(self.solver.get_shortest_path())
+        if self.trace is None:
+            for _ in self.solver.solve():
+                ...
+        else:
+            writer = TraceWriter(self.trace, self.maze.grid.dimensions)
+            for frame in record_frames(self.solver.solve(), self.maze.grid.dimensions, self.frame_size):
+                writer.write_frame(frame)
+        path = self.shortest_path()
+        print("no path" if path is None else format_path(path))
@@ -0,0 +1,115 @@
+import sys
+import time
+from collections.abc import Iterable, Sequence
+from typing import BinaryIO, Optional, TextIO
+
+from ..maze import CellState, Maze
+from ..solvers import MazeSolver
+from .maze_renderer_abc import MazeRenderer
+from .trace import TraceWriter, format_path, record_frames
+
+_CELL_CHARS = {CellState.EMPTY: ord("."), CellState.WALL: ord("#")}
+_FIXED_CHARS = frozenset(b"#XY")
+_EXPLORED = "o"
+_PATH = "*"
+
+
+class TerminalRenderer(MazeRenderer):
+    """
+    Animates the search for the shortest path in a terminal: the maze is drawn once, then each frame of cells explored
+    by the solver is drawn over it, and finally the shortest path.
+
+    A frame only redraws the cells that changed in it, with one cursor movement for each run of changed cells on the
+    same row, so the output grows with the number of explored cells rather than with the number of frames times the
+    size of the maze.
+    :param stream: The terminal to draw on, which must understand ANSI escape sequences.
+    :param frame_size: The number of explored cells drawn in each frame.
+    :param delay: The number of seconds to wait after each frame.
+    :param trace: A binary stream to also write the frames to, see `TraceWriter`.
+    """
+
+    def __init__(
+        self,
+        maze: Maze,
+        solver: MazeSolver,
+        stream: Optional[TextIO] = None,
+        frame_size: int = 64,
+        delay: float = 0.0,
+        trace: Optional[BinaryIO] = None,
+    ):
+        super().__init__(maze, solver)
+        self.stream = sys.stdout if stream is None else stream
+        self.frame_size = frame_size
+        self.delay = delay
+        self.trace = trace
+        self._shown = bytearray()
+        """The character shown for each cell, empty until the maze is drawn."""
+
+    def render(self) -> None:
+        dimensions = self.maze.grid.dimensions
+        frames: Iterable[Sequence[int]] = record_frames(self.solver.solve(), dimensions, self.frame_size)
+        if self.trace is not None:
+            frames = TraceWriter(self.trace, dimensions).write_frames(frames)
+
+        self.draw_maze()
+        self.draw_frames(frames)
+        steps = self.shortest_path()
+        if steps is not None:
+            grid = self.maze.grid
+            path: list[int] = []
+            position = self.maze.entry_point
+            for step in steps:
+                position = position.apply_step(step)
+                path.append(grid.index(*position))
+            self.draw_cells(path, _PATH)
+        self.stream.write(f"\x1b[{dimensions[0] + 1};1H{'no path' if steps is None else format_path(steps)}\n")
+        self.stream.flush()
+
+    def draw_maze(self) -> None:
+        """Clear the terminal and draw the maze, with its entry and exit points."""
+        grid = self.maze.grid
+        n_rows, n_cols = grid.dimensions
+        self._shown = bytearray(_CELL_CHARS[state] for _, state in grid)
+        for char, position in ((b"X", self.maze.entry_point), (b"Y", self.maze.exit_point)):
+            self._shown[grid.index(*position)] = char[0]
+        self.stream.write("\x1b[2J\x1b[H")
+        for row in range(n_rows):
+            start, end = row * n_cols, (row + 1) * n_cols
+            self.stream.write(self._shown[start:end].decode() + "\n")
+        self.stream.flush()
+
+    def draw_frames(self, frames: Iterable[Sequence[int]]) -> None:
+        """
+        Draw frames of explored cells, e.g. recorded by `record_frames` or read by `TraceReader`. The maze is drawn
+        first if it has not been drawn yet.
+        """
+        if not self._shown:
+            self.draw_maze()
+        for frame in frames:
+            self.draw_cells(frame, _EXPLORED)
+            if self.delay:
+                time.sleep(self.delay)
+
+    def draw_cells(self, cells: Iterable[int], char: str) -> None:
+        """
+        Draw a character over open cells, other than the entry and exit points, which do not show it yet. The maze is
+        drawn first if it has not been drawn yet.
+        """
+        if not self._shown:
+            self.draw_maze()
+        shown, n_cols, code = self._shown, self.maze.grid.dimensions[1], ord(char)
+        changed = sorted({cell for cell in cells if shown[cell] != code and shown[cell] not in _FIXED_CHARS})
+        if not changed:
+            return
+
+        parts = []
+        run_start = previous = changed[0]
+        for cell in changed[1:] + [-1]:
+            shown[previous] = code
+            if cell != previous + 1 or cell % n_cols == 0:
+                row, col = divmod(run_start, n_cols)
+                parts.append(f"\x1b[{row + 1};{col + 1}H{char * (previous - run_start + 1)}")
+                run_start = cell
+            previous = cell
+        self.stream.write("".join(parts))
+        self.stream.flush()
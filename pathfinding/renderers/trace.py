@@ -0,0 +1,115 @@
+"""
+Recording the order in which a solver explores a maze, as frames of flat cell indices, and a compact binary format for
+streaming them to a file.
+
+All integers are little-endian. The file starts with a header (see `HEADER`) holding the magic bytes, format version,
+the size of each index in bytes and the dimensions of the maze. It is followed by the frames, each one the number of
+cells in the frame as an unsigned 32-bit integer and then the flat indices of the cells, `row * n_cols + col`, in the
+order they were explored.
+"""
+import struct
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import groupby
+from typing import BinaryIO
+
+from .._byteorder import little_endian
+from ..data_structures import Position, SolveStep
+
+MAGIC = b"PFTR"
+VERSION = 1
+HEADER = struct.Struct("<4sHBQQ")
+_FRAME_HEADER = struct.Struct("<I")
+_INDEX_TYPECODES = {4: "I", 8: "Q"}
+_STEP_LETTERS = {SolveStep.UP: "U", SolveStep.DOWN: "D", SolveStep.LEFT: "L", SolveStep.RIGHT: "R"}
+
+
+def _index_size(dimensions: tuple[int, int]) -> int:
+    n_rows, n_cols = dimensions
+    return 4 if n_rows * n_cols <= 1 << 32 else 8
+
+
+def record_frames(
+    positions: Iterable[Position], dimensions: tuple[int, int], frame_size: int = 1024
+) -> Iterator["array[int]"]:
+    """
+    Group the positions explored by a solver into frames of `frame_size` flat cell indices, e.g.
+    `record_frames(solver.solve(), maze.grid.dimensions)`. Only the frame being filled is held in memory.
+    """
+    n_cols = dimensions[1]
+    typecode = _INDEX_TYPECODES[_index_size(dimensions)]
+    frame = array(typecode)
+    for row, col in positions:
+        frame.append(row * n_cols + col)
+        if len(frame) == frame_size:
+            yield frame
+            frame = array(typecode)
+    if frame:
+        yield frame
+
+
+class TraceWriter:
+    """
+    Writes frames of explored cells to a binary stream, as they are recorded, so a trace of any length takes no more
+    memory than its largest frame.
+    """
+
+    def __init__(self, stream: BinaryIO, dimensions: tuple[int, int]):
+        self.stream = stream
+        self.dimensions = dimensions
+        self.index_size = _index_size(dimensions)
+        self.frames = self.cells = 0
+        stream.write(HEADER.pack(MAGIC, VERSION, self.index_size, *dimensions))
+
+    def write_frame(self, frame: Sequence[int]) -> None:
+        values = array(_INDEX_TYPECODES[self.index_size], frame)
+        self.stream.write(_FRAME_HEADER.pack(len(values)))
+        self.stream.write(little_endian(values).tobytes())
+        self.stream.flush()
+        self.frames += 1
+        self.cells += len(values)
+
+    def write_frames(self, frames: Iterable[Sequence[int]]) -> Iterator[Sequence[int]]:
+        """Write each frame as it is produced, passing it on, so a trace can be written while it is rendered."""
+        for frame in frames:
+            self.write_frame(frame)
+            yield frame
+
+
+class TraceReader:
+    """
+    Reads a trace written by `TraceWriter`, one frame at a time.
+    :raises:
+        ValueError: If the stream is not a trace of a supported version, or is truncated
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("not a trace file")
+        magic, version, self.index_size, n_rows, n_cols = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("not a trace file")
+        if version != VERSION:
+            raise ValueError(f"unsupported trace file version {version}")
+        if self.index_size not in _INDEX_TYPECODES:
+            raise ValueError(f"corrupt trace file: unsupported index size {self.index_size}")
+        self.dimensions = n_rows, n_cols
+
+    def __iter__(self) -> Iterator["array[int]"]:
+        while frame_header := self.stream.read(_FRAME_HEADER.size):
+            if len(frame_header) < _FRAME_HEADER.size:
+                raise ValueError("corrupt trace file: truncated frame")
+            (length,) = _FRAME_HEADER.unpack(frame_header)
+            data = self.stream.read(length * self.index_size)
+            if len(data) < length * self.index_size:
+                raise ValueError("corrupt trace file: truncated frame")
+            frame = array(_INDEX_TYPECODES[self.index_size])
+            frame.frombytes(data)
+            yield little_endian(frame)
+
+
+def format_path(steps: Iterable[SolveStep]) -> str:
+    """Return a path run-length encoded, as the letter of each direction followed by its number of steps: "R3 D2 L1"."""
+    return " ".join(f"{_STEP_LETTERS[step]}{sum(1 for _ in run)}" for step, run in groupby(steps))
@@ -0,0 +1,310 @@
+"""
+A local service which keeps mazes and their graphs in memory and answers shortest path queries on them.
+
+Clients connect over localhost TCP or a Unix socket and send one JSON object per line; the service answers each with
+one JSON object per line, echoing the request's "id" if it has one. Requests on one connection are handled
+concurrently, so responses may arrive in a different order than the requests.
+
+    {"op": "load", "path": PATH} or {"op": "load", "text": TEXT}
+        -> {"maze": HASH, "dimensions": [ROWS, COLS], "entry_point": [ROW, COL], "exit_point": [ROW, COL]}
+    {"op": "solve", "maze": HASH, "source": [ROW, COL], "target": [ROW, COL], "algorithm": "dijkstra"}
+        -> {"distance": LENGTH, "path": ["DOWN", ...]}, with both null if the target cannot be reached
+    {"op": "unload", "maze": HASH}
+        -> {"unloaded": true}
+    {"op": "stats"}
+        -> {"mazes": COUNT, "cached": COUNT, "pending": COUNT, "hits": COUNT, "misses": COUNT, "coalesced": COUNT}
+
+Failed requests are answered with {"error": MESSAGE}. Mazes are identified by the content hash of their cells, so the
+source and target of a query replace the maze's own entry and exit points, and loading the same maze twice keeps the
+first copy. Files are read as binary mazes (see `write_binary_maze`) if they start with the binary magic bytes, and as
+text otherwise.
+
+Usage: python -m pathfinding.service [--host HOST] [--port PORT | --unix PATH] [--workers WORKERS]
+    [--cache-size CACHE_SIZE]
+"""
+import argparse
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Optional
+
+from .data_structures import Position, SolveStep
+from .loaders import BinaryLoader, FileLoader, parse_maze_buffer
+from .loaders.binary_loader import MAGIC
+from .maze import Maze
+from .solvers import AStarSolver, BFSSolver, DijkstraSolver, JPSSolver, MazeSolver
+
+ALGORITHMS: dict[str, Callable[[Maze], MazeSolver]] = {
+    "bfs": BFSSolver,
+    "dijkstra": DijkstraSolver,
+    "astar": AStarSolver,
+    "jps": JPSSolver,
+}
+
+logger = logging.getLogger(__name__)
+
+QueryKey = tuple[str, Position, Position, str]
+"""The content hash of a maze, the source and target of a query on it, and the name of the algorithm answering it."""
+
+
+def _read_maze(path: str) -> Maze:
+    with open(path, "rb") as file:
+        is_binary = file.read(len(MAGIC)) == MAGIC
+    return BinaryLoader(path).load() if is_binary else FileLoader(path).load()
+
+
+def _load_maze(path: Optional[str], text: Optional[str]) -> Maze:
+    if text is None and path is None:
+        raise ValueError("either path or text must be given")
+    try:
+        maze = parse_maze_buffer(text.encode()) if text is not None else _read_maze(str(path))
+    except (ValueError, IndexError) as error:
+        # The errors the loaders document for malformed mazes, which are the client's to fix rather than bugs.
+        raise ValueError(f"invalid maze {'text' if text is not None else path}: {error}") from error
+    # Everything the solvers read is built up front, so that concurrent solves only ever read it.
+    maze.content_hash()
+    maze.corridors
+    return maze
+
+
+def _solve(maze: Maze, factory: Callable[[Maze], MazeSolver]) -> Optional[list[SolveStep]]:
+    solver = factory(maze)
+    for _ in solver.solve():
+        pass
+    try:
+        return list(solver.get_shortest_path())
+    except ValueError:
+        return None
+
+
+class SolverService:
+    """
+    Loaded mazes, the queries being solved on them and a cache of answered queries.
+
+    Solves run in an executor, a thread pool by default, so that the event loop stays responsive and every worker shares
+    the mazes and graphs loaded in memory. Identical queries arriving while one is being solved wait for its answer
+    instead of being solved again, and the answers to the last `cache_size` distinct queries are kept in an LRU cache.
+    :param algorithms: The solvers available to queries, by name.
+    :param executor: The executor to run loads and solves in. It is shut down by `close` only if it was created here.
+    :param max_workers: The number of threads of the default executor.
+    """
+
+    def __init__(
+        self,
+        algorithms: dict[str, Callable[[Maze], MazeSolver]] = ALGORITHMS,
+        cache_size: int = 1024,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.algorithms = algorithms
+        self.cache_size = cache_size
+        self._owns_executor = executor is None
+        self.executor = ThreadPoolExecutor(max_workers) if executor is None else executor
+        self.mazes: dict[str, Maze] = {}
+        self._cache: OrderedDict[QueryKey, Optional[list[SolveStep]]] = OrderedDict()
+        self._pending: dict[QueryKey, asyncio.Future[Optional[list[SolveStep]]]] = {}
+        self.hits = self.misses = self.coalesced = 0
+
+    async def load(self, path: Optional[str] = None, text: Optional[str] = None) -> Maze:
+        """
+        Load a maze from a file or from text, and keep it in memory under its content hash.
+        :raises:
+            ValueError: If neither a path nor text is given, or the maze is malformed
+            OSError: If the file cannot be read
+        """
+        loop = asyncio.get_running_loop()
+        maze = await loop.run_in_executor(self.executor, _load_maze, path, text)
+        return self.mazes.setdefault(maze.content_hash(), maze)
+
+    def unload(self, maze_hash: str) -> bool:
+        """Forget a loaded maze and its cached answers, returning whether it was loaded."""
+        for key in [key for key in self._cache if key[0] == maze_hash]:
+            del self._cache[key]
+        return self.mazes.pop(maze_hash, None) is not None
+
+    async def solve(
+        self, maze_hash: str, source: Position, target: Position, algorithm: str = "dijkstra"
+    ) -> Optional[list[SolveStep]]:
+        """
+        Return the steps of the shortest path between two open cells of a loaded maze, or None if there is none.
+        :raises:
+            ValueError: If the maze is not loaded, or the algorithm is unknown
+            ValueError: If the source or target is not an open cell of the maze
+            IndexError: If the source or target is outside the maze
+        """
+        key = (maze_hash, source, target, algorithm)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+
+        future = self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if maze_hash not in self.mazes:
+                raise ValueError(f"maze {maze_hash} is not loaded")
+            if algorithm not in self.algorithms:
+                raise ValueError(f"unknown algorithm {algorithm!r}")
+            maze = self.mazes[maze_hash].with_endpoints(source, target)
+            self.misses += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, _solve, maze, self.algorithms[algorithm])
+            self._pending[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # A cancelled caller must not cancel the solve shared with the others.
+        return await asyncio.shield(future)
+
+    def _finish(self, key: QueryKey, future: "asyncio.Future[Optional[list[SolveStep]]]") -> None:
+        del self._pending[key]
+        if future.cancelled() or future.exception() is not None or key[0] not in self.mazes:
+            return
+        self._cache[key] = future.result()
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "mazes": len(self.mazes),
+            "cached": len(self._cache),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    async def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer one request of the JSON protocol, see the module docstring."""
+
+        def field(name: str) -> Any:
+            if name not in request:
+                raise ValueError(f"missing field {name!r}")
+            return request[name]
+
+        op = request.get("op")
+        if op == "load":
+            maze = await self.load(request.get("path"), request.get("text"))
+            return {
+                "maze": maze.content_hash(),
+                "dimensions": list(maze.grid.dimensions),
+                "entry_point": list(maze.entry_point),
+                "exit_point": list(maze.exit_point),
+            }
+        if op == "solve":
+            source, target = Position(*field("source")), Position(*field("target"))
+            path = await self.solve(field("maze"), source, target, request.get("algorithm", "dijkstra"))
+            if path is None:
+                return {"distance": None, "path": None}
+            return {"distance": len(path), "path": [step.name for step in path]}
+        if op == "unload":
+            return {"unloaded": self.unload(field("maze"))}
+        if op == "stats":
+            return self.stats()
+        raise ValueError(f"unknown op {op!r}")
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request is not a JSON object")
+            request_id = request.get("id")
+            response = await self.handle(request)
+        except (ValueError, IndexError, TypeError, OSError) as error:
+            response = {"error": str(error)}
+        except Exception as error:
+            # Any other failure is a bug, but it must not go unanswered or take down the rest of the connection.
+            logger.exception("failed to handle request %r", request_id)
+            response = {"error": f"internal error: {type(error).__name__}: {error}"}
+        if request_id is not None:
+            response["id"] = request_id
+        await self._send(response, writer)
+
+    @staticmethod
+    async def _send(response: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    @staticmethod
+    async def _discard_line(reader: asyncio.StreamReader) -> None:
+        """Discard the rest of a line longer than the limit of the reader, without holding more than the limit."""
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as error:
+                await reader.readexactly(error.consumed)
+            except asyncio.IncompleteReadError:
+                return
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests sent over one connection until it is closed."""
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial
+                except asyncio.LimitOverrunError:
+                    await self._discard_line(reader)
+                    await self._send({"error": "request line is too long"}, writer)
+                    continue
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(self._respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0, limit: int = 1 << 26) -> asyncio.Server:
+        """
+        Start listening on a TCP port, by default a free port on localhost.
+        :param limit: The maximum length of a request line in bytes, which bounds the size of mazes sent as text. Longer
+            lines are skipped and answered with an error.
+        """
+        return await asyncio.start_server(self.serve_connection, host, port, limit=limit)
+
+    async def start_unix(self, path: str, limit: int = 1 << 26) -> asyncio.Server:
+        """Start listening on a Unix socket, see `start_tcp`."""
+        return await asyncio.start_unix_server(self.serve_connection, path, limit=limit)
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    service = SolverService(cache_size=args.cache_size, max_workers=args.workers)
+    try:
+        server = await (service.start_unix(args.unix) if args.unix else service.start_tcp(args.host, args.port))
+        async with server:
+            for listening in server.sockets:
+                print(f"Listening on {listening.getsockname()}", flush=True)
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of a TCP port")
+    parser.add_argument("--workers", type=int, help="number of solver threads (default: chosen by Python)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="number of answers to cache (default: 1024)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,41 @@
 from .a_star_solver import AStarSolver
+from .batch_solver import BatchSolver, QueryResult, ShortestPathTree
 from .bfs_solver import BFSSolver
 from .bruteforce_solver import BruteforceSolver
+from .budget import Budget, SearchProgress
+from .d_star_lite_solver import DStarLiteSolver
 from .dijkstra_solver import DijkstraSolver
+from .distance_field import DistanceField, DistanceFieldCache
+from .hpa_solver import ClusterAbstraction, HPASolver
+from .instrumentation import PHASES, SearchCounters, SolverObserver, SolverStats
+from .jps_solver import JPSSolver
+from .landmark_index import LandmarkIndex
 from .maze_solver_abc import MazeSolver
+from .numpy_bfs_solver import NumpyBFSSolver
+from .tiled_solver import TiledAStarSolver
 
-__all__ = ["MazeSolver", "AStarSolver", "DijkstraSolver", "BFSSolver", "BruteforceSolver"]
+__all__ = [
+    "MazeSolver",
+    "AStarSolver",
+    "DijkstraSolver",
+    "BFSSolver",
+    "JPSSolver",
+    "DStarLiteSolver",
+    "TiledAStarSolver",
+    "HPASolver",
+    "ClusterAbstraction",
+    "LandmarkIndex",
+    "DistanceField",
+    "DistanceFieldCache",
+    "NumpyBFSSolver",
+    "BruteforceSolver",
+    "BatchSolver",
+    "QueryResult",
+    "ShortestPathTree",
+    "Budget",
+    "SearchProgress",
+    "SolverStats",
+    "SolverObserver",
+    "SearchCounters",
+    "PHASES",
+]
@@ -1,12 +1,202 @@
-from collections.abc import Iterable, Sequence
+import heapq
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Optional
 
-from ..data_structures import Position, SolveStep
+from ..data_structures import DIRECTIONS, MASK_DIRECTIONS, CompactGrid, Grid, Position, PriorityQueue, SolveStep
+from ..maze import Maze, MazeEdge, MazeVertex, trace_corridors
+from .heuristics import Heuristic, manhattan
 from .maze_solver_abc import MazeSolver
 
+_NO_DIRECTION = 255
+
 
 class AStarSolver(MazeSolver):
+    """
+    Finds the shortest path by always expanding the position with the lowest `distance + heuristic` estimate, and stops
+    as soon as the exit point is expanded.
+
+    Ties between equal estimates are broken in favour of the position with the lower heuristic value, i.e. the one
+    closest to the exit, which keeps the number of expanded positions low on mazes with many equally short paths.
+
+    :param heuristic: Estimates the remaining distance to the exit point. It must be consistent, i.e. never decrease
+        by more than the length of a step, which also means it never overestimates.
+    :param use_graph: Search the graph returned by `Maze.to_graph` instead of the cells of the grid.
+    :param queue_factory: Creates a `PriorityQueue` to use as the open set instead of the built-in binary heap. Ties
+        are then broken by the queue, not by the heuristic value.
+    """
+
+    reports_counters = True
+
+    def __init__(
+        self,
+        maze: Maze,
+        heuristic: Heuristic = manhattan,
+        use_graph: bool = False,
+        queue_factory: Optional[Callable[[], PriorityQueue[Any]]] = None,
+    ):
+        super().__init__(maze)
+        self.heuristic = heuristic
+        self.use_graph = use_graph
+        self.queue_factory = queue_factory
+
+    def prepare(self) -> None:
+        if self.use_graph:
+            self.maze.to_graph()
+        else:
+            self.maze.neighbours
+
     def solve(self) -> Iterable[Position]:
-        pass
+        """
+        Returns an iterable of positions as they are expanded by the solver.
+
+        When searching the grid, sets the `shortest_distances` attribute to the distances found from the entry point;
+        these are exact for every expanded position.
+        """
+        if self.use_graph:
+            yield from self._solve_graph()
+        else:
+            yield from self._solve_grid()
+        self._completed = True
+
+    def _solve_grid(self) -> Iterable[Position]:
+        grid = self.maze.grid
+        masks, offsets = self.maze.neighbours.masks, self.maze.neighbours.offsets
+        goal = self.maze.exit_point
+
+        distances = array("d", [float("inf")]) * len(masks)
+        self.shortest_distances: Grid[float] = CompactGrid(grid.dimensions, distances)
+        self._parent_directions = parent_directions = bytearray([_NO_DIRECTION]) * len(masks)
+        expanded = bytearray(len(masks))
+
+        source, target = grid.index(*self.maze.entry_point), grid.index(*goal)
+        distances[source] = 0
+        source_estimate = self.heuristic(self.maze.entry_point, goal)
+        open_set: list[tuple[float, float, int]] = [(source_estimate, source_estimate, source)]
+        open_queue = None if self.queue_factory is None else self.queue_factory()
+        if open_queue is not None:
+            open_queue.push(source, source_estimate)
+        counters = self.counters
+        counting = counters.enabled
+        if counting:
+            counters.push()
+
+        while open_set if open_queue is None else open_queue:
+            index = heapq.heappop(open_set)[2] if open_queue is None else open_queue.pop()
+            if counting:
+                counters.pops += 1
+            if expanded[index]:
+                continue
+            expanded[index] = 1
+            yield grid.position_of(index)
+
+            if index == target:
+                return
+
+            next_distance = distances[index] + 1
+            for direction in MASK_DIRECTIONS[masks[index]]:
+                neighbour = index + offsets[direction]
+                if next_distance < distances[neighbour]:
+                    estimate = self.heuristic(grid.position_of(neighbour), goal)
+                    if counting:
+                        counters.relaxations += 1
+                        if open_queue is None or distances[neighbour] == float("inf"):
+                            counters.push()
+                        else:
+                            counters.decrease_keys += 1
+                    if open_queue is None:
+                        heapq.heappush(open_set, (next_distance + estimate, estimate, neighbour))
+                    elif distances[neighbour] == float("inf"):
+                        open_queue.push(neighbour, next_distance + estimate)
+                    else:
+                        open_queue.decrease_priority(neighbour, next_distance + estimate)
+                    distances[neighbour] = next_distance
+                    parent_directions[neighbour] = direction
+
+    def _solve_graph(self) -> Iterable[Position]:
+        graph = self.maze.to_graph()
+        source = next(vertex for vertex in graph.vertices if vertex.data == self.maze.entry_point)
+        goal = self.maze.exit_point
+
+        # Vertices are tracked by their ids, which index these arrays and break ties in the open set.
+        vertices = graph.vertices
+        distances = array("d", [float("inf")]) * len(vertices)
+        distances[source.id] = 0
+        self._parent_edges: dict[MazeVertex, MazeEdge] = {}
+        self._target: Optional[MazeVertex] = None
+        expanded = bytearray(len(vertices))
+
+        source_estimate = self.heuristic(source.data, goal)
+        open_set: list[tuple[float, float, int]] = [(source_estimate, source_estimate, source.id)]
+        open_queue = None if self.queue_factory is None else self.queue_factory()
+        if open_queue is not None:
+            open_queue.push(source.id, source_estimate)
+        counters = self.counters
+        counting = counters.enabled
+        if counting:
+            counters.push()
+
+        while open_set if open_queue is None else open_queue:
+            vertex_id = heapq.heappop(open_set)[2] if open_queue is None else open_queue.pop()
+            if counting:
+                counters.pops += 1
+            if expanded[vertex_id]:
+                continue
+            expanded[vertex_id] = 1
+            vertex = vertices[vertex_id]
+            yield vertex.data
+
+            if vertex.data == goal:
+                self._target = vertex
+                return
+
+            for edge in vertex.edges:
+                other_end = edge.get_other_end(vertex)
+                other_id = other_end.id
+                new_distance = distances[vertex_id] + len(edge.data)
+                if new_distance < distances[other_id]:
+                    estimate = self.heuristic(other_end.data, goal)
+                    if counting:
+                        counters.relaxations += 1
+                        if open_queue is None or distances[other_id] == float("inf"):
+                            counters.push()
+                        else:
+                            counters.decrease_keys += 1
+                    if open_queue is None:
+                        heapq.heappush(open_set, (new_distance + estimate, estimate, other_id))
+                    elif distances[other_id] == float("inf"):
+                        open_queue.push(other_id, new_distance + estimate)
+                    else:
+                        open_queue.decrease_priority(other_id, new_distance + estimate)
+                    distances[other_id] = new_distance
+                    self._parent_edges[other_end] = edge
+
+    def get_path_to(self, position: Position) -> Optional[Sequence[SolveStep]]:
+        if self.use_graph:
+            return None
+        grid, offsets = self.maze.grid, self.maze.neighbours.offsets
+        source, current = grid.index(*self.maze.entry_point), grid.index(*position)
+        if self._parent_directions[current] == _NO_DIRECTION and current != source:
+            return None
+
+        steps: deque[SolveStep] = deque([])
+        while current != source:
+            direction = self._parent_directions[current]
+            steps.appendleft(DIRECTIONS[direction])
+            current -= offsets[direction]
+        return steps
 
     def get_shortest_path(self) -> Sequence[SolveStep]:
-        pass
+        if not self._completed:
+            raise RuntimeError("solve method was not called")
+
+        if self.use_graph:
+            if self._target is None:
+                raise ValueError("exit point is not reachable from the entry point")
+            return trace_corridors(self._parent_edges, self._target)
+
+        steps = self.get_path_to(self.maze.exit_point)
+        if steps is None:
+            raise ValueError("exit point is not reachable from the entry point")
+        return steps
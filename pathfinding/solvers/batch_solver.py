@@ -0,0 +1,106 @@
+from array import array
+from collections import deque
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Optional
+
+from ..data_structures import DIRECTIONS, MASK_DIRECTIONS, Position, SolveStep
+from ..maze import Maze
+
+_NO_DIRECTION = 255
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    source: Position
+    target: Position
+    distance: float
+    """The length of the shortest path, or infinity if the target cannot be reached."""
+    path: Optional[list[SolveStep]]
+    """The steps of the shortest path, or None if the target cannot be reached or paths were not requested."""
+
+
+class ShortestPathTree:
+    """
+    The shortest paths from one source cell of a maze, found by a breadth first search over its neighbour table.
+    :param targets: If given, the search stops as soon as all of these positions have been reached.
+    """
+
+    def __init__(self, maze: Maze, source: Position, targets: Optional[Collection[Position]] = None):
+        self.maze = maze
+        self.source = source
+
+        grid = maze.grid
+        masks, offsets = maze.neighbours.masks, maze.neighbours.offsets
+        self._distances = distances = array("d", [float("inf")]) * len(masks)
+        self._parent_directions = parent_directions = bytearray([_NO_DIRECTION]) * len(masks)
+
+        start = grid.index(*source)
+        distances[start] = 0
+        remaining = None if targets is None else {grid.index(*target) for target in targets} - {start}
+        exploration_queue: deque[int] = deque([start])
+
+        while exploration_queue and remaining != set():
+            index = exploration_queue.popleft()
+            next_distance = distances[index] + 1
+            for direction in MASK_DIRECTIONS[masks[index]]:
+                neighbour = index + offsets[direction]
+                if next_distance < distances[neighbour]:
+                    distances[neighbour] = next_distance
+                    parent_directions[neighbour] = direction
+                    exploration_queue.append(neighbour)
+                    if remaining is not None:
+                        remaining.discard(neighbour)
+
+    def distance(self, target: Position) -> float:
+        """Return the length of the shortest path to the target, or infinity if it was not reached."""
+        return self._distances[self.maze.grid.index(*target)]
+
+    def path(self, target: Position) -> Optional[list[SolveStep]]:
+        """Return the steps of the shortest path to the target, or None if it was not reached."""
+        grid, offsets = self.maze.grid, self.maze.neighbours.offsets
+        current = grid.index(*target)
+        if self._distances[current] == float("inf"):
+            return None
+
+        steps: deque[SolveStep] = deque([])
+        while self._parent_directions[current] != _NO_DIRECTION:
+            direction = self._parent_directions[current]
+            steps.appendleft(DIRECTIONS[direction])
+            current -= offsets[direction]
+        return list(steps)
+
+
+class BatchSolver:
+    """
+    Answers many shortest path queries on one maze, ignoring its entry and exit points.
+
+    Queries are grouped by source, so a single search tree serves every query from the same source. Each tree is grown
+    only until all of the targets queried from its source have been reached.
+    """
+
+    def __init__(self, maze: Maze):
+        self.maze = maze
+
+    def solve(self, queries: Iterable[tuple[Position, Position]], with_paths: bool = True) -> Iterator[QueryResult]:
+        """
+        Yields the result of every (source, target) query, grouped by source in the order sources first appear.
+        :param with_paths: Whether to reconstruct the paths, rather than only report distances.
+        """
+        targets_by_source: dict[Position, list[Position]] = {}
+        for source, target in queries:
+            targets_by_source.setdefault(source, []).append(target)
+
+        for source, targets in targets_by_source.items():
+            tree = ShortestPathTree(self.maze, source, targets)
+            for target in targets:
+                yield QueryResult(source, target, tree.distance(target), tree.path(target) if with_paths else None)
+
+    def distances_from(self, source: Position, targets: Collection[Position]) -> list[float]:
+        """Return the shortest distances from one source to each of the targets."""
+        tree = ShortestPathTree(self.maze, source, targets)
+        return [tree.distance(target) for target in targets]
+
+    def distance_matrix(self, sources: Iterable[Position], targets: Collection[Position]) -> list[list[float]]:
+        """Return the shortest distances from each of the sources (rows) to each of the targets (columns)."""
+        return [self.distances_from(source, targets) for source in sources]
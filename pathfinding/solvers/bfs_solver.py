@@ -1,46 +1,146 @@
-import operator
+from array import array
 from collections import deque
 from collections.abc import Iterable, Sequence
+from typing import Optional
 
-from ..data_structures import Grid, Position, SolveStep
-from ..maze import CellState
+from ..data_structures import DIRECTIONS, MASK_DIRECTIONS, CompactGrid, Grid, Position, SolveStep
+from ..maze import Maze
 from .maze_solver_abc import MazeSolver
 
 
 class BFSSolver(MazeSolver):
+    """
+    :param bidirectional: Search from the entry and exit points at the same time, one whole level of the smaller
+        frontier at a time, and stop at the end of the first level on which the two searches meet. This explores
+        roughly half as many cells when the exit is far from the entry.
+    """
+
+    reports_counters = True
+
+    def __init__(self, maze: Maze, bidirectional: bool = False):
+        super().__init__(maze)
+        self.bidirectional = bidirectional
+
     def solve(self) -> Iterable[Position]:
-        self.shortest_distances: Grid[float] = Grid.from_dimensions(self.maze.grid.dimensions, default=float("inf"))
-        self.shortest_distances[self.maze.entry_point] = 0
+        """
+        Returns an iterable of positions as they are explored by the solver.
+
+        Sets the `shortest_distances` attribute to the distances of the cells reached from the entry point. In
+        bidirectional mode, cells only reached from the exit point are left at infinity.
+        """
+        grid = self.maze.grid
+        masks, offsets = self.maze.neighbours.masks, self.maze.neighbours.offsets
 
-        exploration_queue: deque[Position] = deque([self.maze.entry_point])
-        visited: set[Position] = set()
+        self._distances = distances = array("d", [float("inf")]) * len(masks)
+        self.shortest_distances: Grid[float] = CompactGrid(grid.dimensions, distances)
+        self._backward_distances: Optional[array[float]] = None
+        self._meeting: Optional[int] = None
 
+        source = grid.index(*self.maze.entry_point)
+        distances[source] = 0
+        if self.bidirectional:
+            yield from self._solve_bidirectional(source, grid.index(*self.maze.exit_point))
+            self._completed = True
+            return
+
+        counters = self.counters
+        counting = counters.enabled
+        if counting:
+            counters.push()
+        exploration_queue: deque[int] = deque([source])
         while exploration_queue:
-            position = exploration_queue.popleft()
-            visited.add(position)
+            index = exploration_queue.popleft()
+            next_distance = distances[index] + 1
+            if counting:
+                counters.pops += 1
 
-            for direction, neighbour in self.maze.grid.get_neighbours_where_predicate(position):
-                neighbour_position = position.apply_step(direction)
-                if neighbour == CellState.WALL or neighbour_position in visited:
-                    continue
-                self.shortest_distances[neighbour_position] = 1 + self.shortest_distances[position]
-                exploration_queue.append(neighbour_position)
+            for direction in MASK_DIRECTIONS[masks[index]]:
+                neighbour = index + offsets[direction]
+                if next_distance < distances[neighbour]:
+                    distances[neighbour] = next_distance
+                    exploration_queue.append(neighbour)
+                    if counting:
+                        counters.relaxations += 1
+                        counters.push()
 
-            yield position
+            yield grid.position_of(index)
         self._completed = True
 
+    def _solve_bidirectional(self, source: int, target: int) -> Iterable[Position]:
+        grid = self.maze.grid
+        masks, offsets = self.maze.neighbours.masks, self.maze.neighbours.offsets
+        forward = self._distances
+        self._backward_distances = backward = array("d", [float("inf")]) * len(masks)
+        backward[target] = 0
+
+        best = 0 if source == target else float("inf")
+        self._meeting = source if source == target else None
+        frontiers = [[source], [target]]
+        counters = self.counters
+        counting = counters.enabled
+        if counting:
+            counters.push()
+            counters.push()
+
+        # Cells are checked against the other search as they are reached, so the first level on which the searches
+        # meet contains a cell on a shortest path. The whole level is expanded to find the best one.
+        while best == float("inf") and frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            distances, other = (forward, backward) if side == 0 else (backward, forward)
+            next_frontier = []
+
+            for index in frontiers[side]:
+                next_distance = distances[index] + 1
+                if counting:
+                    counters.pops += 1
+                for direction in MASK_DIRECTIONS[masks[index]]:
+                    neighbour = index + offsets[direction]
+                    if next_distance < distances[neighbour]:
+                        distances[neighbour] = next_distance
+                        next_frontier.append(neighbour)
+                        if counting:
+                            counters.relaxations += 1
+                            counters.push()
+                        if next_distance + other[neighbour] < best:
+                            best, self._meeting = next_distance + other[neighbour], neighbour
+
+                yield grid.position_of(index)
+            frontiers[side] = next_frontier
+
+    def _descend(self, distances: "array[float]", current: int) -> list[int]:
+        """Return the directions of the steps from a reached cell back to the start of the search which reached it."""
+        masks, offsets = self.maze.neighbours.masks, self.maze.neighbours.offsets
+        directions = []
+        while distances[current] != 0:
+            previous_distance = distances[current] - 1
+            for direction in MASK_DIRECTIONS[masks[current]]:
+                if distances[current + offsets[direction]] == previous_distance:
+                    break
+            directions.append(direction)
+            current += offsets[direction]
+        return directions
+
+    def get_path_to(self, position: Position) -> Optional[Sequence[SolveStep]]:
+        index = self.maze.grid.index(*position)
+        if self._distances[index] == float("inf"):
+            return None
+        return [DIRECTIONS[direction ^ 1] for direction in reversed(self._descend(self._distances, index))]
+
+    def _reached_from_entry(self, position: Position) -> bool:
+        return self._distances[self.maze.grid.index(*position)] != float("inf")
+
     def get_shortest_path(self) -> Sequence[SolveStep]:
         if not self._completed:
             raise RuntimeError("solve method was not called")
 
-        steps: deque[SolveStep] = deque([])
-
-        current = self.maze.exit_point
-        while current != self.maze.entry_point:
-            next_step, _ = min(
-                self.shortest_distances.get_neighbours_where_predicate(current), key=operator.itemgetter(1)
-            )
-            steps.appendleft(~next_step)
-            current = current.apply_step(next_step)
+        if self._backward_distances is None:
+            path = self.get_path_to(self.maze.exit_point)
+            if path is None:
+                raise ValueError("exit point is not reachable from the entry point")
+            return path
 
+        if self._meeting is None:
+            raise ValueError("exit point is not reachable from the entry point")
+        steps = [DIRECTIONS[direction ^ 1] for direction in reversed(self._descend(self._distances, self._meeting))]
+        steps.extend(DIRECTIONS[direction] for direction in self._descend(self._backward_distances, self._meeting))
         return steps
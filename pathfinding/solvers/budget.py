@@ -0,0 +1,47 @@
+"""
+Limits on the work done by one call of `MazeSolver.solve_within`, and what the search achieved within them.
+"""
+import time
+from dataclasses import dataclass
+from threading import Event
+from typing import Optional
+
+from ..data_structures import Position, SolveStep
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    When to pause a search. Every limit is optional, and a budget without any lets the search run to the end.
+    :param max_expansions: The number of positions the search may expand.
+    :param deadline: The `time.monotonic` time at which the search must stop.
+    :param cancellation: An event which stops the search once set, e.g. from another thread.
+    """
+
+    max_expansions: Optional[int] = None
+    deadline: Optional[float] = None
+    cancellation: Optional[Event] = None
+
+    @classmethod
+    def within(
+        cls, seconds: float, max_expansions: Optional[int] = None, cancellation: Optional[Event] = None
+    ) -> "Budget":
+        """Return a budget whose deadline is the given number of seconds from now."""
+        return cls(max_expansions, time.monotonic() + seconds, cancellation)
+
+
+@dataclass(frozen=True)
+class SearchProgress:
+    complete: bool
+    """Whether the search has finished, in which case `path` is the shortest path if there is one."""
+    stopped_by: Optional[str]
+    """The limit which paused the search: "expansions", "deadline" or "cancellation", or None if it is complete."""
+    expanded: int
+    """The number of positions expanded during this call."""
+    closest: Optional[Position]
+    """
+    The exit point if the search found it, and otherwise the expanded position closest to the exit by Manhattan distance
+    among those reached from the entry point, or None if there is none yet.
+    """
+    path: Optional[list[SolveStep]]
+    """The steps from the entry point to `closest`, or None if the solver cannot reconstruct them."""
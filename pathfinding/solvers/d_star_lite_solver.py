@@ -0,0 +1,177 @@
+import heapq
+from array import array
+from collections.abc import Iterable, Sequence
+
+from ..data_structures import DIRECTIONS, MASK_DIRECTIONS, CompactGrid, Grid, Position, SolveStep
+from ..maze import CellState, Maze
+from .heuristics import Heuristic, manhattan
+from .maze_solver_abc import MazeSolver
+
+
+class DStarLiteSolver(MazeSolver):
+    """
+    D* Lite, an incremental search which keeps its state between changes to the maze and repairs only the part of it
+    the changes affect, for agents moving through mazes whose walls change while they move.
+
+    The search runs backwards from the exit point, keeping for every cell an estimate `g` of its distance to the exit
+    and a one-step lookahead `rhs` computed from the estimates of its neighbours. Cells whose two values differ are
+    queued, in order of their distance plus the heuristic distance from the entry point, and the search stops as soon
+    as the entry point's distance is known. A change to some cells only makes those cells and their neighbours
+    inconsistent, so the next search starts from them and settles only the cells whose distances changed.
+
+    Cells must be changed through `update` or `set_cells`, which tell the solver which cells changed. If the grid is
+    written to in any other way, the next search starts over from scratch. The entry point is moved with `move_to` as
+    the agent advances, without invalidating the search.
+    :param heuristic: Estimates the distance between two positions, see `AStarSolver`.
+    """
+
+    def __init__(self, maze: Maze, heuristic: Heuristic = manhattan):
+        super().__init__(maze)
+        self.heuristic = heuristic
+        self._initialised = False
+
+    def _reset(self) -> None:
+        grid = self.maze.grid
+        self._g = array("d", [float("inf")]) * len(grid.cells)
+        self._rhs = array("d", [float("inf")]) * len(grid.cells)
+        self.shortest_distances: Grid[float] = CompactGrid(grid.dimensions, self._g)
+        self._version = grid.version
+        # The offset added to the keys of every cell queued since the entry point last moved, which keeps the keys
+        # of cells queued earlier valid lower bounds, see `move_to`.
+        self._key_offset = 0.0
+        self._last_entry_point = self.maze.entry_point
+        self._open_set: list[tuple[float, float, int]] = []
+        self._open_keys: dict[int, tuple[float, float]] = {}
+
+        goal = grid.index(*self.maze.exit_point)
+        self._rhs[goal] = 0
+        self._push(goal)
+        self._initialised = True
+
+    def _key(self, cell: int) -> tuple[float, float]:
+        distance = min(self._g[cell], self._rhs[cell])
+        position = self.maze.grid.position_of(cell)
+        return distance + self.heuristic(self.maze.entry_point, position) + self._key_offset, distance
+
+    def _push(self, cell: int) -> None:
+        key = self._key(cell)
+        self._open_keys[cell] = key
+        heapq.heappush(self._open_set, (*key, cell))
+
+    def _update_cell(self, cell: int) -> None:
+        """Recompute the lookahead of a cell from its neighbours, and queue it if it became inconsistent."""
+        masks, offsets, g = self.maze.neighbours.masks, self.maze.neighbours.offsets, self._g
+        if cell != self.maze.grid.index(*self.maze.exit_point):
+            self._rhs[cell] = min(
+                (g[cell + offsets[direction]] + 1 for direction in MASK_DIRECTIONS[masks[cell]]), default=float("inf")
+            )
+        self._open_keys.pop(cell, None)
+        if g[cell] != self._rhs[cell]:
+            self._push(cell)
+
+    def _top_key(self) -> tuple[float, float]:
+        """Return the smallest key in the open set, dropping the stale entries in front of it."""
+        open_set, open_keys = self._open_set, self._open_keys
+        while open_set:
+            k1, k2, cell = open_set[0]
+            if open_keys.get(cell) == (k1, k2):
+                return k1, k2
+            heapq.heappop(open_set)
+        return float("inf"), float("inf")
+
+    def solve(self) -> Iterable[Position]:
+        """
+        Returns an iterable of positions as they are expanded by the solver. The first search expands the cells between
+        the exit and entry points, like a backwards A*; later ones only expand the cells affected by changes made since.
+
+        Sets the `shortest_distances` attribute to the distances of cells to the exit point, which are exact for the
+        cells on the shortest path from the entry point.
+        """
+        if not self._initialised or self._version != self.maze.grid.version:
+            self._reset()
+        grid = self.maze.grid
+        masks, offsets = self.maze.neighbours.masks, self.maze.neighbours.offsets
+        g, rhs, open_keys = self._g, self._rhs, self._open_keys
+        start = grid.index(*self.maze.entry_point)
+
+        while True:
+            top_key = self._top_key()
+            if not (top_key < self._key(start) or rhs[start] != g[start]):
+                break
+            cell = heapq.heappop(self._open_set)[2]
+            del open_keys[cell]
+            new_key = self._key(cell)
+            if top_key < new_key:
+                self._push(cell)
+                continue
+
+            yield grid.position_of(cell)
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = float("inf")
+                self._update_cell(cell)
+            for direction in MASK_DIRECTIONS[masks[cell]]:
+                self._update_cell(cell + offsets[direction])
+        self._completed = True
+
+    def set_cells(self, changes: dict[tuple[int, int], CellState]) -> None:
+        """
+        Set the states of cells of the maze, see `Maze.set_cells`, and queue the cells whose distances may have changed
+        for the next search.
+        """
+        self.maze.set_cells(changes)
+        self._search = None
+        self._completed = False
+        if not self._initialised or self._version + len(changes) != self.maze.grid.version:
+            # The grid was changed behind the solver's back as well, so the next search starts over.
+            self._initialised = False
+            return
+        self._version = self.maze.grid.version
+
+        neighbours = self.maze.neighbours
+        affected = {cell for position in changes for cell in neighbours.neighbourhood(self.maze.grid.index(*position))}
+        for cell in affected:
+            if not neighbours.is_open(cell):
+                # A wall is no longer part of the graph, so its distance is dropped along with the edges into it.
+                self._g[cell] = float("inf")
+            self._update_cell(cell)
+
+    def update(self, changes: dict[tuple[int, int], CellState]) -> Sequence[SolveStep]:
+        """
+        Set the states of cells of the maze, repair the search and return the new shortest path.
+        :raises:
+            ValueError: If the exit point is no longer reachable from the entry point
+        """
+        self.set_cells(changes)
+        for _ in self.solve():
+            pass
+        return self.get_shortest_path()
+
+    def move_to(self, position: Position) -> None:
+        """Move the entry point, e.g. to where the agent following the path has got to, keeping the search state."""
+        self.maze = self.maze.with_endpoints(position, self.maze.exit_point)
+        self._search = None
+        self._completed = False
+        if self._initialised:
+            # Keys queued before the move overestimate by at most the distance moved, which is added to new keys.
+            self._key_offset += self.heuristic(self._last_entry_point, position)
+            self._last_entry_point = position
+
+    def get_shortest_path(self) -> Sequence[SolveStep]:
+        if not self._completed:
+            raise RuntimeError("solve method was not called")
+
+        grid = self.maze.grid
+        masks, offsets, g = self.maze.neighbours.masks, self.maze.neighbours.offsets, self._g
+        current, goal = grid.index(*self.maze.entry_point), grid.index(*self.maze.exit_point)
+        if g[current] == float("inf") and current != goal:
+            raise ValueError("exit point is not reachable from the entry point")
+
+        # Every cell on the path has an exact distance, one more than that of the next cell along it.
+        steps = []
+        while current != goal:
+            direction = min(MASK_DIRECTIONS[masks[current]], key=lambda direction: g[current + offsets[direction]])
+            steps.append(DIRECTIONS[direction])
+            current += offsets[direction]
+        return steps
@@ -1,42 +1,197 @@
 from collections import defaultdict
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
+from typing import Optional
 
-from ..data_structures import Heap, Position, PriorityQueue, SolveStep
-from ..maze import MazeVertex
+from ..data_structures import CorridorGraph, Heap, Position, PriorityQueue, SolveStep
+from ..maze import Maze
+from .instrumentation import SearchCounters
 from .maze_solver_abc import MazeSolver
 
 
+class _Frontier:
+    """
+    One direction of a search over a corridor graph, from `start` towards `goal`.
+    Both are treated as vertices even when they lie inside a corridor, and the goal is never expanded.
+    """
+
+    def __init__(
+        self, corridors: CorridorGraph, start: int, goal: int, queue: PriorityQueue[int], counters: SearchCounters
+    ):
+        self.corridors = corridors
+        self.start, self.goal = start, goal
+        endpoints = {start, goal}
+
+        # Moves out of the start, and moves from vertices into the goal, which are not edges of the graph.
+        self.start_moves = None if corridors.is_vertex(start) else corridors.attach(start, stop=endpoints)
+        self.goal_moves: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+        if not corridors.is_vertex(goal):
+            for _, end, end_direction, length in corridors.attach(goal, stop=endpoints):
+                self.goal_moves[end].append((end_direction, length))
+
+        self.distances: defaultdict[int, float] = defaultdict(lambda: float("inf"))
+        self.distances[start] = 0
+        self.parent_moves: dict[int, tuple[int, int, bool]] = {}
+        self.settled: set[int] = set()
+        self.queue = queue
+        self.counters, self.counting = counters, counters.enabled
+        queue.push(start, 0)
+        if self.counting:
+            counters.push()
+
+    def top_distance(self) -> float:
+        """Return the distance of the next cell to be settled, or infinity if there is none."""
+        return self.distances[self.queue.peek()] if self.queue else float("inf")
+
+    def settle(self) -> int:
+        cell = self.queue.pop()
+        self.settled.add(cell)
+        if self.counting:
+            self.counters.pops += 1
+        return cell
+
+    def relax(self, cell: int) -> list[int]:
+        """Relax the moves out of a settled cell, and return the cells whose distances decreased."""
+        corridors, distances = self.corridors, self.distances
+        if cell == self.start and self.start_moves is not None:
+            moves = [(direction, end, length, True) for direction, end, _, length in self.start_moves]
+        elif cell == self.goal:
+            return []
+        else:
+            moves = [
+                (direction, corridors.other_end(edge, cell), corridors.edge_lengths[edge], False)
+                for direction, edge in enumerate(corridors.incident_edges(cell))
+                if edge != -1
+            ]
+            moves.extend((direction, self.goal, length, True) for direction, length in self.goal_moves.get(cell, ()))
+
+        improved = []
+        for direction, other_end, length, stops_at_endpoints in moves:
+            if other_end in self.settled:
+                continue
+
+            current_dist = distances[other_end]
+            new_dist = distances[cell] + length
+            if new_dist >= current_dist:
+                continue
+
+            distances[other_end] = new_dist
+            self.parent_moves[other_end] = cell, direction, stops_at_endpoints
+            improved.append(other_end)
+            if current_dist == float("inf"):
+                self.queue.push(other_end, new_dist)
+            else:
+                self.queue.decrease_priority(other_end, new_dist)
+            if self.counting:
+                self.counters.relaxations += 1
+                if current_dist == float("inf"):
+                    self.counters.push()
+                else:
+                    self.counters.decrease_keys += 1
+        return improved
+
+    def steps_to(self, cell: int) -> list[SolveStep]:
+        """Return the steps of the shortest path found from the start to a reached cell."""
+        moves = []
+        while cell in self.parent_moves:
+            moves.append(self.parent_moves[cell])
+            cell = moves[-1][0]
+
+        endpoints = {self.start, self.goal}
+        steps: list[SolveStep] = []
+        for parent, direction, stops_at_endpoints in reversed(moves):
+            self.corridors.walk(parent, direction, steps, stop=endpoints if stops_at_endpoints else ())
+        return steps
+
+
 class DijkstraSolver(MazeSolver):
+    """
+    Searches the corridor graph of the maze (see `Maze.corridors`), whose edges are weighted by corridor length.
+    The graph is cached by the maze, so repeated queries on the same maze do not rebuild it.
+
+    :param queue_factory: Creates the priority queue used for the frontier. Since edge weights are corridor lengths,
+        `BucketQueue` is a good fit for mazes with short corridors.
+    :param bidirectional: Search from the entry and exit points at the same time, always advancing the side with the
+        smaller frontier, and stop once the two searches provably cannot improve on the shortest path where they met.
+        This settles roughly half as many vertices when the exit is far from the entry.
+    """
+
+    reports_counters = True
+
+    def __init__(self, maze: Maze, queue_factory: Callable[[], PriorityQueue[int]] = Heap, bidirectional: bool = False):
+        super().__init__(maze)
+        self.queue_factory = queue_factory
+        self.bidirectional = bidirectional
+
+    def prepare(self) -> None:
+        self.maze.corridors
+
     def solve(self) -> Iterable[Position]:
-        graph = self.maze.to_graph()
-        source = next(vertex for vertex in graph.vertices if vertex.data == self.maze.entry_point)
-        visited: set[MazeVertex] = {source}
-        self.shortest_distances: defaultdict[MazeVertex, float] = defaultdict(lambda: float("inf"))
-        self.shortest_distances[source] = 0
-        priority_queue: PriorityQueue[MazeVertex] = Heap()
+        """
+        Returns an iterable of the positions of graph vertices as they are settled by the solver, stopping once the
+        shortest path to the exit point is known. The entry and exit points are treated as vertices even when they lie
+        inside a corridor.
 
-        for vertex in graph.vertices:
-            priority_queue.push(vertex, self.shortest_distances[vertex])
+        Sets the `shortest_distances` attribute to the shortest distances of the vertices settled from the entry point.
+        In bidirectional mode, vertices settled by the search from the exit point are not included.
+        """
+        grid, corridors = self.maze.grid, self.maze.corridors
+        source, target = grid.index(*self.maze.entry_point), grid.index(*self.maze.exit_point)
+        self.shortest_distances: defaultdict[Position, float] = defaultdict(lambda: float("inf"))
+        self._meeting: Optional[int] = None
 
-        while priority_queue:
-            vertex = priority_queue.pop()
-            visited.add(vertex)
-            for edge in vertex.edges:
+        self._forward = forward = _Frontier(corridors, source, target, self.queue_factory(), self.counters)
+        if not self.bidirectional:
+            while forward.queue:
+                cell = forward.settle()
+                position = grid.position_of(cell)
+                self.shortest_distances[position] = forward.distances[cell]
+                yield position
 
-                other_end = edge.get_other_end(vertex)
+                if cell == target:
+                    self._meeting = cell
+                    break
+                forward.relax(cell)
+            self._backward = None
+            self._completed = True
+            return
 
-                if other_end in visited:
-                    continue
-                new_dist = min(self.shortest_distances[other_end], self.shortest_distances[vertex] + len(edge.data))
-                self.shortest_distances[other_end] = new_dist
-                priority_queue.decrease_priority(other_end, new_dist)
+        self._backward = backward = _Frontier(corridors, target, source, self.queue_factory(), self.counters)
+        best = 0 if source == target else float("inf")
+        self._meeting = source if source == target else None
 
-            yield vertex.data
+        # Every cell reached by both searches joins a path through it. Once the smallest unsettled distances of the two
+        # searches add up to at least the best such path, no unsettled cell can lie on a shorter one.
+        while forward.queue and backward.queue and forward.top_distance() + backward.top_distance() < best:
+            side, other = (forward, backward) if len(forward.queue) <= len(backward.queue) else (backward, forward)
+            cell = side.settle()
+            position = grid.position_of(cell)
+            if side is forward:
+                self.shortest_distances[position] = forward.distances[cell]
+            yield position
 
+            for reached in side.relax(cell):
+                through = side.distances[reached] + other.distances[reached]
+                if through < best:
+                    best, self._meeting = through, reached
         self._completed = True
 
+    def get_path_to(self, position: Position) -> Optional[Sequence[SolveStep]]:
+        cell = self.maze.grid.index(*position)
+        if cell not in self._forward.settled:
+            return None
+        return self._forward.steps_to(cell)
+
+    def _reached_from_entry(self, position: Position) -> bool:
+        return self.maze.grid.index(*position) in self._forward.settled
+
     def get_shortest_path(self) -> Sequence[SolveStep]:
         if not self._completed:
             raise RuntimeError("solve method was not called")
 
-        return []
+        if self._meeting is None:
+            raise ValueError("exit point is not reachable from the entry point")
+
+        steps = self._forward.steps_to(self._meeting)
+        if self._backward is not None:
+            steps.extend(~step for step in reversed(self._backward.steps_to(self._meeting)))
+        return steps
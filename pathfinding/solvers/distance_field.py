@@ -0,0 +1,126 @@
+"""
+Distances from every cell of a maze to the nearest of many sources, with the step towards it, for steering any number
+of agents with constant time lookups.
+"""
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Optional
+
+from ..data_structures import DIRECTIONS, MASK_DIRECTIONS, CompactGrid, Grid, Position, SolveStep
+from ..maze import Maze
+
+_NO_DIRECTION = len(DIRECTIONS)
+
+
+class DistanceField:
+    """
+    The distance from every open cell of a maze to the nearest of a set of source cells, e.g. its exits, found by a
+    single breadth first search started from all of the sources at once.
+
+    `directions` is a flow field: following the step stored at each cell leads along a shortest path to the nearest
+    source, and each step is a single lookup. Cells which are sources, walls or cut off from every source have no step.
+    The field describes the maze at the time it was built; `is_current` tells whether the maze has changed since.
+    :raises:
+        ValueError: If there are no sources, or a source is not an open cell of the maze
+    """
+
+    def __init__(self, maze: Maze, sources: Iterable[Position]):
+        self.maze = maze
+        self.sources = tuple(dict.fromkeys(Position(*source) for source in sources))
+        self.content_hash = maze.content_hash()
+        if not self.sources:
+            raise ValueError("a distance field needs at least one source")
+
+        grid = maze.grid
+        neighbours = maze.neighbours
+        masks, offsets = neighbours.masks, neighbours.offsets
+        distances = array("d", [float("inf")]) * len(masks)
+        direction_codes = bytearray([_NO_DIRECTION]) * len(masks)
+        self._nearest = nearest = array("q", [-1]) * len(masks)
+
+        frontier: list[int] = []
+        for source_id, source in enumerate(self.sources):
+            index = grid.index(*source)
+            if not neighbours.is_open(index):
+                raise ValueError(f"source {source} is not an open cell")
+            distances[index] = 0
+            nearest[index] = source_id
+            frontier.append(index)
+
+        # Level by level, so every cell is reached first from a nearest source. Each reached cell's step points back
+        # along the move which reached it.
+        level = 0
+        while frontier:
+            level += 1
+            next_frontier: list[int] = []
+            for index in frontier:
+                for direction in MASK_DIRECTIONS[masks[index]]:
+                    neighbour = index + offsets[direction]
+                    if distances[neighbour] == float("inf"):
+                        distances[neighbour] = level
+                        direction_codes[neighbour] = direction ^ 1
+                        nearest[neighbour] = nearest[index]
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+
+        self.distances: Grid[float] = CompactGrid(grid.dimensions, distances)
+        self.directions: Grid[Optional[SolveStep]] = CompactGrid(grid.dimensions, direction_codes, (*DIRECTIONS, None))
+
+    def is_current(self) -> bool:
+        """Return whether the cells of the maze are the same as when the field was built."""
+        return self.maze.content_hash() == self.content_hash
+
+    def distance(self, position: Position) -> float:
+        """Return the distance from a cell to the nearest source, or infinity if no source can be reached."""
+        return self.distances[position]
+
+    def step(self, position: Position) -> Optional[SolveStep]:
+        """Return the first step from a cell towards the nearest source, or None if it is a source or has no path."""
+        return self.directions[position]
+
+    def nearest_source(self, position: Position) -> Optional[Position]:
+        """Return the source nearest to a cell, or None if no source can be reached."""
+        source_id = self._nearest[self.maze.grid.index(*position)]
+        return None if source_id == -1 else self.sources[source_id]
+
+    def path(self, position: Position) -> Optional[list[SolveStep]]:
+        """Return the steps from a cell to the nearest source, or None if no source can be reached."""
+        position = Position(*position)
+        if self.distance(position) == float("inf"):
+            return None
+        steps: list[SolveStep] = []
+        while (step := self.directions[position]) is not None:
+            steps.append(step)
+            position = position.apply_step(step)
+        return steps
+
+
+class DistanceFieldCache:
+    """
+    The most recently used distance fields, by maze contents and set of sources, so that agents steering towards the
+    same sources share one field. Fields of mazes which have changed since they were built are rebuilt.
+    :param max_fields: The number of fields to keep.
+    """
+
+    def __init__(self, max_fields: int = 16):
+        self.max_fields = max_fields
+        self._fields: OrderedDict[tuple[str, frozenset[Position]], DistanceField] = OrderedDict()
+
+    def get(self, maze: Maze, sources: Iterable[Position]) -> DistanceField:
+        """Return the distance field of a maze for the given sources, building it if it is not cached."""
+        sources = tuple(Position(*source) for source in sources)
+        key = maze.content_hash(), frozenset(sources)
+        field = self._fields.get(key)
+        if field is not None and field.is_current():
+            self._fields.move_to_end(key)
+            return field
+
+        field = DistanceField(maze, sources)
+        self._fields[key] = field
+        if len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return field
+
+    def clear(self) -> None:
+        self._fields.clear()
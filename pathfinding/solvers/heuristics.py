@@ -0,0 +1,23 @@
+from collections.abc import Callable
+from math import sqrt
+
+from ..data_structures import Position
+
+Heuristic = Callable[[Position, Position], float]
+"""Estimates the length of the shortest path from a position to a goal. Must never overestimate it."""
+
+
+def manhattan(position: Position, goal: Position) -> float:
+    """Return the number of steps between two positions on an empty 4-connected grid."""
+    return abs(position.row - goal.row) + abs(position.col - goal.col)
+
+
+def octile(position: Position, goal: Position) -> float:
+    """Return the distance between two positions on an empty grid which also allows diagonal steps."""
+    delta_row, delta_col = abs(position.row - goal.row), abs(position.col - goal.col)
+    return max(delta_row, delta_col) + (sqrt(2) - 1) * min(delta_row, delta_col)
+
+
+def zero(position: Position, goal: Position) -> float:
+    """Return 0, which turns A* into Dijkstra's algorithm."""
+    return 0
@@ -0,0 +1,354 @@
+import heapq
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Optional
+
+from ..data_structures import DIRECTIONS, MASK_DIRECTIONS, Position, SolveStep
+from ..maze import Maze
+from .heuristics import manhattan
+from .maze_solver_abc import MazeSolver
+
+_MAX_SINGLE_TRANSITION = 6
+"""Entrances shorter than this get one transition in their middle, longer ones get one at each end."""
+
+
+class ClusterAbstraction:
+    """
+    The abstract graph used by `HPASolver`, precomputed once per maze grid and shared between queries.
+
+    The grid is split into square clusters of `cluster_size` cells. Wherever two neighbouring clusters have open cells
+    facing each other across their border, the run of such cells is an entrance, and one or two pairs of facing cells in
+    it are transitions. The cells of the transitions are the nodes of the abstract graph, identified by flat cell index.
+    Transition pairs are joined by edges of length 1, and the nodes of each cluster by edges weighted with their
+    shortest distance inside the cluster.
+
+    Edits to the grid are picked up by `refresh`, which rebuilds only the clusters whose cells changed.
+    """
+
+    def __init__(self, maze: Maze, cluster_size: int = 16):
+        if cluster_size < 1:
+            raise ValueError("cluster size must be at least 1")
+        self.maze = maze
+        self.cluster_size = cluster_size
+        n_rows, n_cols = maze.grid.dimensions
+        self.n_cluster_rows = -(-n_rows // cluster_size)
+        self.n_cluster_cols = -(-n_cols // cluster_size)
+
+        self.cluster_nodes: defaultdict[int, set[int]] = defaultdict(set)
+        """The abstract nodes of each cluster."""
+        self.intra_edges: dict[int, dict[int, dict[int, int]]] = {}
+        """For each cluster, the distances inside it between every pair of its nodes which are connected."""
+        self.inter_edges: defaultdict[int, set[int]] = defaultdict(set)
+        """For each node, the nodes in neighbouring clusters which it is a transition with."""
+        self._border_transitions: dict[tuple[int, int], list[tuple[int, int]]] = {}
+
+        self._version = maze.grid.version
+        self._snapshot = bytes(maze.grid.cells)
+        self._cluster_masks = self._build_cluster_masks()
+        clusters = range(self.n_cluster_rows * self.n_cluster_cols)
+        for border in {border for cluster in clusters for border in self._borders(cluster)}:
+            self._build_border(border)
+        for cluster in clusters:
+            self._build_intra_edges(cluster)
+
+    def __len__(self) -> int:
+        """Return the number of abstract nodes."""
+        return len(self.inter_edges)
+
+    def cluster_of(self, cell: int) -> int:
+        row, col = divmod(cell, self.maze.grid.n_cols)
+        return row // self.cluster_size * self.n_cluster_cols + col // self.cluster_size
+
+    def cluster_bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """Return the first row, first column, end row and end column of the cells in a cluster."""
+        n_rows, n_cols = self.maze.grid.dimensions
+        cluster_row, cluster_col = divmod(cluster, self.n_cluster_cols)
+        first_row, first_col = cluster_row * self.cluster_size, cluster_col * self.cluster_size
+        end_row, end_col = min(first_row + self.cluster_size, n_rows), min(first_col + self.cluster_size, n_cols)
+        return first_row, first_col, end_row, end_col
+
+    def neighbours(self, node: int) -> Iterator[tuple[int, int]]:
+        """Yield the abstract nodes joined to a node by an edge, with the length of the edge."""
+        for other in self.inter_edges.get(node, ()):
+            yield other, 1
+        yield from self.intra_edges[self.cluster_of(node)].get(node, {}).items()
+
+    def refresh(self) -> set[int]:
+        """
+        Rebuild the parts of the abstraction covering cells which changed since it was built or last refreshed.
+        :return: The clusters whose edges were rebuilt.
+        """
+        grid = self.maze.grid
+        if grid.version == self._version:
+            return set()
+        cells = bytes(grid.cells)
+        n_cols = grid.n_cols
+        band_size = self.cluster_size * n_cols
+
+        changed = set()
+        for band, band_start in enumerate(range(0, len(cells), band_size)):
+            band_end = band_start + band_size
+            if cells[band_start:band_end] == self._snapshot[band_start:band_end]:
+                continue
+            for cluster in range(band * self.n_cluster_cols, (band + 1) * self.n_cluster_cols):
+                if self._cluster_changed(cells, cluster):
+                    changed.add(cluster)
+        self._version, self._snapshot = grid.version, cells
+        self._cluster_masks = self._build_cluster_masks()
+
+        rebuilt = set(changed)
+        for border in {border for cluster in changed for border in self._borders(cluster)}:
+            self._build_border(border)
+            rebuilt.update(border)
+        for cluster in rebuilt:
+            self._build_intra_edges(cluster)
+        return rebuilt
+
+    def _cluster_changed(self, cells: bytes, cluster: int) -> bool:
+        """Return whether any cell of a cluster differs between `cells` and the snapshot of the grid."""
+        n_cols = self.maze.grid.n_cols
+        first_row, first_col, end_row, end_col = self.cluster_bounds(cluster)
+        for row in range(first_row, end_row):
+            start, end = row * n_cols + first_col, row * n_cols + end_col
+            if cells[start:end] != self._snapshot[start:end]:
+                return True
+        return False
+
+    def _build_cluster_masks(self) -> bytearray:
+        # The neighbour masks of the grid, without the bits of moves which cross a cluster border. Rows fall into one of
+        # four kinds, depending on whether they are the first or last row of their cluster, so the masks which keep
+        # the allowed bits can be joined from four precomputed rows and applied with a single big integer operation.
+        n_rows, n_cols = self.maze.grid.dimensions
+        size = self.cluster_size
+        col_bits = bytes(
+            0b0011 | (0 if col % size == 0 else 0b0100) | (0 if col % size == size - 1 else 0b1000)
+            for col in range(n_cols)
+        )
+        row_kinds = [bytes(bits & (0b1100 | row_bits) for bits in col_bits) for row_bits in range(4)]
+        allowed = b"".join(
+            row_kinds[(0 if row % size == 0 else 0b01) | (0 if row % size == size - 1 else 0b10)]
+            for row in range(n_rows)
+        )
+        masks = int.from_bytes(self.maze.neighbours.masks, "little") & int.from_bytes(allowed, "little")
+        return bytearray(masks.to_bytes(n_rows * n_cols, "little"))
+
+    def _borders(self, cluster: int) -> list[tuple[int, int]]:
+        cluster_row, cluster_col = divmod(cluster, self.n_cluster_cols)
+        borders = []
+        if cluster_row > 0:
+            borders.append((cluster - self.n_cluster_cols, cluster))
+        if cluster_row < self.n_cluster_rows - 1:
+            borders.append((cluster, cluster + self.n_cluster_cols))
+        if cluster_col > 0:
+            borders.append((cluster - 1, cluster))
+        if cluster_col < self.n_cluster_cols - 1:
+            borders.append((cluster, cluster + 1))
+        return borders
+
+    def _build_border(self, border: tuple[int, int]) -> None:
+        masks = self.maze.neighbours.masks
+        n_cols = self.maze.grid.n_cols
+        first, second = border
+        first_row, first_col, end_row, end_col = self.cluster_bounds(first)
+        if second == first + 1 and second % self.n_cluster_cols:
+            # The clusters are side by side: the border cells are the last column of the first cluster.
+            direction = 3
+            cells = [row * n_cols + end_col - 1 for row in range(first_row, end_row)]
+        else:
+            direction = 1
+            cells = [(end_row - 1) * n_cols + col for col in range(first_col, end_col)]
+
+        for cell, other in self._border_transitions.get(border, ()):
+            self._remove_transition(cell, other)
+
+        transitions: list[int] = []
+        run: list[int] = []
+        for cell in [*cells, -1]:
+            if cell != -1 and masks[cell] >> direction & 1:
+                run.append(cell)
+                continue
+            if len(run) >= _MAX_SINGLE_TRANSITION:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        offset = self.maze.neighbours.offsets[direction]
+        self._border_transitions[border] = [(cell, cell + offset) for cell in transitions]
+        for cell, other in self._border_transitions[border]:
+            self.inter_edges[cell].add(other)
+            self.inter_edges[other].add(cell)
+            self.cluster_nodes[first].add(cell)
+            self.cluster_nodes[second].add(other)
+
+    def _remove_transition(self, cell: int, other: int) -> None:
+        for node, opposite in ((cell, other), (other, cell)):
+            self.inter_edges[node].discard(opposite)
+            if not self.inter_edges[node]:
+                del self.inter_edges[node]
+                self.cluster_nodes[self.cluster_of(node)].discard(node)
+
+    def _build_intra_edges(self, cluster: int) -> None:
+        # Distances are symmetric, so each search only needs to reach the nodes which have not been searched from yet.
+        nodes = list(self.cluster_nodes[cluster])
+        edges: dict[int, dict[int, int]] = {node: {} for node in nodes}
+        for later_start, node in enumerate(nodes[:-1], 1):
+            later = nodes[later_start:]
+            distances, _ = self.search_cluster(node, later)
+            for other in later:
+                if other in distances:
+                    edges[node][other] = edges[other][node] = distances[other]
+        self.intra_edges[cluster] = edges
+
+    def search_cluster(
+        self, source: int, targets: Optional[Iterable[int]] = None
+    ) -> tuple[dict[int, int], dict[int, int]]:
+        """
+        Run a breadth first search from a cell which never leaves its cluster.
+        :param targets: If given, the search stops as soon as all of these cells have been reached. Otherwise the whole
+            part of the cluster reachable from the source is searched.
+        :return: The distances of the cells reached, and the direction each of them was reached in.
+        """
+        masks, offsets = self._cluster_masks, self.maze.neighbours.offsets
+        distances = {source: 0}
+        parent_directions: dict[int, int] = {}
+        exhaustive = targets is None
+        remaining = set() if targets is None else set(targets) - {source}
+        queue: deque[int] = deque([source])
+        while queue and (exhaustive or remaining):
+            cell = queue.popleft()
+            next_distance = distances[cell] + 1
+            for direction in MASK_DIRECTIONS[masks[cell]]:
+                neighbour = cell + offsets[direction]
+                if neighbour in distances:
+                    continue
+                distances[neighbour] = next_distance
+                parent_directions[neighbour] = direction
+                queue.append(neighbour)
+                remaining.discard(neighbour)
+        return distances, parent_directions
+
+
+class HPASolver(MazeSolver):
+    """
+    Hierarchical path-finding A* (HPA*), for answering many queries on one large maze.
+
+    The entry and exit points are joined to the nodes of their clusters in a precomputed `ClusterAbstraction`, and A* is
+    run on the resulting small abstract graph. The abstract path is then refined into steps one segment at a time, by a
+    search limited to the cluster of each segment.
+
+    Paths always exist when the exit is reachable, but are only near-optimal, as they must pass through transitions.
+    :param abstraction: An abstraction of the maze's grid to reuse, which is refreshed first if the grid has changed. A
+        new one is built if not given.
+    :param cluster_size: The cluster size of the abstraction built when none is given.
+    """
+
+    reports_counters = True
+
+    def __init__(self, maze: Maze, abstraction: Optional[ClusterAbstraction] = None, cluster_size: int = 16):
+        super().__init__(maze)
+        if abstraction is None:
+            abstraction = ClusterAbstraction(maze, cluster_size)
+        elif abstraction.maze.grid is not maze.grid:
+            raise ValueError("abstraction was not built for the grid of this maze")
+        self.abstraction = abstraction
+
+    def prepare(self) -> None:
+        self.abstraction.refresh()
+
+    def solve(self) -> Iterable[Position]:
+        """
+        Returns an iterable of the positions of abstract nodes as they are expanded by the solver.
+
+        Sets the `shortest_distances` attribute to the distances of the expanded nodes along the abstract graph, and
+        the `abstract_path` attribute to the positions of the nodes on the path found.
+        """
+        abstraction, grid = self.abstraction, self.maze.grid
+        abstraction.refresh()
+        source, target = grid.index(*self.maze.entry_point), grid.index(*self.maze.exit_point)
+        goal = self.maze.exit_point
+
+        # Edges joining the entry and exit points to the nodes of their clusters, and to each other.
+        extra_edges: defaultdict[int, dict[int, int]] = defaultdict(dict)
+        for endpoint in (source, target):
+            nodes = abstraction.cluster_nodes[abstraction.cluster_of(endpoint)] | {source, target}
+            reached, _ = abstraction.search_cluster(endpoint, nodes)
+            for node, distance in reached.items():
+                if node in nodes and node != endpoint:
+                    extra_edges[endpoint][node] = extra_edges[node][endpoint] = distance
+
+        distances: dict[int, float] = {source: 0}
+        self.shortest_distances: defaultdict[Position, float] = defaultdict(lambda: float("inf"))
+        self.abstract_path: list[Position] = []
+        self._parents: dict[int, int] = {}
+        self._target_reached = False
+        expanded: set[int] = set()
+        open_set: list[tuple[float, float, int]] = [(0, 0, source)]
+        counters = self.counters
+        counting = counters.enabled
+        if counting:
+            counters.push()
+
+        while open_set:
+            node = heapq.heappop(open_set)[2]
+            if counting:
+                counters.pops += 1
+            if node in expanded:
+                continue
+            expanded.add(node)
+            position = grid.position_of(node)
+            self.shortest_distances[position] = distances[node]
+            yield position
+
+            if node == target:
+                self._target_reached = True
+                break
+
+            edges = abstraction.neighbours(node) if node in abstraction.inter_edges else iter(())
+            for other, length in (*edges, *extra_edges.get(node, {}).items()):
+                new_distance = distances[node] + length
+                if new_distance < distances.get(other, float("inf")):
+                    estimate = manhattan(grid.position_of(other), goal)
+                    heapq.heappush(open_set, (new_distance + estimate, estimate, other))
+                    distances[other] = new_distance
+                    self._parents[other] = node
+                    if counting:
+                        counters.relaxations += 1
+                        counters.push()
+
+        if self._target_reached:
+            node = target
+            self.abstract_path = [grid.position_of(node)]
+            while node != source:
+                node = self._parents[node]
+                self.abstract_path.append(grid.position_of(node))
+            self.abstract_path.reverse()
+        self._completed = True
+
+    def refined_steps(self) -> Iterator[list[SolveStep]]:
+        """Yield the steps of the path found one abstract edge at a time, refining each segment only when requested."""
+        if not self._completed:
+            raise RuntimeError("solve method was not called")
+
+        if not self._target_reached:
+            raise ValueError("exit point is not reachable from the entry point")
+
+        abstraction, grid = self.abstraction, self.maze.grid
+        offsets = self.maze.neighbours.offsets
+        for start, end in zip(self.abstract_path, self.abstract_path[1:]):
+            start_cell, end_cell = grid.index(*start), grid.index(*end)
+            if abstraction.cluster_of(start_cell) != abstraction.cluster_of(end_cell):
+                yield [DIRECTIONS[offsets.index(end_cell - start_cell)]]
+                continue
+
+            _, parent_directions = abstraction.search_cluster(start_cell, (end_cell,))
+            steps: deque[SolveStep] = deque([])
+            current = end_cell
+            while current != start_cell:
+                direction = parent_directions[current]
+                steps.appendleft(DIRECTIONS[direction])
+                current -= offsets[direction]
+            yield list(steps)
+
+    def get_shortest_path(self) -> Sequence[SolveStep]:
+        return [step for segment in self.refined_steps() for step in segment]
@@ -0,0 +1,77 @@
+"""
+Statistics and observers for profiling solvers, see `MazeSolver.profile`.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..data_structures import Position
+
+PHASES = ("graph_build", "search", "path_reconstruction")
+"""The phases of a profiled solve, in the order they run."""
+
+
+class SearchCounters:
+    """
+    Counts of the work done by a search, updated by solvers from their own loops while `MazeSolver.profile` runs.
+
+    Solvers read `enabled` into a local once per search and only touch the counters when it is set, so the disabled
+    `NO_COUNTERS` they hold the rest of the time costs one test of a local per operation. The frontier is every entry
+    pushed and not yet popped, so its size is `pushes - pops`, including stale entries left behind by lazy deletion.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.relaxations = self.pushes = self.pops = self.decrease_keys = self.max_frontier = 0
+
+    def push(self) -> None:
+        self.pushes += 1
+        if self.pushes - self.pops > self.max_frontier:
+            self.max_frontier = self.pushes - self.pops
+
+
+NO_COUNTERS = SearchCounters(enabled=False)
+"""The counters of a solver which is not being profiled."""
+
+
+@dataclass
+class SolverStats:
+    """
+    What a solver did to answer one query.
+
+    The frontier counts are reported by `AStarSolver`, `BFSSolver`, `DijkstraSolver`, `JPSSolver` and `HPASolver`, and
+    are None for the other solvers. Solvers which keep their frontier in a binary heap with lazy deletion, such as
+    `AStarSolver` without a `queue_factory`, push again instead of decreasing keys, so `decrease_keys` is 0 for them,
+    as it is for the queues of `BFSSolver`. `HPASolver` counts its search of the abstract graph, not the searches inside
+    clusters which join the endpoints to it.
+    """
+
+    solver: str
+    expanded: int = 0
+    """The number of positions yielded by `solve`."""
+    relaxations: Optional[int] = None
+    """The number of moves which lowered the distance of the cell they reached."""
+    pushes: Optional[int] = None
+    pops: Optional[int] = None
+    decrease_keys: Optional[int] = None
+    max_frontier: Optional[int] = None
+    """The largest number of elements held by the frontier queues at once."""
+    path_length: Optional[int] = None
+    """The number of steps of the shortest path, or None if there is none."""
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+    """The time spent in each of `PHASES`."""
+
+
+class SolverObserver:
+    """
+    Receives events from `MazeSolver.profile`. Every method does nothing by default, and positions are only passed to
+    `on_expand` when a subclass overrides it, so observers which only need the totals do not slow down the search.
+    """
+
+    def on_phase(self, phase: str, seconds: float) -> None:
+        """Called at the end of each of `PHASES` with the time it took."""
+
+    def on_expand(self, position: Position) -> None:
+        """Called with every position yielded by `solve`."""
+
+    def on_finish(self, stats: SolverStats) -> None:
+        """Called once with the complete statistics."""
@@ -0,0 +1,146 @@
+import heapq
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+
+from ..data_structures import DIRECTIONS, MASK_DIRECTIONS, Position, SolveStep
+from ..maze import Maze
+from .heuristics import Heuristic, manhattan
+from .maze_solver_abc import MazeSolver
+
+_UP, _DOWN, _LEFT, _RIGHT = range(4)
+_VERTICAL_BITS = 1 << _UP | 1 << _DOWN
+_HORIZONTAL_BITS = 1 << _LEFT | 1 << _RIGHT
+_PRUNED_DIRECTIONS = ((_LEFT, _RIGHT, _UP), (_LEFT, _RIGHT, _DOWN), (_UP, _DOWN, _LEFT), (_UP, _DOWN, _RIGHT))
+"""The directions worth searching from a jump point, given the direction it was reached in."""
+
+
+class JPSSolver(MazeSolver):
+    """
+    Jump Point Search for 4-connected grids, an A* search which only adds jump points to the open set.
+
+    From each expanded jump point, the search runs in a straight line in every direction worth searching, passing over
+    cells whose neighbours can be reached at least as cheaply through some other path, until it reaches a jump point:
+    the exit point, a cell with a forced neighbour (an open side cell whose counterpart behind it is a wall), or, when
+    running vertically, a cell from which a horizontal run reaches a jump point. Only the directions ahead and to the
+    sides are searched from a jump point, never the one back.
+
+    The number of cells visited by the straight runs without being added to the open set is kept in the `pruned_nodes`
+    attribute; cells visited by several runs are counted once per run.
+    :param heuristic: Estimates the remaining distance to the exit point, see `AStarSolver`.
+    """
+
+    reports_counters = True
+
+    def __init__(self, maze: Maze, heuristic: Heuristic = manhattan):
+        super().__init__(maze)
+        self.heuristic = heuristic
+
+    def solve(self) -> Iterable[Position]:
+        """
+        Returns an iterable of the positions of jump points as they are expanded by the solver.
+
+        Sets the `shortest_distances` attribute to the shortest distances of the expanded jump points.
+        """
+        grid = self.maze.grid
+        masks, offsets = self.maze.neighbours.masks, self.maze.neighbours.offsets
+        goal = self.maze.exit_point
+        source, target = grid.index(*self.maze.entry_point), grid.index(*goal)
+        scanned = 0
+
+        def jump_horizontal(cell: int, direction: int) -> int:
+            nonlocal scanned
+            while True:
+                scanned += 1
+                mask = masks[cell]
+                if cell == target or mask & ~masks[cell - offsets[direction]] & _VERTICAL_BITS:
+                    return cell
+                if not mask >> direction & 1:
+                    return -1
+                cell += offsets[direction]
+
+        def jump(cell: int, direction: int) -> int:
+            if direction in (_LEFT, _RIGHT):
+                return jump_horizontal(cell, direction)
+            nonlocal scanned
+            while True:
+                scanned += 1
+                mask = masks[cell]
+                if cell == target or mask & ~masks[cell - offsets[direction]] & _HORIZONTAL_BITS:
+                    return cell
+                for side in (_LEFT, _RIGHT):
+                    if mask >> side & 1 and jump_horizontal(cell + offsets[side], side) != -1:
+                        return cell
+                if not mask >> direction & 1:
+                    return -1
+                cell += offsets[direction]
+
+        distances: dict[int, float] = {source: 0}
+        self.shortest_distances: defaultdict[Position, float] = defaultdict(lambda: float("inf"))
+        self._parent_moves: dict[int, tuple[int, int]] = {}
+        self._target_reached = False
+        self.pruned_nodes = 0
+        expanded: set[int] = set()
+        pushed = 1
+
+        source_estimate = self.heuristic(self.maze.entry_point, goal)
+        open_set: list[tuple[float, float, int]] = [(source_estimate, source_estimate, source)]
+        counters = self.counters
+        counting = counters.enabled
+        if counting:
+            counters.push()
+
+        while open_set:
+            index = heapq.heappop(open_set)[2]
+            if counting:
+                counters.pops += 1
+            if index in expanded:
+                continue
+            expanded.add(index)
+            position = grid.position_of(index)
+            self.shortest_distances[position] = distances[index]
+            self.pruned_nodes = scanned - (pushed - 1)
+            yield position
+
+            if index == target:
+                self._target_reached = True
+                break
+
+            parent_move = self._parent_moves.get(index)
+            directions = MASK_DIRECTIONS[masks[index]] if parent_move is None else _PRUNED_DIRECTIONS[parent_move[1]]
+            for direction in directions:
+                if not masks[index] >> direction & 1:
+                    continue
+                jump_point = jump(index + offsets[direction], direction)
+                if jump_point == -1:
+                    continue
+
+                new_distance = distances[index] + abs(jump_point - index) // abs(offsets[direction])
+                if new_distance < distances.get(jump_point, float("inf")):
+                    estimate = self.heuristic(grid.position_of(jump_point), goal)
+                    heapq.heappush(open_set, (new_distance + estimate, estimate, jump_point))
+                    distances[jump_point] = new_distance
+                    self._parent_moves[jump_point] = index, direction
+                    pushed += 1
+                    if counting:
+                        counters.relaxations += 1
+                        counters.push()
+
+        self.pruned_nodes = scanned - (pushed - 1)
+        self._completed = True
+
+    def get_shortest_path(self) -> Sequence[SolveStep]:
+        if not self._completed:
+            raise RuntimeError("solve method was not called")
+
+        if not self._target_reached:
+            raise ValueError("exit point is not reachable from the entry point")
+
+        offsets = self.maze.neighbours.offsets
+        current = self.maze.grid.index(*self.maze.exit_point)
+        runs = []
+        while current in self._parent_moves:
+            parent, direction = self._parent_moves[current]
+            runs.append([DIRECTIONS[direction]] * (abs(current - parent) // abs(offsets[direction])))
+            current = parent
+
+        return [step for run in reversed(runs) for step in run]
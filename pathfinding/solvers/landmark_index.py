@@ -0,0 +1,264 @@
+"""
+A distance index over the corridor graph of a maze, for answering many distance queries between its open cells.
+"""
+import heapq
+import struct
+from array import array
+from os import PathLike
+from typing import Any, Optional, Union
+
+from .._byteorder import little_endian
+from ..data_structures import CorridorGraph, Position
+from ..maze import Maze
+from .heuristics import manhattan
+
+MAGIC = b"PFLM"
+VERSION = 1
+HEADER = struct.Struct("<4sH16sQQQ")
+"""Magic bytes, format version, content hash of the maze, number of vertices, number of landmarks, table size."""
+
+_MAX_CACHED_CELLS = 1 << 16
+
+
+def _vertex_distances(corridors: CorridorGraph, vertex_ids: dict[int, int], source: int) -> "array[float]":
+    """Return the shortest distances from one vertex of a corridor graph to all of its vertices, by vertex id."""
+    edge_lengths = corridors.edge_lengths
+    distances = array("d", [float("inf")]) * len(vertex_ids)
+    distances[vertex_ids[source]] = 0
+    open_set: list[tuple[float, int]] = [(0, source)]
+    while open_set:
+        distance, vertex = heapq.heappop(open_set)
+        if distance > distances[vertex_ids[vertex]]:
+            continue
+        for edge in corridors.incident_edges(vertex):
+            if edge == -1:
+                continue
+            other_end = corridors.other_end(edge, vertex)
+            new_distance = distance + edge_lengths[edge]
+            if new_distance < distances[vertex_ids[other_end]]:
+                distances[vertex_ids[other_end]] = new_distance
+                heapq.heappush(open_set, (new_distance, other_end))
+    return distances
+
+
+class LandmarkIndex:
+    """
+    Landmark (ALT) lower bounds and, for small graphs, exact distances between the open cells of a maze.
+
+    The index is built on the corridor graph of the maze (see `Maze.corridors`), the contracted graph behind
+    `Maze.to_graph`. `n_landmarks` vertices are chosen by farthest-point selection, each as far as possible from those
+    already chosen, and the distances from each landmark to every vertex are stored. By the triangle inequality,
+    `|d(L, a) - d(L, b)|` never exceeds `d(a, b)` for any landmark `L`, which gives a consistent A* heuristic that is
+    much tighter than the Manhattan distance in mazes with long detours.
+
+    When the graph has at most `max_table_entries` pairs of vertices, the distances between all of them are stored too,
+    and `distance` answers queries by table lookup. Otherwise it runs an A* search over the graph guided by the
+    landmarks.
+
+    The index describes the maze at the time it was built; it must be rebuilt after the maze changes.
+    """
+
+    def __init__(self, maze: Maze, n_landmarks: int = 8, max_table_entries: int = 1 << 22):
+        self.maze = maze
+        self.content_hash = maze.content_hash()
+        corridors = maze.corridors
+        self.vertices = array("q", sorted(corridors.vertices))
+        self._vertex_ids = {vertex: vertex_id for vertex_id, vertex in enumerate(self.vertices)}
+
+        self.landmarks = array("q")
+        self.landmark_distances: list[array[float]] = []
+        # The distance from each vertex to its closest landmark. The first landmark is the vertex farthest from an
+        # arbitrary vertex. Unreachable vertices count as farthest, so every component of the graph gets a landmark.
+        closest = _vertex_distances(corridors, self._vertex_ids, self.vertices[0]) if self.vertices else array("d")
+        for _ in range(min(n_landmarks, len(self.vertices))):
+            landmark = self.vertices[max(range(len(closest)), key=closest.__getitem__)]
+            distances = _vertex_distances(corridors, self._vertex_ids, landmark)
+            closest = array("d", map(min, closest, distances)) if self.landmarks else distances
+            self.landmarks.append(landmark)
+            self.landmark_distances.append(distances)
+
+        self.distance_table: Optional[array[float]] = None
+        if len(self.vertices) ** 2 <= max_table_entries:
+            self.distance_table = array("d")
+            for vertex in self.vertices:
+                self.distance_table.extend(_vertex_distances(corridors, self._vertex_ids, vertex))
+
+        self._cell_bounds: dict[int, tuple[float, ...]] = {}
+
+    def _attachments(self, cell: int, other: int = -1) -> list[tuple[int, int]]:
+        """Return the vertices (or `other`) reached from a cell by walking its corridor, with their distances."""
+        if cell in self._vertex_ids:
+            return [(cell, 0)]
+        return [(end, length) for _, end, _, length in self.maze.corridors.attach(cell, stop=(other,))]
+
+    def _landmark_distances(self, cell: int) -> tuple[float, ...]:
+        bounds = self._cell_bounds.get(cell)
+        if bounds is None:
+            attachments = self._attachments(cell)
+            bounds = tuple(
+                min((length + distances[self._vertex_ids[end]] for end, length in attachments), default=float("nan"))
+                for distances in self.landmark_distances
+            )
+            if len(self._cell_bounds) >= _MAX_CACHED_CELLS:
+                self._cell_bounds.clear()
+            self._cell_bounds[cell] = bounds
+        return bounds
+
+    def lower_bound(self, source: Position, target: Position) -> float:
+        """
+        Return a lower bound on the length of the shortest path between two open cells, which is infinite if there is
+        no path between them.
+        """
+        index = self.maze.grid.index
+        bound = float(manhattan(source, target))
+        for source_distance, target_distance in zip(
+            self._landmark_distances(index(*source)), self._landmark_distances(index(*target))
+        ):
+            # NaN marks cells on closed loops, which are not part of the graph and have no landmark distances.
+            if source_distance != source_distance or target_distance != target_distance:
+                break
+            if source_distance == float("inf") and target_distance == float("inf"):
+                continue
+            bound = max(bound, abs(source_distance - target_distance))
+        return bound
+
+    def heuristic(self, position: Position, goal: Position) -> float:
+        """A consistent A* heuristic, see `Heuristic`, combining the landmark bounds with the Manhattan distance."""
+        return self.lower_bound(position, goal)
+
+    def distance(self, source: Position, target: Position) -> float:
+        """
+        Return the length of the shortest path between two open cells, or infinity if there is none.
+        :raises:
+            ValueError: If the maze has changed since the index was built
+        """
+        if self.maze.content_hash() != self.content_hash:
+            raise ValueError("maze has changed since the index was built")
+        if source == target:
+            return 0
+        index = self.maze.grid.index
+        if self.distance_table is None:
+            return self._search(index(*source), index(*target))
+
+        source_cell, target_cell = index(*source), index(*target)
+        best = float("inf")
+        target_attachments = self._attachments(target_cell, source_cell)
+        for source_end, source_length in self._attachments(source_cell, target_cell):
+            if source_end == target_cell:
+                best = min(best, source_length)
+            if source_end not in self._vertex_ids:
+                continue
+            row = self._vertex_ids[source_end] * len(self.vertices)
+            for target_end, target_length in target_attachments:
+                if target_end in self._vertex_ids:
+                    distance = self.distance_table[row + self._vertex_ids[target_end]]
+                    best = min(best, source_length + distance + target_length)
+        return best
+
+    def _search(self, source_cell: int, target_cell: int) -> float:
+        # A* over the vertices of the corridor graph, started from the ends of the source's corridor and finished at the
+        # ends of the target's, with the landmark bounds of each vertex read straight from the distance arrays.
+        corridors, vertex_ids = self.maze.corridors, self._vertex_ids
+        target_bounds = self._landmark_distances(target_cell)
+
+        def estimate(vertex: int) -> float:
+            vertex_id = vertex_ids[vertex]
+            bound = 0.0
+            for distances, target_distance in zip(self.landmark_distances, target_bounds):
+                if distances[vertex_id] != target_distance:
+                    bound = max(bound, abs(distances[vertex_id] - target_distance))
+            return bound
+
+        best = float("inf")
+        into_target: dict[int, int] = {}
+        for end, length in self._attachments(target_cell, source_cell):
+            if end in vertex_ids:
+                into_target[end] = min(into_target.get(end, length), length)
+
+        distances: dict[int, float] = {}
+        open_set: list[tuple[float, float, int]] = []
+        for end, length in self._attachments(source_cell, target_cell):
+            if end == target_cell:
+                best = min(best, length)
+            if end in vertex_ids and length < distances.get(end, float("inf")):
+                distances[end] = length
+                heapq.heappush(open_set, (length + estimate(end), length, end))
+
+        while open_set:
+            estimated, distance, vertex = heapq.heappop(open_set)
+            if estimated >= best:
+                break
+            if distance > distances[vertex]:
+                continue
+            if vertex in into_target:
+                best = min(best, distance + into_target[vertex])
+            for edge in corridors.incident_edges(vertex):
+                if edge == -1:
+                    continue
+                other_end = corridors.other_end(edge, vertex)
+                new_distance = distance + corridors.edge_lengths[edge]
+                if new_distance < distances.get(other_end, float("inf")):
+                    distances[other_end] = new_distance
+                    bound = estimate(other_end)
+                    if bound != float("inf"):
+                        heapq.heappush(open_set, (new_distance + bound, new_distance, other_end))
+        return best
+
+    def save(self, path: Union[str, PathLike[str]]) -> None:
+        """Write the index to a file, to be read back by `load`."""
+        table = self.distance_table if self.distance_table is not None else array("d")
+        with open(path, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    bytes.fromhex(self.content_hash),
+                    len(self.vertices),
+                    len(self.landmarks),
+                    len(table),
+                )
+            )
+            tables: list["array[Any]"] = [self.vertices, self.landmarks, *self.landmark_distances, table]
+            for values in tables:
+                file.write(little_endian(array(values.typecode, values)).tobytes())
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike[str]], maze: Maze) -> "LandmarkIndex":
+        """
+        Read an index written by `save` for the given maze.
+        :raises:
+            ValueError: If the file is not an index file of a supported version, or was built for a different maze
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < HEADER.size:
+            raise ValueError("not a landmark index file")
+        magic, version, content_hash, n_vertices, n_landmarks, table_size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a landmark index file")
+        if version != VERSION:
+            raise ValueError(f"unsupported landmark index version {version}")
+        if content_hash.hex() != maze.content_hash():
+            raise ValueError("landmark index was built for a different maze")
+        if len(data) != HEADER.size + 8 * (n_vertices + n_landmarks + n_landmarks * n_vertices + table_size):
+            raise ValueError("corrupt landmark index file")
+
+        offset = HEADER.size
+
+        def read(typecode: str, length: int) -> "array[Any]":
+            nonlocal offset
+            start, offset = offset, offset + 8 * length
+            values = array(typecode)
+            values.frombytes(data[start:offset])
+            return little_endian(values)
+
+        index = cls.__new__(cls)
+        index.maze = maze
+        index.content_hash = content_hash.hex()
+        index.vertices = read("q", n_vertices)
+        index._vertex_ids = {vertex: vertex_id for vertex_id, vertex in enumerate(index.vertices)}
+        index.landmarks = read("q", n_landmarks)
+        index.landmark_distances = [read("d", n_vertices) for _ in range(n_landmarks)]
+        index.distance_table = read("d", table_size) if table_size else None
+        index._cell_bounds = {}
+        return index
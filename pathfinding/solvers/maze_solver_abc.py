@@ -1,14 +1,25 @@
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import ClassVar, Optional
 
 from ..data_structures import Position, SolveStep
 from ..maze import Maze
+from .budget import Budget, SearchProgress
+from .heuristics import manhattan
+from .instrumentation import NO_COUNTERS, SearchCounters, SolverObserver, SolverStats
 
 
 class MazeSolver(ABC):
+    reports_counters: ClassVar[bool] = False
+    """Whether `solve` updates `counters`, so that `profile` reports the work done on the frontier."""
+
     def __init__(self, maze: Maze):
         self.maze = maze
+        self.counters: SearchCounters = NO_COUNTERS
         self._completed = False
+        self._search: Optional[Iterator[Position]] = None
+        self._closest: Optional[Position] = None
 
     @abstractmethod
     def solve(self) -> Iterable[Position]:
@@ -24,3 +35,117 @@ class MazeSolver(ABC):
         """
         Returns the sequence of `SolveStep`s representing the shortest path from the entry point to the exit point.
         """
+
+    def get_path_to(self, position: Position) -> Optional[Sequence[SolveStep]]:
+        """
+        Returns the steps of the shortest path found from the entry point to a position expanded by `solve`, which may
+        still be running, or None if the position was not reached from the entry point or the solver does not keep
+        the paths to the positions it expands.
+        """
+        return None
+
+    def _reached_from_entry(self, position: Position) -> bool:
+        """Returns whether an expanded position was reached from the entry point, rather than e.g. from the exit."""
+        return True
+
+    def solve_within(self, budget: Budget) -> SearchProgress:
+        """
+        Runs `solve` until it finishes or the budget runs out, and returns the best result found so far.
+
+        The search is paused rather than abandoned, and the next call resumes it from where it stopped with a new
+        budget, so a search can be spread over several calls. Once it is complete, `get_shortest_path` can be called as
+        usual.
+        """
+        if self._search is None:
+            self._search = iter(self.solve())
+        search, goal = self._search, self.maze.exit_point
+        max_expansions, deadline, cancellation = budget.max_expansions, budget.deadline, budget.cancellation
+        closest_estimate = float("inf") if self._closest is None else manhattan(self._closest, goal)
+
+        expanded = 0
+        stopped_by = None
+        while True:
+            if max_expansions is not None and expanded >= max_expansions:
+                stopped_by = "expansions"
+            elif deadline is not None and time.monotonic() >= deadline:
+                stopped_by = "deadline"
+            elif cancellation is not None and cancellation.is_set():
+                stopped_by = "cancellation"
+            if stopped_by is not None:
+                break
+            position = next(search, None)
+            if position is None:
+                break
+            expanded += 1
+            estimate = manhattan(position, goal)
+            if estimate < closest_estimate and self._reached_from_entry(position):
+                self._closest, closest_estimate = position, estimate
+
+        if stopped_by is None:
+            try:
+                return SearchProgress(True, None, expanded, goal, list(self.get_shortest_path()))
+            except ValueError:
+                pass
+        path = None if self._closest is None else self.get_path_to(self._closest)
+        return SearchProgress(
+            stopped_by is None, stopped_by, expanded, self._closest, None if path is None else list(path)
+        )
+
+    def prepare(self) -> None:
+        """
+        Build the structures derived from the maze which `solve` searches. They are cached by the maze, so this costs
+        nothing once they are built, and calling it is optional.
+        """
+        self.maze.neighbours
+
+    def profile(self, *observers: SolverObserver) -> SolverStats:
+        """
+        Solve the maze and find the shortest path, timing `prepare`, `solve` and `get_shortest_path` and counting the
+        work done by the search, and report to the observers on the way.
+
+        The counts of `SolverStats` are collected by the solver's own loop, through the `counters` it holds during the
+        search, and are None for solvers which do not report them. Solving without `profile` costs nothing extra.
+        """
+        stats = SolverStats(type(self).__name__)
+        on_expand = [
+            observer.on_expand for observer in observers if type(observer).on_expand is not SolverObserver.on_expand
+        ]
+
+        def timed(phase: str, function: Callable[[], None]) -> None:
+            start = time.perf_counter()
+            try:
+                function()
+            finally:
+                stats.phase_seconds[phase] = seconds = time.perf_counter() - start
+                for observer in observers:
+                    observer.on_phase(phase, seconds)
+
+        def search() -> None:
+            if not on_expand:
+                stats.expanded = sum(1 for _ in self.solve())
+                return
+            for position in self.solve():
+                stats.expanded += 1
+                for callback in on_expand:
+                    callback(position)
+
+        def shortest_path() -> None:
+            try:
+                stats.path_length = len(self.get_shortest_path())
+            except ValueError:
+                stats.path_length = None
+
+        timed("graph_build", self.prepare)
+        counters = self.counters = SearchCounters()
+        try:
+            timed("search", search)
+        finally:
+            self.counters = NO_COUNTERS
+        timed("path_reconstruction", shortest_path)
+
+        if self.reports_counters:
+            stats.relaxations, stats.pushes, stats.pops = counters.relaxations, counters.pushes, counters.pops
+            stats.decrease_keys, stats.max_frontier = counters.decrease_keys, counters.max_frontier
+        for observer in observers:
+            observer.on_finish(stats)
+        return stats
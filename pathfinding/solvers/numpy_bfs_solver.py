@@ -0,0 +1,89 @@
+from collections import deque
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from ..data_structures import DIRECTIONS, CompactGrid, Grid, Position, SolveStep
+from ..maze import CELL_STATES, CellState
+from .maze_solver_abc import MazeSolver
+
+
+class NumpyBFSSolver(MazeSolver):
+    """
+    A breadth first search which advances a whole level at a time with NumPy array operations, for open maps with
+    large rooms where the per-cell overhead of `BFSSolver` dominates. Requires NumPy to be installed.
+
+    The open cells not reached yet are kept as a flat boolean mask of the grid, and each level as a sorted array of flat
+    cell indices. The next level is the current one shifted one step in each direction, dropping shifts which leave the
+    grid, filtered through the mask. Each level costs time proportional to its size rather than to the whole grid.
+    """
+
+    def prepare(self) -> None:
+        # The search works on the cells of the grid directly.
+        pass
+
+    def solve(self) -> Iterable[Position]:
+        """
+        Returns an iterable of positions as they are explored by the solver, one level at a time.
+
+        Sets the `shortest_distances` attribute to the distances of all cells from the entry point, backed by a NumPy
+        array, with unreachable cells and walls at infinity.
+        """
+        import numpy as np
+
+        grid = self.maze.grid
+        if grid.values is not CELL_STATES:
+            grid = CompactGrid.from_grid(grid, CELL_STATES)
+        n_cols = grid.n_cols
+        unreached = grid.to_numpy().reshape(-1) == CELL_STATES.index(CellState.EMPTY)
+
+        self._distances = distances = np.full(unreached.shape, np.inf)
+        self.shortest_distances: Grid[float] = CompactGrid(grid.dimensions, distances)
+
+        frontier = np.array([grid.index(*self.maze.entry_point)])
+        unreached[frontier] = False
+        level = 0
+
+        while len(frontier):
+            distances[frontier] = level
+            frontier_rows, frontier_cols = np.divmod(frontier, n_cols)
+            yield from map(Position, frontier_rows.tolist(), frontier_cols.tolist())
+
+            reached = np.concatenate(
+                (
+                    frontier[frontier >= n_cols] - n_cols,
+                    frontier[frontier < len(unreached) - n_cols] + n_cols,
+                    frontier[frontier_cols != 0] - 1,
+                    frontier[frontier_cols != n_cols - 1] + 1,
+                )
+            )
+            frontier = np.unique(reached[unreached[reached]])
+            unreached[frontier] = False
+            level += 1
+
+        self._completed = True
+
+    def get_shortest_path(self) -> Sequence[SolveStep]:
+        if not self._completed:
+            raise RuntimeError("solve method was not called")
+
+        n_rows, n_cols = self.maze.grid.dimensions
+        distances: Any = self._distances.reshape(n_rows, n_cols)
+        row, col = self.maze.exit_point
+        distance = distances[row, col]
+        if distance == float("inf"):
+            raise ValueError("exit point is not reachable from the entry point")
+
+        steps: deque[SolveStep] = deque([])
+        while distance:
+            for direction, (delta_row, delta_col) in enumerate(DIRECTIONS):
+                previous_row, previous_col = row + delta_row, col + delta_col
+                if (
+                    0 <= previous_row < n_rows
+                    and 0 <= previous_col < n_cols
+                    and distances[previous_row, previous_col] == distance - 1
+                ):
+                    break
+            steps.appendleft(DIRECTIONS[direction ^ 1])
+            row, col, distance = previous_row, previous_col, distance - 1
+
+        return steps
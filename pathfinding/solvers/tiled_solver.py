@@ -0,0 +1,96 @@
+import heapq
+from collections.abc import Iterable, Sequence
+
+from ..data_structures import DIRECTIONS, Position, SolveStep, TiledGrid
+from ..maze import CELL_STATES, CellState
+from .heuristics import Heuristic, manhattan
+
+
+class TiledAStarSolver:
+    """
+    A* over a maze stored in a `TiledGrid`, for mazes too large to load into memory.
+
+    Cells are read through the grid's tile cache as the search reaches them, so only the tiles around the explored
+    region are paged in, and the search crosses tile boundaries like any other step. Distances and parents are kept in
+    dicts, so the memory used grows with the number of cells reached rather than the size of the maze. The grid's
+    `hits`, `misses` and `evictions` counters show how well its `max_tiles` fits the search.
+
+    This does not derive from `MazeSolver`, whose solvers search a `Maze`, which holds its whole grid in memory.
+    :param heuristic: Estimates the remaining distance to the exit point, see `AStarSolver`. With `zero`, cells are
+        expanded in breadth first order.
+    :raises:
+        ValueError: If the entry point or exit point is not an open cell of the grid
+    """
+
+    def __init__(
+        self,
+        grid: TiledGrid[CellState],
+        entry_point: Position,
+        exit_point: Position,
+        heuristic: Heuristic = manhattan,
+    ):
+        self.grid = grid
+        self.entry_point = Position(*entry_point)
+        self.exit_point = Position(*exit_point)
+        self.heuristic = heuristic
+        for name, position in (("entry", self.entry_point), ("exit", self.exit_point)):
+            if grid[position] != CellState.EMPTY:
+                raise ValueError(f"{name} point at row: {position.row}, col: {position.col} is not an open cell")
+        self._completed = False
+
+    def solve(self) -> Iterable[Position]:
+        """Returns an iterable of positions as they are expanded by the solver."""
+        grid, goal = self.grid, self.exit_point
+        n_rows, n_cols = grid.dimensions
+        code_at, empty = grid.code_at, CELL_STATES.index(CellState.EMPTY)
+
+        source = self.entry_point.row * n_cols + self.entry_point.col
+        target = goal.row * n_cols + goal.col
+        distances = {source: 0}
+        self._parent_directions: dict[int, int] = {}
+        self._completed = False
+        expanded: set[int] = set()
+
+        source_estimate = self.heuristic(self.entry_point, goal)
+        open_set: list[tuple[float, float, int]] = [(source_estimate, source_estimate, source)]
+        while open_set:
+            index = heapq.heappop(open_set)[2]
+            if index in expanded:
+                continue
+            expanded.add(index)
+            row, col = divmod(index, n_cols)
+            yield Position(row, col)
+
+            if index == target:
+                break
+
+            next_distance = distances[index] + 1
+            for direction, (row_step, col_step) in enumerate(DIRECTIONS):
+                next_row, next_col = row + row_step, col + col_step
+                if not (0 <= next_row < n_rows and 0 <= next_col < n_cols) or code_at(next_row, next_col) != empty:
+                    continue
+                neighbour = next_row * n_cols + next_col
+                if next_distance < distances.get(neighbour, float("inf")):
+                    estimate = self.heuristic(Position(next_row, next_col), goal)
+                    heapq.heappush(open_set, (next_distance + estimate, estimate, neighbour))
+                    distances[neighbour] = next_distance
+                    self._parent_directions[neighbour] = direction
+        self._completed = True
+
+    def get_shortest_path(self) -> Sequence[SolveStep]:
+        if not self._completed:
+            raise RuntimeError("solve method was not called")
+
+        n_cols = self.grid.dimensions[1]
+        current = self.exit_point.row * n_cols + self.exit_point.col
+        source = self.entry_point.row * n_cols + self.entry_point.col
+        if current != source and current not in self._parent_directions:
+            raise ValueError("exit point is not reachable from the entry point")
+
+        steps = []
+        while current != source:
+            row_step, col_step = step = DIRECTIONS[self._parent_directions[current]]
+            steps.append(step)
+            current -= row_step * n_cols + col_step
+        steps.reverse()
+        return steps
@@ -0,0 +1,55 @@
+"""Helpers shared by the tests, which check solvers against `BFSSolver` on small generated mazes."""
+from collections.abc import Iterator, Sequence
+from typing import Optional
+
+from benchmarks.generators import GENERATORS
+from pathfinding.data_structures import Position, SolveStep
+from pathfinding.maze import CellState, Maze
+from pathfinding.solvers import BFSSolver, MazeSolver
+
+
+def generated_mazes(n_rows: int = 21, n_cols: int = 23, seeds: Sequence[int] = (0, 1, 2)) -> Iterator[Maze]:
+    """Yield a small maze from every benchmark generator for each seed."""
+    for generator in GENERATORS.values():
+        for seed in seeds:
+            yield generator(n_rows, n_cols, seed)
+
+
+def solve(solver: MazeSolver) -> Optional[Sequence[SolveStep]]:
+    """Run a solver to completion and return its shortest path, or None if the exit point is not reachable."""
+    for _ in solver.solve():
+        pass
+    try:
+        return solver.get_shortest_path()
+    except ValueError:
+        return None
+
+
+def bfs_distance(maze: Maze) -> Optional[int]:
+    path = solve(BFSSolver(maze))
+    return None if path is None else len(path)
+
+
+def walk(maze: Maze, steps: Sequence[SolveStep], start: Optional[Position] = None) -> Position:
+    """Follow steps through open cells of a maze from its entry point, and return the position they end at."""
+    position = maze.entry_point if start is None else start
+    for step in steps:
+        position = position.apply_step(step)
+        row, col = position
+        assert 0 <= row < maze.grid.n_rows and 0 <= col < maze.grid.n_cols, f"{position} is outside the maze"
+        assert maze.grid[row, col] == CellState.EMPTY, f"{position} is a wall"
+    return position
+
+
+def check_path(maze: Maze, steps: Optional[Sequence[SolveStep]], optimal: bool = True) -> None:
+    """Check that a path leads from the entry point to the exit point, and is as short as the one found by BFS."""
+    expected = bfs_distance(maze)
+    if expected is None:
+        assert steps is None
+        return
+    assert steps is not None
+    assert walk(maze, steps) == maze.exit_point
+    if optimal:
+        assert len(steps) == expected
+    else:
+        assert len(steps) >= expected
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from pathfinding.loaders import BinaryLoader, parse_maze_buffer, write_binary_maze
+from pathfinding.loaders.binary_loader import HEADER
+from pathfinding.maze import Maze
+from pathfinding.solvers import BFSSolver, DijkstraSolver
+
+MAZE = b"X.#....\n..#.##.\n#...#..\n.##....\n.....#Y\n"
+
+
+def shortest_distance(maze: Maze) -> int:
+    solver = BFSSolver(maze)
+    for _ in solver.solve():
+        pass
+    return len(solver.get_shortest_path())
+
+
+@pytest.mark.parametrize("include_graph", [True, False])
+def test_round_trip(tmp_path: Path, include_graph: bool) -> None:
+    maze = parse_maze_buffer(MAZE)
+    path = tmp_path / "maze.bin"
+    write_binary_maze(maze, path, include_graph)
+    loaded = BinaryLoader(path).load()
+    assert list(loaded.grid) == list(maze.grid)
+    assert (loaded.entry_point, loaded.exit_point) == (maze.entry_point, maze.exit_point)
+    assert loaded.content_hash() == maze.content_hash()
+
+    # With the stored graph, Dijkstra searches it in place instead of building one.
+    solver = DijkstraSolver(loaded)
+    for _ in solver.solve():
+        pass
+    assert len(solver.get_shortest_path()) == shortest_distance(maze)
+
+
+def test_loaded_graph_can_change(tmp_path: Path) -> None:
+    maze = parse_maze_buffer(MAZE)
+    path = tmp_path / "maze.bin"
+    write_binary_maze(maze, path)
+    written = path.read_bytes()
+
+    loaded = BinaryLoader(path).load()
+    loaded.corridors
+    loaded.grid[3, 3] = loaded.grid[0, 2]
+    assert shortest_distance(loaded) == shortest_distance(parse_maze_buffer(MAZE.replace(b".##....", b".###...")))
+    # The file is mapped copy-on-write, so changing the maze never changes it.
+    assert path.read_bytes() == written
+
+
+@pytest.mark.parametrize(
+    "offset, message",
+    [
+        (0, "not a maze file"),
+        (4, "unsupported maze file version"),
+        (16, "checksum mismatch"),  # entry row
+        (24, "checksum mismatch"),  # exit row
+        (HEADER.size, "checksum mismatch"),  # first byte of cells
+        (-1, "checksum mismatch"),  # last byte of the graph
+    ],
+)
+def test_corrupt_file_raises_value_error(tmp_path: Path, offset: int, message: str) -> None:
+    path = tmp_path / "maze.bin"
+    write_binary_maze(parse_maze_buffer(MAZE), path)
+    data = bytearray(path.read_bytes())
+    data[offset] ^= 0x40
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match=message):
+        BinaryLoader(path).load()
+
+
+def test_truncated_file_raises_value_error(tmp_path: Path) -> None:
+    path = tmp_path / "maze.bin"
+    write_binary_maze(parse_maze_buffer(MAZE), path)
+    data = path.read_bytes()
+    for size in (HEADER.size - 1, HEADER.size + 1, len(data) - 8):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            BinaryLoader(path).load()
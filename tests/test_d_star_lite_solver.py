@@ -0,0 +1,67 @@
+import random
+
+import pytest
+from helpers import check_path, generated_mazes, solve
+
+from pathfinding.data_structures import Position
+from pathfinding.maze import CELL_STATES, CellState
+from pathfinding.solvers import DStarLiteSolver
+
+
+def test_paths_match_bfs() -> None:
+    for maze in generated_mazes():
+        check_path(maze, solve(DStarLiteSolver(maze)))
+
+
+def test_repairs_match_bfs_after_changes() -> None:
+    rng = random.Random(1)
+    for maze in generated_mazes(seeds=(0,)):
+        solver = DStarLiteSolver(maze)
+        solve(solver)
+        n_rows, n_cols = maze.grid.dimensions
+        for _ in range(15):
+            changes: dict[tuple[int, int], CellState] = {}
+            for _ in range(rng.randint(1, 6)):
+                position = Position(rng.randrange(n_rows), rng.randrange(n_cols))
+                if position not in (solver.maze.entry_point, maze.exit_point):
+                    changes[position] = rng.choice(CELL_STATES)
+            solver.set_cells(changes)
+            check_path(solver.maze, solve(solver))
+
+
+def test_moving_entry_point_keeps_paths_optimal() -> None:
+    for maze in generated_mazes(seeds=(2,)):
+        solver = DStarLiteSolver(maze)
+        path = solve(solver)
+        if path is None:
+            continue
+        position = maze.entry_point
+        for step in path[: len(path) // 2]:
+            position = position.apply_step(step)
+            solver.move_to(position)
+        check_path(solver.maze, solve(solver))
+
+
+def test_grid_changed_behind_solvers_back_starts_over() -> None:
+    maze = next(generated_mazes(seeds=(3,)))
+    solver = DStarLiteSolver(maze)
+    solve(solver)
+    n_rows, n_cols = maze.grid.dimensions
+    for row in range(1, n_rows - 1):
+        maze.grid[row, n_cols // 2] = CellState.WALL
+    solver.set_cells({})
+    check_path(maze, solve(solver))
+
+
+def test_update_raises_when_exit_is_cut_off() -> None:
+    maze = next(generated_mazes())
+    solver = DStarLiteSolver(maze)
+    solve(solver)
+    row, col = maze.exit_point
+    walls = {
+        (row + d_row, col + d_col): CellState.WALL
+        for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1))
+        if 0 <= row + d_row < maze.grid.n_rows and 0 <= col + d_col < maze.grid.n_cols
+    }
+    with pytest.raises(ValueError, match="not reachable"):
+        solver.update(walls)
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from pathfinding.data_structures import Position
+from pathfinding.loaders import FileLoader, parse_maze, parse_maze_buffer
+
+MAZE = "X.#..\n..#.#\n#...Y\n"
+
+
+def test_matches_parse_maze(tmp_path: Path) -> None:
+    path = tmp_path / "maze.txt"
+    path.write_text(MAZE)
+    loaded, parsed = FileLoader(path, block_rows=2).load(), parse_maze(MAZE.splitlines())
+    assert list(loaded.grid) == list(parsed.grid)
+    assert (loaded.entry_point, loaded.exit_point) == (Position(0, 0), Position(2, 4))
+
+
+def test_crlf_line_breaks() -> None:
+    maze = parse_maze_buffer(MAZE.replace("\n", "\r\n").encode(), block_rows=1)
+    assert list(maze.grid) == list(parse_maze(MAZE.splitlines()).grid)
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("..#\n.#\n", "all rows are not of the same size"),
+        ("X.z\n..Y\n", "unrecognized character z"),
+        ("X..\n.Y.\n...\n", "is not on boundary"),
+        ("X.X\n..Y\n", "entry point already set"),
+        ("...\n..Y\n", "entry position not set"),
+    ],
+)
+def test_malformed_file_raises_value_error(tmp_path: Path, text: str, message: str) -> None:
+    path = tmp_path / "maze.txt"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        FileLoader(path).load()
+
+
+def test_empty_file_raises_index_error(tmp_path: Path) -> None:
+    path = tmp_path / "maze.txt"
+    path.write_bytes(b"")
+    with pytest.raises(IndexError):
+        FileLoader(path).load()
@@ -0,0 +1,44 @@
+import pytest
+from helpers import check_path, generated_mazes, solve
+
+from pathfinding.data_structures import Position
+from pathfinding.loaders import parse_maze_buffer
+from pathfinding.maze import CellState
+from pathfinding.solvers import ClusterAbstraction, HPASolver
+
+OPEN = b"X.....\n......\n......\n.....Y\n"
+
+
+@pytest.mark.parametrize("cluster_size", [1, 4, 8])
+def test_paths_match_bfs_reachability(cluster_size: int) -> None:
+    for maze in generated_mazes():
+        check_path(maze, solve(HPASolver(maze, cluster_size=cluster_size)), optimal=False)
+
+
+def test_search_cluster_without_targets_searches_whole_cluster() -> None:
+    maze = parse_maze_buffer(OPEN)
+    abstraction = ClusterAbstraction(maze, cluster_size=3)
+    distances, parent_directions = abstraction.search_cluster(0)
+    assert sorted(distances) == [0, 1, 2, 6, 7, 8, 12, 13, 14]
+    assert distances[14] == 4 and len(parent_directions) == 8
+
+
+def test_search_cluster_stops_once_targets_are_reached() -> None:
+    maze = parse_maze_buffer(OPEN)
+    abstraction = ClusterAbstraction(maze, cluster_size=3)
+    assert abstraction.search_cluster(0, ()) == ({0: 0}, {})
+    assert abstraction.search_cluster(0, (0,)) == ({0: 0}, {})
+    distances, _ = abstraction.search_cluster(0, (1,))
+    assert 1 in distances and 14 not in distances
+
+
+def test_reused_abstraction_follows_grid_changes() -> None:
+    maze = next(generated_mazes(seeds=(4,)))
+    abstraction = ClusterAbstraction(maze, cluster_size=5)
+    for row in range(1, maze.grid.n_rows - 1, 3):
+        for col in range(1, maze.grid.n_cols - 1, 2):
+            maze.grid[row, col] = CellState.EMPTY
+        check_path(maze, solve(HPASolver(maze, abstraction)), optimal=False)
+
+    queried = maze.with_endpoints(Position(1, 1), maze.exit_point)
+    check_path(queried, solve(HPASolver(queried, abstraction)), optimal=False)
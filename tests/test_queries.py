@@ -0,0 +1,121 @@
+import random
+from pathlib import Path
+
+import pytest
+from helpers import bfs_distance, generated_mazes, walk
+
+from pathfinding.data_structures import Position
+from pathfinding.maze import CellState, Maze
+from pathfinding.parallel import solve_mazes, solve_queries
+from pathfinding.solvers import AStarSolver, BatchSolver, DistanceField, DistanceFieldCache, LandmarkIndex
+
+
+def open_cells(maze: Maze) -> list[Position]:
+    return [position for position, state in maze.grid if state == CellState.EMPTY]
+
+
+def random_queries(maze: Maze, n_queries: int, seed: int = 0) -> list[tuple[Position, Position]]:
+    rng = random.Random(seed)
+    cells = open_cells(maze)
+    sources = rng.sample(cells, 3)
+    return [(rng.choice(sources), rng.choice(cells)) for _ in range(n_queries)]
+
+
+def expected_distance(maze: Maze, source: Position, target: Position) -> float:
+    distance = bfs_distance(maze.with_endpoints(source, target))
+    return float("inf") if distance is None else distance
+
+
+def test_batch_solver_matches_bfs() -> None:
+    for maze in generated_mazes(seeds=(0,)):
+        queries = random_queries(maze, 12)
+        results = list(BatchSolver(maze).solve(queries))
+        assert sorted((result.source, result.target) for result in results) == sorted(queries)
+        for result in results:
+            assert result.distance == expected_distance(maze, result.source, result.target)
+            if result.path is not None:
+                assert walk(maze, result.path, result.source) == result.target
+                assert len(result.path) == result.distance
+
+
+def test_distance_field_matches_bfs() -> None:
+    cache = DistanceFieldCache(max_fields=2)
+    for maze in generated_mazes(seeds=(1,)):
+        sources = [maze.entry_point, maze.exit_point]
+        field = cache.get(maze, sources)
+        assert cache.get(maze, reversed(sources)) is field
+        for position in open_cells(maze):
+            distance = min(expected_distance(maze, position, source) for source in sources)
+            assert field.distance(position) == distance
+            path = field.path(position)
+            if distance == float("inf"):
+                assert path is None
+            else:
+                assert path is not None and len(path) == distance
+                assert walk(maze, path, position) == field.nearest_source(position)
+
+        maze.set_cell(open_cells(maze)[1], CellState.WALL)
+        assert not field.is_current() and cache.get(maze, sources) is not field
+
+
+def test_distance_field_requires_open_sources() -> None:
+    maze = next(generated_mazes())
+    with pytest.raises(ValueError):
+        DistanceField(maze, [])
+    wall = next(position for position, state in maze.grid if state == CellState.WALL)
+    with pytest.raises(ValueError, match="not an open cell"):
+        DistanceField(maze, [wall])
+
+
+def test_parallel_runners_match_bfs() -> None:
+    mazes = list(generated_mazes(seeds=(0, 1)))
+    results = dict(solve_mazes(mazes, max_workers=2, chunksize=3, max_pending=1))
+    assert sorted(results) == list(range(len(mazes)))
+    for index, path in results.items():
+        assert (None if path is None else len(path)) == bfs_distance(mazes[index])
+
+    maze = mazes[0]
+    queries = random_queries(maze, 40)
+    query_results = list(solve_queries(maze, queries, max_workers=2, chunksize=4, max_pending=2))
+    assert sorted((result.source, result.target) for result in query_results) == sorted(queries)
+    for result in query_results:
+        assert result.distance == expected_distance(maze, result.source, result.target)
+
+
+@pytest.mark.parametrize("max_table_entries", [0, 1 << 22])
+def test_landmark_index_matches_bfs(tmp_path: Path, max_table_entries: int) -> None:
+    for maze in generated_mazes(seeds=(2,)):
+        index = LandmarkIndex(maze, n_landmarks=4, max_table_entries=max_table_entries)
+        path = tmp_path / "index.bin"
+        index.save(path)
+        loaded = LandmarkIndex.load(path, maze)
+        for source, target in random_queries(maze, 10):
+            distance = expected_distance(maze, source, target)
+            assert index.lower_bound(source, target) <= distance
+            assert index.distance(source, target) == loaded.distance(source, target) == distance
+
+        solver = AStarSolver(maze, heuristic=index.heuristic)
+        for _ in solver.solve():
+            pass
+        if bfs_distance(maze) is not None:
+            assert len(solver.get_shortest_path()) == bfs_distance(maze)
+
+
+def test_landmark_index_rejects_other_mazes(tmp_path: Path) -> None:
+    maze, other = list(generated_mazes(seeds=(0,)))[:2]
+    index = LandmarkIndex(maze)
+    path = tmp_path / "index.bin"
+    index.save(path)
+    with pytest.raises(ValueError, match="different maze"):
+        LandmarkIndex.load(path, other)
+
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="corrupt"):
+        LandmarkIndex.load(path, maze)
+    path.write_bytes(b"PFLX")
+    with pytest.raises(ValueError, match="not a landmark index file"):
+        LandmarkIndex.load(path, maze)
+
+    maze.set_cell(open_cells(maze)[1], CellState.WALL)
+    with pytest.raises(ValueError, match="has changed"):
+        index.distance(maze.entry_point, maze.exit_point)
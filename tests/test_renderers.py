@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+from pathfinding.loaders import parse_maze_buffer
+from pathfinding.renderers import StandardOutputRenderer, TerminalRenderer, TraceReader
+from pathfinding.solvers import BFSSolver, DijkstraSolver
+
+SOLVABLE = b"X.#\n#.#\n#.Y\n"
+UNSOLVABLE = b"X.#\n.##\n#.Y\n"
+
+
+@pytest.mark.parametrize("maze_text, expected", [(SOLVABLE, "R1 D2 R1\n"), (UNSOLVABLE, "no path\n")])
+def test_stdout_renderer(capsys: pytest.CaptureFixture[str], maze_text: bytes, expected: str) -> None:
+    maze = parse_maze_buffer(maze_text)
+    trace = io.BytesIO()
+    StandardOutputRenderer(maze, BFSSolver(maze), trace=trace, frame_size=2).render()
+    assert capsys.readouterr().out == expected
+
+    trace.seek(0)
+    explored = [cell for frame in TraceReader(trace) for cell in frame]
+    assert len(explored) == len(set(explored)) > 0
+
+
+@pytest.mark.parametrize("maze_text, expected", [(SOLVABLE, "R1 D2 R1\n"), (UNSOLVABLE, "no path\n")])
+def test_terminal_renderer(maze_text: bytes, expected: str) -> None:
+    maze = parse_maze_buffer(maze_text)
+    stream = io.StringIO()
+    renderer = TerminalRenderer(maze, DijkstraSolver(maze), stream=stream)
+    renderer.render()
+    assert stream.getvalue().endswith(expected)
+    # The cells on the path are drawn last, and only when there is one.
+    assert renderer._shown.count(b"*") == (3 if maze_text == SOLVABLE else 0)
+
+
+def test_terminal_renderer_draws_maze_before_cells() -> None:
+    maze = parse_maze_buffer(SOLVABLE)
+    stream = io.StringIO()
+    TerminalRenderer(maze, BFSSolver(maze), stream=stream).draw_cells([1, 3], "o")
+    assert stream.getvalue().startswith("\x1b[2J\x1b[HX.#\n#.#\n#.Y\n")
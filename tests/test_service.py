@@ -0,0 +1,78 @@
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from pathfinding.service import SolverService
+
+MAZE = "X.#.#\n..###\n#...Y\n"
+
+Send = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+def run_client(client: Callable[[Send], Awaitable[None]]) -> None:
+    """Run a client against a fresh service over TCP, sending one request at a time and awaiting its response."""
+
+    async def run() -> None:
+        service = SolverService()
+        server = await service.start_tcp()
+        try:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+
+            async def send(request: dict[str, Any]) -> dict[str, Any]:
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                response: dict[str, Any] = json.loads(await reader.readline())
+                return response
+
+            await client(send)
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    asyncio.run(run())
+
+
+def test_load_and_solve() -> None:
+    async def client(send: Send) -> None:
+        loaded = await send({"op": "load", "text": MAZE, "id": 1})
+        assert loaded["id"] == 1
+        assert (loaded["dimensions"], loaded["entry_point"], loaded["exit_point"]) == ([3, 5], [0, 0], [2, 4])
+
+        query = {"op": "solve", "maze": loaded["maze"], "source": [0, 0], "target": [2, 4]}
+        for algorithm in ("bfs", "dijkstra", "astar", "jps"):
+            solved = await send(query | {"algorithm": algorithm})
+            assert solved["distance"] == 6 and len(solved["path"]) == 6
+        assert (await send({"op": "stats"}))["misses"] == 4
+
+        walled = await send({"op": "solve", "maze": loaded["maze"], "source": [0, 0], "target": [0, 3]})
+        assert walled == {"distance": None, "path": None}
+
+    run_client(client)
+
+
+def test_malformed_maze_is_a_request_error(tmp_path: Path) -> None:
+    path = tmp_path / "maze.txt"
+    path.write_text("X.z\n..Y\n")
+
+    async def client(send: Send) -> None:
+        from_file = await send({"op": "load", "path": str(path)})
+        assert from_file == {"error": f"invalid maze {path}: unrecognized character z at row: 0, col: 2"}
+        from_text = await send({"op": "load", "text": "..#\n.#\n"})
+        assert from_text == {"error": "invalid maze text: all rows are not of the same size"}
+
+    run_client(client)
+
+
+def test_invalid_requests() -> None:
+    async def client(send: Send) -> None:
+        assert "No such file" in (await send({"op": "load", "path": "/nonexistent/maze.txt"}))["error"]
+        assert await send({"op": "load"}) == {"error": "either path or text must be given"}
+        assert await send({"op": "solve", "maze": "0" * 32}) == {"error": "missing field 'source'"}
+        assert await send({"op": "frobnicate", "id": "a"}) == {"error": "unknown op 'frobnicate'", "id": "a"}
+
+    run_client(client)
@@ -0,0 +1,110 @@
+import random
+from collections.abc import Callable
+
+import pytest
+from helpers import bfs_distance, check_path, generated_mazes, solve, walk
+
+from pathfinding.data_structures import BucketQueue, CompactGrid, DaryHeap, Heap, PriorityQueue
+from pathfinding.maze import CELL_STATES, CellState, Maze
+from pathfinding.solvers import AStarSolver, BFSSolver, Budget, DijkstraSolver, JPSSolver, MazeSolver, NumpyBFSSolver
+from pathfinding.solvers.heuristics import zero
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SOLVERS: dict[str, Callable[[Maze], MazeSolver]] = {
+    "bfs": BFSSolver,
+    "bfs-bidirectional": lambda maze: BFSSolver(maze, bidirectional=True),
+    "dijkstra": DijkstraSolver,
+    "dijkstra-dary": lambda maze: DijkstraSolver(maze, queue_factory=DaryHeap),
+    "dijkstra-bucket": lambda maze: DijkstraSolver(maze, queue_factory=BucketQueue),
+    "dijkstra-bidirectional": lambda maze: DijkstraSolver(maze, bidirectional=True),
+    "astar": AStarSolver,
+    "astar-zero": lambda maze: AStarSolver(maze, heuristic=zero),
+    "astar-graph": lambda maze: AStarSolver(maze, use_graph=True),
+    "astar-queue": lambda maze: AStarSolver(maze, queue_factory=Heap),
+    "jps": JPSSolver,
+}
+
+
+@pytest.mark.parametrize("name", SOLVERS)
+def test_paths_match_bfs(name: str) -> None:
+    for maze in generated_mazes():
+        check_path(maze, solve(SOLVERS[name](maze)))
+
+
+@pytest.mark.skipif(numpy is None, reason="NumPy is not installed")
+def test_numpy_bfs_matches_bfs() -> None:
+    for maze in generated_mazes():
+        check_path(maze, solve(NumpyBFSSolver(maze)))
+
+
+@pytest.mark.parametrize("name", SOLVERS)
+def test_path_before_solving_raises_runtime_error(name: str) -> None:
+    maze = next(generated_mazes())
+    with pytest.raises(RuntimeError):
+        SOLVERS[name](maze).get_shortest_path()
+
+
+def corridor_edges(maze: Maze) -> set[tuple[int, int, int]]:
+    corridors = maze.corridors
+    edges = set()
+    for edge in corridors.edges():
+        tail, head = sorted((corridors.edge_tails[edge], corridors.edge_heads[edge]))
+        edges.add((tail, head, corridors.edge_lengths[edge]))
+    return edges
+
+
+@pytest.mark.parametrize("queue_factory", [Heap, BucketQueue])
+def test_corridor_graph_follows_cell_changes(queue_factory: Callable[[], PriorityQueue[int]]) -> None:
+    rng = random.Random(0)
+    for maze in generated_mazes(seeds=(0,)):
+        maze.corridors
+        n_rows, n_cols = maze.grid.dimensions
+        for _ in range(20):
+            changes: dict[tuple[int, int], CellState] = {}
+            for _ in range(rng.randint(1, 4)):
+                position = rng.randrange(n_rows), rng.randrange(n_cols)
+                if position not in (maze.entry_point, maze.exit_point):
+                    changes[position] = rng.choice(CELL_STATES)
+            maze.set_cells(changes)
+
+            grid = CompactGrid(maze.grid.dimensions, bytearray(maze.grid.cells), CELL_STATES)
+            rebuilt = Maze(grid, maze.entry_point, maze.exit_point)
+            assert corridor_edges(maze) == corridor_edges(rebuilt)
+            path = solve(DijkstraSolver(maze, queue_factory))
+            assert (None if path is None else len(path)) == bfs_distance(rebuilt)
+
+
+def test_endpoints_must_stay_empty() -> None:
+    maze = next(generated_mazes())
+    with pytest.raises(ValueError):
+        maze.set_cell(maze.entry_point, CellState.WALL)
+
+
+@pytest.mark.parametrize("name", ["bfs", "dijkstra", "astar", "jps"])
+def test_budgeted_search_resumes_to_the_same_path(name: str) -> None:
+    for maze in generated_mazes(seeds=(0,)):
+        solver = SOLVERS[name](maze)
+        while not (progress := solver.solve_within(Budget(max_expansions=7))).complete:
+            assert progress.stopped_by == "expansions" and progress.expanded == 7
+            if progress.path is not None and progress.closest is not None:
+                assert walk(maze, progress.path) == progress.closest
+        if progress.closest == maze.exit_point:
+            check_path(maze, progress.path)
+        else:
+            # A complete search which did not reach the exit keeps its best partial path.
+            assert bfs_distance(maze) is None
+
+
+@pytest.mark.parametrize("name", ["bfs", "dijkstra", "astar", "jps", "dijkstra-bidirectional"])
+def test_profile_counts_frontier_work(name: str) -> None:
+    for maze in generated_mazes(seeds=(0,)):
+        solver = SOLVERS[name](maze)
+        stats = solver.profile()
+        assert stats.expanded > 0 and stats.pops is not None and stats.pushes is not None
+        assert stats.pops <= stats.pushes and stats.max_frontier is not None and stats.max_frontier <= stats.pushes
+        assert stats.path_length == bfs_distance(maze)
+        assert not solver.counters.enabled
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+from helpers import bfs_distance, generated_mazes, walk
+
+from benchmarks.suite import maze_text
+from pathfinding.data_structures import Position, TiledGrid
+from pathfinding.loaders import write_tiled_maze
+from pathfinding.maze import CELL_STATES, CellState
+from pathfinding.solvers import TiledAStarSolver
+from pathfinding.solvers.heuristics import manhattan, zero
+
+
+@pytest.mark.parametrize("tile_size", [1, 4, 7, 64])
+def test_tiled_solver_matches_bfs(tmp_path: Path, tile_size: int) -> None:
+    for maze in generated_mazes():
+        if not (maze.grid.on_boundary(maze.entry_point) and maze.grid.on_boundary(maze.exit_point)):
+            continue
+        text_path, grid_path = tmp_path / "maze.txt", tmp_path / "maze.tiles"
+        text_path.write_bytes(maze_text(maze))
+        assert write_tiled_maze(text_path, grid_path, tile_size) == (maze.entry_point, maze.exit_point)
+
+        with TiledGrid(grid_path, CELL_STATES, max_tiles=2) as grid:
+            assert list(grid) == list(maze.grid)
+            for heuristic in (zero, manhattan):
+                solver = TiledAStarSolver(grid, maze.entry_point, maze.exit_point, heuristic)
+                for _ in solver.solve():
+                    pass
+                expected = bfs_distance(maze)
+                if expected is None:
+                    with pytest.raises(ValueError):
+                        solver.get_shortest_path()
+                else:
+                    path = solver.get_shortest_path()
+                    assert len(path) == expected and walk(maze, path) == maze.exit_point
+            assert grid.max_tiles >= len(grid._tiles)
+
+
+def test_changes_are_written_back(tmp_path: Path) -> None:
+    path = tmp_path / "grid.tiles"
+    wall = CELL_STATES.index(CellState.WALL)
+    with TiledGrid[CellState].create(path, (5, 9), 2, wall, CELL_STATES, max_tiles=1) as grid:
+        for col in range(9):
+            grid[Position(2, col)] = CellState.EMPTY
+        assert grid.evictions > 0
+    with TiledGrid(path, CELL_STATES) as grid:
+        assert [position for position, state in grid if state == CellState.EMPTY] == [(2, col) for col in range(9)]
+        with pytest.raises(ValueError, match="not opened for writing"):
+            grid[Position(0, 0)] = CellState.EMPTY
+        with pytest.raises(IndexError):
+            grid[Position(5, 0)]
+
+
+def test_invalid_files_raise_value_error(tmp_path: Path) -> None:
+    path = tmp_path / "grid.tiles"
+    path.write_bytes(b"PFTG")
+    with pytest.raises(ValueError, match="not a tiled grid file"):
+        TiledGrid(path)
+
+    text_path = tmp_path / "maze.txt"
+    text_path.write_bytes(b"X.z\n..Y\n")
+    with pytest.raises(ValueError, match="unrecognized character z"):
+        write_tiled_maze(text_path, path, 2)
+
+    text_path.write_bytes(b"X#.\n..Y\n")
+    write_tiled_maze(text_path, path, 2)
+    with TiledGrid(path, CELL_STATES) as grid, pytest.raises(ValueError, match="not an open cell"):
+        TiledAStarSolver(grid, Position(0, 1), Position(1, 2))
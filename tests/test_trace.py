@@ -0,0 +1,57 @@
+import io
+
+import pytest
+from helpers import generated_mazes
+
+from pathfinding.renderers import TraceReader, TraceWriter, format_path, record_frames
+from pathfinding.renderers.trace import HEADER
+from pathfinding.solvers import DijkstraSolver
+
+
+def test_round_trip() -> None:
+    maze = next(generated_mazes())
+    explored = [maze.grid.index(*position) for position in DijkstraSolver(maze).solve()]
+
+    stream = io.BytesIO()
+    writer = TraceWriter(stream, maze.grid.dimensions)
+    frames = list(writer.write_frames(record_frames(DijkstraSolver(maze).solve(), maze.grid.dimensions, 5)))
+    assert [len(frame) for frame in frames[:-1]] == [5] * (len(frames) - 1)
+    assert (writer.frames, writer.cells) == (len(frames), len(explored))
+
+    stream.seek(0)
+    reader = TraceReader(stream)
+    assert reader.dimensions == maze.grid.dimensions
+    assert [cell for frame in reader for cell in frame] == explored
+
+
+def trace_bytes() -> bytes:
+    stream = io.BytesIO()
+    TraceWriter(stream, (3, 4)).write_frame([0, 1, 5])
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        (b"PFTR", "not a trace file"),
+        (b"PFTX" + trace_bytes()[4:], "not a trace file"),
+        (trace_bytes()[:4] + b"\x09\x00" + trace_bytes()[6:], "unsupported trace file version"),
+        (trace_bytes()[:6] + b"\x03" + trace_bytes()[7:], "unsupported index size"),
+        (trace_bytes()[: HEADER.size + 2], "truncated frame"),
+        (trace_bytes()[:-1], "truncated frame"),
+    ],
+)
+def test_malformed_trace_raises_value_error(data: bytes, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        list(TraceReader(io.BytesIO(data)))
+
+
+def test_format_path() -> None:
+    maze = next(generated_mazes())
+    solver = DijkstraSolver(maze)
+    for _ in solver.solve():
+        pass
+    steps = solver.get_shortest_path()
+    runs = format_path(steps).split()
+    assert sum(int(run[1:]) for run in runs) == len(steps)
+    assert all(first[0] != second[0] for first, second in zip(runs, runs[1:]))